@@ -1,172 +1,116 @@
 import fitz  # PyMuPDF
 import pdfplumber
 import collections
+import hashlib
+import io
+import json
 import re
+import threading
+import time
 from collections import defaultdict
+from contextlib import contextmanager
 from experience_calculator import extract_experience_dict, extract_highest_education, calculate_total_experience
-import statistics
-from difflib import get_close_matches
+from difflib import SequenceMatcher
+from functools import lru_cache
+from extraction_engines import get_engine
+from layout_detectors import DEFAULT_DETECTOR, first_page_blocks, get_detector
 
 
 # -----------------------------
-# Detect Resume Type
+# Parsed Resume Document
 # -----------------------------
-def detect_resume_type(pdf_path, debug=False):
+class ResumeDocument:
     """
-    Detects if a PDF resume is a one-column or two-column layout using block analysis.
-    V4 is tuned for robust detection of sidebar/main-content two-column layouts.
+    A resume PDF read from disk once and shared by every parsing step.
+
+    Layout detection, contact extraction, text extraction and persistence all
+    work from the same bytes; the PyMuPDF and pdfplumber handles are opened
+    lazily from those bytes the first time a step needs them. `pdf_path` may
+    also be the PDF bytes themselves or a binary file-like object, so uploads
+    can be parsed straight from memory. `engine` selects the text extraction
+    backend (see extraction_engines.ENGINES). `max_pages` caps how many pages
+    the engines extract text from; later pages are ignored.
     """
-    doc = None
-    try:
-        doc = fitz.open(pdf_path)
-        page = doc[0]
-        blocks = page.get_text("blocks")
-        page_w, page_h = page.rect.width, page.rect.height
-
-        total_chars = 0
-        clusters_data = []
-
-        # --- Collect block info and filter noise ---
-        for b in blocks:
-            x0, y0, x1, y1, text, *_ = b
-            txt = text.strip()
-            if not txt:
-                continue
 
-            char_count = len(txt)
-            # Filter out very short blocks (e.g., single letters, icons)
-            if char_count < 5:
-                continue
-
-            block_w = x1 - x0
-            # Ignore very wide blocks (likely headers/footers spanning the page)
-            if block_w / page_w > 0.95:
-                continue
-
-            clusters_data.append({
-                "x0": x0,
-                "x1": x1,  # Store x1 for gap calculation
-                "width": block_w,
-                "chars": char_count,
-                "ymin": y0,
-                "ymax": y1,
-                "mid_y": (y0 + y1) / 2
-            })
-            total_chars += char_count
-
-        if total_chars == 0:
-            return "one-column"
-
-        # --- Group by x0 (binning) ---
-        clusters_data.sort(key=lambda c: c["x0"])
-        grouped, cur = [], None
-
-        # V4 Change: Increased tolerance to handle minor misalignments
-        grouping_tolerance = 60
-
-        for c in clusters_data:
-            if not cur:
-                cur = {k: [c[k]] for k in c}
-                cur["chars"] = c["chars"]
-            else:
-                if abs(statistics.median(cur["x0"]) - c["x0"]) < grouping_tolerance:
-                    for k in ["x0", "x1", "width", "ymin", "ymax", "mid_y"]:
-                        cur[k].append(c[k])
-                    cur["chars"] += c["chars"]
-                else:
-                    grouped.append(cur)
-                    cur = {k: [c[k]] for k in c}
-                    cur["chars"] = c["chars"]
-        if cur:
-            grouped.append(cur)
-
-        # --- Compute cluster stats ---
-        proc = []
-        for g in grouped:
-            char_frac = g["chars"] / total_chars
-            # Filter out minor clusters that don't contribute much text
-            if char_frac < 0.03 and len(g["x0"]) < 3:
-                continue
+    def __init__(self, pdf_path, engine=None, max_pages=None):
+        self.engine = get_engine(engine)
+        self.max_pages = max_pages
+        if isinstance(pdf_path, (bytes, bytearray)):  # PDF bytes already in memory
+            self.path = None
+            self.data = bytes(pdf_path)
+        elif hasattr(pdf_path, "read"):  # binary file-like object (e.g. an upload stream)
+            self.path = getattr(pdf_path, "filename", None) or getattr(pdf_path, "name", None)
+            self.data = pdf_path.read()
+        else:
+            self.path = pdf_path
+            with open(pdf_path, "rb") as f:
+                self.data = f.read()
+        self._fitz_doc = None
+        self._plumber_pdf = None
+
+    @property
+    def fitz_doc(self):
+        if self._fitz_doc is None:
+            self._fitz_doc = fitz.open(stream=self.data, filetype="pdf")
+        return self._fitz_doc
+
+    @property
+    def plumber_pdf(self):
+        if self._plumber_pdf is None:
+            # with a page cap, only the leading pages get Page objects (pdf.pages builds them all up front)
+            pages = range(1, self.pages_to_parse + 1) if self.max_pages else None
+            self._plumber_pdf = pdfplumber.open(io.BytesIO(self.data), pages=pages)
+        return self._plumber_pdf
+
+    @property
+    def page_count(self):
+        return len(self.fitz_doc)
+
+    @property
+    def pages_to_parse(self):
+        """Number of leading pages text is extracted from (page_count capped at max_pages)."""
+        if self.max_pages:
+            return min(self.page_count, self.max_pages)
+        return self.page_count
+
+    def close(self):
+        if self._fitz_doc is not None:
+            self._fitz_doc.close()
+            self._fitz_doc = None
+        if self._plumber_pdf is not None:
+            self._plumber_pdf.close()
+            self._plumber_pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_document(pdf):
+    """Return (document, owned) so a caller only closes what it opened itself."""
+    if isinstance(pdf, ResumeDocument):
+        return pdf, False
+    return ResumeDocument(pdf), True
 
-            x0 = statistics.median(g["x0"])
-            x1 = statistics.median(g["x1"])
-            width = statistics.median(g["width"])
-            ymin, ymax = min(g["ymin"]), max(g["ymax"])
-            y_span = ymax - ymin
-
-            proc.append({
-                "x0": x0,
-                "x1": x1,
-                "width": width,
-                "char_frac": char_frac,
-                "coverage": y_span / page_h,
-                "ymin": ymin, "ymax": ymax
-            })
-
-        # Sort by char share
-        proc.sort(key=lambda c: c["char_frac"], reverse=True)
-
-        if len(proc) < 2:
-            return "one-column"
-
-        c1, c2 = proc[0], proc[1]
-
-        # Ensure c1 is always the leftmost cluster
-        if c1["x0"] > c2["x0"]:
-            c1, c2 = c2, c1
-
-        # Calculate horizontal gap between columns
-        gap = c2["x0"] - c1["x1"]
-
-        # Check overlap
-        overlap = max(0, min(c1["ymax"], c2["ymax"]) - max(c1["ymin"], c2["ymin"]))
-        min_y_span = min(c1["ymax"] - c1["ymin"], c2["ymax"] - c2["ymin"])
-        overlap_frac = overlap / min_y_span if min_y_span > 0 else 0
-
-        # --- ROBUST HYBRID CONDITIONS (V4) ---
-        is_two_col = (
-            # 1. Sufficient total text explained by the two main clusters
-                (c1["char_frac"] + c2["char_frac"]) >= 0.60 and
-
-                # 2. Both columns must have significant, even if small, content
-                c1["char_frac"] >= 0.05 and  # Leftmost column must be ≥ 5% text
-                c2["char_frac"] >= 0.03 and  # Rightmost column must be ≥ 3% text
-
-                # 3. V4 CHANGE: At least ONE of the two columns must cover half the page height.
-                max(c1["coverage"], c2["coverage"]) >= 0.50 and
-
-                # 4. At least some vertical overlap (20%)
-                overlap_frac >= 0.20 and
-
-                # 5. Right column must start past the 30% mark
-                c2["x0"] >= page_w * 0.30 and
-
-                # 6. The horizontal gap must be large (e.g., 5% of page width)
-                gap / page_w >= 0.05 and
-
-                # 7. Max width constraint to prevent single-column, highly-indented False Positives.
-                max(c1["width"], c2["width"]) / page_w <= 0.70
-        )
-
-        result = "two-column" if is_two_col else "one-column"
-
-        if debug:
-            return {
-                "result": result,
-                "clusters": proc,
-                "together_frac": c1["char_frac"] + c2["char_frac"],
-                "overlap_frac": overlap_frac,
-                "c1_char_frac": c1["char_frac"],
-                "c2_coverage": c2["coverage"],
-                "c1_coverage": c1["coverage"],
-                "max_coverage": max(c1["coverage"], c2["coverage"]),
-                "gap_ratio": gap / page_w,
-                "max_width_ratio": max(c1["width"], c2["width"]) / page_w
-            }
-        return result
 
+# -----------------------------
+# Detect Resume Type
+# -----------------------------
+def detect_resume_type(pdf_path, debug=False, detector=None):
+    """
+    Detects if a PDF resume is a one-column or two-column layout using block analysis
+    of the first page. `detector` picks the strategy from layout_detectors.DETECTORS
+    (default: the V4 detector, or RESUME_LAYOUT_DETECTOR).
+    Accepts a file path or an already opened ResumeDocument.
+    """
+    doc, owned = _open_document(pdf_path)
+    try:
+        blocks, page_w, page_h = first_page_blocks(doc)
+        return get_detector(detector).classify(blocks, page_w, page_h, debug)
     finally:
-        if doc:
+        if owned:
             doc.close()
 
 # -----------------------------
@@ -190,9 +134,9 @@ def group_words_by_line(words, line_tol=3):
 # -----------------------------
 def extract_columns(pdf_path):
     left_col_text, right_col_text = "", ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            words = page.extract_words()
+    doc, owned = _open_document(pdf_path)
+    try:
+        for words in doc.engine.page_words(doc):
             if not words:
                 continue
 
@@ -216,26 +160,33 @@ def extract_columns(pdf_path):
 
             left_col_text += group_words_by_line(left_words) + "\n\n"
             right_col_text += group_words_by_line(right_words) + "\n\n"
+    finally:
+        if owned:
+            doc.close()
 
     return left_col_text.strip(), right_col_text.strip()
 
 # -----------------------------
 # Extract Full Resume Text
 # -----------------------------
-def extract_resume_text(pdf_path):
-    resume_type = detect_resume_type(pdf_path)
-
-    if resume_type == "two-column":
-        left_col_text, right_col_text = extract_columns(pdf_path)
-        text_to_search = left_col_text + "\n" + right_col_text
-    else:  # one-column
-        all_text = []
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text(layout=True)
+def extract_resume_text(pdf_path, resume_type=None):
+    doc, owned = _open_document(pdf_path)
+    try:
+        if resume_type is None:
+            resume_type = detect_resume_type(doc)
+
+        if resume_type == "two-column":
+            left_col_text, right_col_text = extract_columns(doc)
+            text_to_search = left_col_text + "\n" + right_col_text
+        else:  # one-column
+            all_text = []
+            for text in doc.engine.page_texts(doc):
                 if text:
                     all_text.append(text)
-        text_to_search = "\n".join(all_text)
+            text_to_search = "\n".join(all_text)
+    finally:
+        if owned:
+            doc.close()
 
     return text_to_search
 
@@ -244,9 +195,12 @@ def extract_resume_text(pdf_path):
 # -----------------------------
 def extract_contact_info(pdf_path):
     text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        if pdf.pages:
-            text = pdf.pages[0].extract_text()  # Only first page
+    doc, owned = _open_document(pdf_path)
+    try:
+        text = doc.engine.first_page_text(doc)  # Only first page
+    finally:
+        if owned:
+            doc.close()
 
     email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
     phone_pattern = r"(\+?\d{1,3}[-.\s]?)?(\(?\d{3,4}\)?[-.\s]?)?\d{3,4}[-.\s]?\d{4}"
@@ -299,24 +253,123 @@ def fix_spaced_words(text: str) -> str:
     """Fix words like 'E D U C A T I O N' -> 'EDUCATION' (keeps case)."""
     return re.sub(r'(?:[A-Za-z]\s){2,}[A-Za-z]', lambda m: m.group(0).replace(" ", ""), text)
 
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def build_heading_normalizer(base_dict):
+    """
+    Compile the matchers used by normalize_headings.
+
+    Only multi-word variants matter (a single word has no inner spacing to
+    fix) and variants differing only in case are the same pattern under re.I.
+    Returns one combined regex that finds candidate positions in a single scan
+    plus the per-variant patterns used to confirm each hit.
+    """
+    variants = sorted({v.lower() for vs in base_dict.values() for v in vs if len(v.split()) > 1})
+    patterns = [r"\s*".join(re.escape(w) for w in v.split()) for v in variants]
+    combined = re.compile("|".join(patterns), re.I) if patterns else None
+    return combined, [re.compile(p, re.I) for p in patterns]
+
+
 def normalize_headings(text: str) -> str:
     """Normalize headings with inconsistent spacing (e.g. 'Work   Experience')
        but keep original case/formatting.
     """
-    for section, variants in resume_headings_base.items():
-        for variant in variants:
-            # Build regex allowing multiple spaces inside variant
-            words = variant.split()
-            pattern = r"\s*".join(re.escape(w) for w in words)
-            text = re.sub(pattern, lambda m: re.sub(r"\s+", " ", m.group(0)), text, flags=re.I)
-    return text
+    combined, patterns = _heading_normalizer
+    if combined is None:
+        return text
+
+    # Collect every whitespace run lying between the words of a variant match.
+    # Matches of one variant never overlap (same as a per-variant re.sub).
+    runs = set()
+    last_end = [0] * len(patterns)
+    m = combined.search(text)
+    while m:
+        pos = m.start()
+        for i, pattern in enumerate(patterns):
+            if pos < last_end[i]:
+                continue
+            vm = pattern.match(text, pos)
+            if vm:
+                last_end[i] = vm.end()
+                runs.update(r.span() for r in _WHITESPACE_RUN.finditer(text, vm.start(), vm.end()))
+        m = combined.search(text, pos + 1)
+
+    if not runs:
+        return text
+    parts, prev = [], 0
+    for start, end in sorted(runs):
+        parts.append(text[prev:start])
+        parts.append(" ")
+        prev = end
+    parts.append(text[prev:])
+    return "".join(parts)
+
+class StuckHeadingIndex:
+    """
+    Prebuilt fuzzy matcher from a (possibly space-less) line to a known heading.
+
+    Equivalent to difflib.get_close_matches(line, headings, n=1, cutoff) but
+    candidates are bucketed by length first: a similarity ratio of 2*M/(la+lb)
+    can only reach the cutoff when 2*min(la, lb)/(la+lb) does, so ordinary
+    body lines are rejected without any scoring. Survivors then pass a
+    character-set signature check (every distinct character missing from the
+    other string costs at least one match) before SequenceMatcher runs.
+    Verdicts are memoized because the same lines repeat across a corpus.
+    """
+
+    def __init__(self, base_dict, cutoff=0.85, memo_size=50000):
+        all_headings = sum(base_dict.values(), [])
+        self.normalized_map = {h.lower().replace(" ", ""): h for h in all_headings}
+        self.cutoff = cutoff
+        # bit 0 stands for any character that appears in no heading
+        self._char_bits = {c: 1 << i for i, c in enumerate(sorted(set("".join(self.normalized_map))), 1)}
+        self._by_length = defaultdict(list)
+        for key in self.normalized_map:
+            self._by_length[len(key)].append((key, self._signature(key)))
+        self._candidates_by_length = {}
+        self.match = lru_cache(maxsize=memo_size)(self._match)
+
+    def _signature(self, text):
+        sig = 0
+        for c in set(text):
+            sig |= self._char_bits.get(c, 1)
+        return sig
+
+    def _candidates(self, length):
+        candidates = self._candidates_by_length.get(length)
+        if candidates is None:
+            # same bound and arithmetic as SequenceMatcher.real_quick_ratio()
+            candidates = [entry for key_len, entries in self._by_length.items()
+                          if 2.0 * min(length, key_len) / (length + key_len) >= self.cutoff
+                          for entry in entries]
+            self._candidates_by_length[length] = candidates
+        return candidates
+
+    def _match(self, word):
+        """Return the best matching normalized heading key for `word`, or None."""
+        best = None
+        s = SequenceMatcher()
+        s.set_seq2(word)
+        word_len, word_sig = len(word), self._signature(word)
+        for key, key_sig in self._candidates(word_len):
+            max_matches = min(word_len - (word_sig & ~key_sig).bit_count(),
+                              len(key) - (key_sig & ~word_sig).bit_count())
+            if 2.0 * max_matches / (word_len + len(key)) < self.cutoff:
+                continue
+            s.set_seq1(key)
+            if s.quick_ratio() >= self.cutoff and s.ratio() >= self.cutoff:
+                candidate = (s.ratio(), key)
+                if best is None or candidate > best:
+                    best = candidate
+        return best[1] if best else None
+
 
 def fix_stuck_headings(text: str) -> str:
     """Fix stuck headings like 'WORKEXPERIENCE' -> 'WORK EXPERIENCE' or
        'WorkExperience' -> 'Work Experience', preserving case style.
     """
-    all_headings = sum(resume_headings_base.values(), [])
-    normalized_map = {h.lower().replace(" ", ""): h for h in all_headings}
+    index = _stuck_heading_index
 
     lines = text.splitlines()
     fixed_lines = []
@@ -328,9 +381,9 @@ def fix_stuck_headings(text: str) -> str:
             continue
 
         # try fuzzy match against normalized headings
-        match = get_close_matches(clean_line.lower(), normalized_map.keys(), n=1, cutoff=0.85)
+        match = index.match(clean_line.lower())
         if match:
-            fixed = normalized_map[match[0]]
+            fixed = index.normalized_map[match]
 
             # --- preserve formatting style ---
             if clean_line.isupper():
@@ -372,16 +425,16 @@ def build_heading_regex():
             patterns.append(re.escape(h))
             heading_to_section[h.lower()] = section
     regex = r"(?m)^\s*(?:" + "|".join(sorted(set(patterns))) + r")\s*:?\s*$"
-    return regex, heading_to_section
+    return re.compile(regex, re.IGNORECASE), heading_to_section
 
 
 # -----------------------------
 # Extract Sections
 # -----------------------------
 def extract_all_sections(text):
-    regex, heading_to_section = build_heading_regex()
+    regex, heading_to_section = _section_heading_regex
 
-    matches = [(m.start(), m.group()) for m in re.finditer(regex, text, re.IGNORECASE)]
+    matches = [(m.start(), m.group()) for m in regex.finditer(text)]
 
 
     sections = {}
@@ -432,7 +485,7 @@ def build_heading_map(base_dict):
     return heading_map
 
 def normalize_sections(sections, base_dict):
-    heading_map = build_heading_map(base_dict)
+    heading_map = _heading_map if base_dict is resume_headings_base else build_heading_map(base_dict)
     normalized = {}
     for raw_key, value in sections.items():
         key = raw_key.lower().strip()
@@ -445,6 +498,66 @@ def normalize_sections(sections, base_dict):
     return normalized
 
 
+# -----------------------------
+# Heading Registry
+# -----------------------------
+# Everything derived from resume_headings_base (heading normalizer, stuck
+# heading index, section regex, heading map, cache digest) is built once here.
+# Change the dictionary only through register_headings() so these artifacts
+# are rebuilt together instead of on every resume.
+_headings_lock = threading.Lock()
+
+
+def _rebuild_heading_artifacts():
+    global _heading_normalizer, _stuck_heading_index, _section_heading_regex, _heading_map, _headings_digest
+    headings = {section: sorted(variants) for section, variants in resume_headings_base.items()}
+    _heading_normalizer = build_heading_normalizer(resume_headings_base)
+    _stuck_heading_index = StuckHeadingIndex(resume_headings_base)
+    _section_heading_regex = build_heading_regex()
+    _heading_map = build_heading_map(resume_headings_base)
+    _headings_digest = hashlib.sha256(json.dumps(headings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def register_headings(section, headings):
+    """
+    Add heading variants for a section (new or existing) at runtime.
+
+    Variants get the same case expansion as the built-in dictionary, then all
+    heading artifacts are rebuilt. The cache digest changes too, so cached
+    parse results made with the old dictionary are no longer served.
+    """
+    with _headings_lock:
+        added = expand_headings_inplace({section: list(headings)})[section]
+        resume_headings_base[section] = list(set(resume_headings_base.get(section, [])) | set(added))
+        _rebuild_heading_artifacts()
+    return sorted(resume_headings_base[section])
+
+
+def heading_snapshot():
+    """(digest, dictionary) of the current heading dictionary, for handing to parse worker processes."""
+    with _headings_lock:
+        return _headings_digest, {section: sorted(variants) for section, variants in resume_headings_base.items()}
+
+
+def apply_heading_snapshot(snapshot):
+    """
+    Make this process parse with a heading dictionary taken by
+    heading_snapshot() in another one. Long-lived pool workers call this per
+    job, so headings registered after they started are picked up; it is a
+    no-op while the digest already matches.
+    """
+    digest, headings = snapshot
+    with _headings_lock:
+        if digest == _headings_digest:
+            return
+        resume_headings_base.clear()
+        resume_headings_base.update({section: list(variants) for section, variants in headings.items()})
+        _rebuild_heading_artifacts()
+
+
+_rebuild_heading_artifacts()
+
+
 def remove_phone_numbers(text: str) -> str:
     """
     Removes phone numbers from text (to avoid confusion with years in date extraction).
@@ -462,18 +575,94 @@ def remove_phone_numbers(text: str) -> str:
     return cleaned
 
 
+# -----------------------------
+# Full Parse Pipeline
+# -----------------------------
+# Bump whenever a change to extraction, preprocessing, section or experience
+# logic alters parse output, so cached results from older code are not reused,
+# in the same change as the output change, and note it below.
+#   1  first cached parser
+#   2  experience entries as month intervals, overlap-merged totals
+#   3  one-pass experience scan (positional range containment, bare years in
+#      every block), whose output change had shipped without its own bump
+PARSER_VERSION = "3"
+
+
+def parser_version(engine_name, max_pages=None):
+    """Cache version tag: code version + extraction engine + page cap + layout detector + heading dictionary digest."""
+    return f"{PARSER_VERSION}-{engine_name}-p{max_pages or 0}-{DEFAULT_DETECTOR}-{_headings_digest}"
+
+
+def current_version_bounds():
+    """
+    (prefix, suffix) every parser_version() of this code and heading dictionary
+    has, whatever the engine, page cap or detector; cache entries without them
+    are stale.
+    """
+    return f"{PARSER_VERSION}-", f"-{_headings_digest}"
+
+
+@contextmanager
+def timed_stage(stages, name):
+    """Record wall and CPU seconds spent in the block under stages[name]."""
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        stages[name] = {"wall": time.perf_counter() - wall, "cpu": time.thread_time() - cpu}
+
+
+def parse_resume_document(pdf_path):
+    """
+    Run the whole extraction chain on one resume.
+
+    Returns a JSON-serialisable dict with the contact info, the normalized
+    sections, the experience dict and "stats": the detected layout, the page
+    count (and how many pages were parsed, see ResumeDocument.max_pages), the
+    character count and the wall/CPU seconds of each stage (see timed_stage).
+    """
+    stages = {}
+    doc, owned = _open_document(pdf_path)
+    try:
+        with timed_stage(stages, "detect_resume_type"):
+            resume_type = detect_resume_type(doc)
+        with timed_stage(stages, "extraction"):
+            contact = extract_contact_info(doc)
+            text = extract_resume_text(doc, resume_type)
+        page_count, pages_parsed = doc.page_count, doc.pages_to_parse
+    finally:
+        if owned:
+            doc.close()
+    char_count = len(text)
+
+    with timed_stage(stages, "preprocess_resume_text"):
+        text = preprocess_resume_text(text)
+    with timed_stage(stages, "extract_all_sections"):
+        sections = extract_all_sections(text)
+        sections = clean_section_dict(sections)
+        sections = normalize_sections(sections, resume_headings_base)
+    with timed_stage(stages, "extract_experience_dict"):
+        exp_text = remove_phone_numbers(sections.get("experience", ""))
+        experience = extract_experience_dict(exp_text)
+
+    stats = {"layout": resume_type, "page_count": page_count, "pages_parsed": pages_parsed,
+             "char_count": char_count, "stages": stages}
+    return {"contact": contact, "sections": sections, "experience": experience, "stats": stats}
+
+
 # -----------------------------
 # Run as Script
 # -----------------------------
 if __name__ == "__main__":
     pdf_path = r"C:\Users\user\PycharmProjects\ATS\Resume\Ikram ul haq- resume.pdf"  # Replace with your PDF path
-    contact_info = extract_contact_info(pdf_path)
+    with ResumeDocument(pdf_path) as doc:
+        contact_info = extract_contact_info(doc)
+        text_to_search = extract_resume_text(doc)
     print("=== Contact Info ===")
     print(f"Name: {contact_info['name']}")
     print(f"Email: {contact_info['email']}")
     print(f"Phone: {contact_info['phone']}")
 
-    text_to_search = extract_resume_text(pdf_path)
     text = preprocess_resume_text(text_to_search)
     # print(text)
     sections = extract_all_sections(text)
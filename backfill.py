@@ -0,0 +1,48 @@
+"""
+Backfill derived resume data in the database.
+
+The web app fills in what is missing at start-up (re-indexing every resume's
+skills when SKILLS_DB changed); this command does the same on demand. With
+--rebuild it also re-indexes every resume's skills regardless and re-derives
+the education of resumes stored as an ambiguous keyword (BS, BA, BE, MS) from
+their PDFs:
+
+    python backfill.py [skills|experience|education|all] [--rebuild]
+"""
+import argparse
+import time
+
+from database import init_db, reset_skill_index
+from ingest import (backfill_education_ranks, backfill_experience, backfill_resume_skills,
+                    reextract_ambiguous_education)
+
+TASKS = {
+    "skills": ("resume_skills", backfill_resume_skills),
+    "experience": ("experience months / total_exp", backfill_experience),
+    "education": ("education_rank", backfill_education_ranks),
+}
+
+
+def run(targets, rebuild=False):
+    init_db()
+    if rebuild and "skills" in targets:
+        reset_skill_index()
+    if rebuild and "education" in targets:
+        start = time.perf_counter()
+        changed = reextract_ambiguous_education()
+        print(f"education (re-parsed BS/BA/BE/MS): {changed} resumes changed in {time.perf_counter() - start:.2f}s")
+    for target in targets:
+        label, backfill = TASKS[target]
+        start = time.perf_counter()
+        updated = backfill()
+        print(f"{label}: {updated} resumes updated in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill derived resume data for rows already in the database.")
+    parser.add_argument("target", nargs="?", default="all", choices=[*TASKS, "all"])
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-extract the skills of every resume, not only the ones never indexed, and "
+                             "re-parse resumes stored with an ambiguous education keyword")
+    args = parser.parse_args()
+    run(list(TASKS) if args.target == "all" else [args.target], args.rebuild)
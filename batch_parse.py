@@ -0,0 +1,155 @@
+"""
+Parallel resume parsing.
+
+parse_many() fans documents out to a process pool and yields each result as
+soon as it is ready. Run as a script to ingest a whole directory into the
+database using all cores:
+
+    python batch_parse.py uploads/ [--workers N] [--engine fitz] [--no-save]
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# -----------------------------
+# Worker Side
+# -----------------------------
+def init_worker():
+    """Import the PDF stack once per worker instead of once per document."""
+    import fitz  # noqa: F401
+    import pdfplumber  # noqa: F401
+    import App2  # noqa: F401
+    import parse_cache  # noqa: F401
+    import parse_guard  # noqa: F401
+
+
+def parse_pdf_bytes(data, engine, max_pages, headings=None):
+    """Full parse of one PDF; runs in the per-document child process."""
+    from App2 import ResumeDocument, apply_heading_snapshot, parse_resume_document
+
+    if headings is not None:  # a spawned child starts from the built-in dictionary
+        apply_heading_snapshot(headings)
+    with ResumeDocument(data, engine=engine, max_pages=max_pages) as doc:
+        return parse_resume_document(doc)
+
+
+def _guarded_parse(doc):
+    from App2 import heading_snapshot
+    from parse_guard import run_isolated
+
+    return run_isolated(parse_pdf_bytes, (doc.data, doc.engine.name, doc.max_pages, heading_snapshot()))
+
+
+def parse_one(index, filename, source, engine, headings=None):
+    """
+    Parse one resume in a worker. Never raises: errors are returned as data.
+
+    `headings` is an App2.heading_snapshot() of the submitting process; a
+    long-lived worker applies it first, so headings registered since the
+    worker started (and the cache version they imply) are used.
+
+    Cache misses are parsed in a child process under the limits of
+    parse_guard (timeout, page cap, RSS growth), so a runaway PDF is killed
+    without taking the worker down. Failures carry an "error" message and an
+    "error_code": "timeout", "memory_limit", "crashed" or "parse_error".
+    """
+    from App2 import ResumeDocument, apply_heading_snapshot
+    from parse_cache import cached_parse_resume
+    from parse_guard import PARSE_MAX_PAGES, DocumentLimitError
+
+    start = time.perf_counter()
+    result = {"index": index, "filename": filename, "started_at": time.time()}
+    try:
+        if headings is not None:
+            apply_heading_snapshot(headings)
+        with ResumeDocument(source, engine=engine, max_pages=PARSE_MAX_PAGES) as doc:
+            result.update(cached_parse_resume(doc, parse=_guarded_parse))
+    except DocumentLimitError as e:
+        result.update(error=str(e), error_code=e.code, error_details=e.details)
+    except Exception as e:
+        result.update(error=str(e), error_code="parse_error")
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+# -----------------------------
+# Batch API
+# -----------------------------
+def _normalize_item(index, item):
+    """Accept a path, raw bytes or a (filename, path_or_bytes) pair."""
+    if isinstance(item, tuple):
+        return item
+    if isinstance(item, (bytes, bytearray)):
+        return f"document_{index}.pdf", bytes(item)
+    return os.path.basename(item), item
+
+
+def parse_many(paths_or_bytes, workers=None, engine=None):
+    """
+    Parse many resumes in parallel and yield results in completion order.
+
+    Each item may be a file path, the PDF bytes, or a (filename, path_or_bytes)
+    pair. Each yielded dict carries "index" (position in the input),
+    "filename", "started_at" (epoch seconds), "elapsed" seconds and either the parse result ("contact",
+    "sections", "experience", "stats") or an "error" message with its "error_code" (see parse_one).
+    """
+    from database import init_db
+
+    init_db()  # workers read and write the parse cache table
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = []
+        for index, item in enumerate(paths_or_bytes):
+            filename, source = _normalize_item(index, item)
+            futures.append(pool.submit(parse_one, index, filename, source, engine))
+        for future in as_completed(futures):
+            yield future.result()
+
+
+# -----------------------------
+# Directory Ingest CLI
+# -----------------------------
+def ingest_directory(directory, workers=None, engine=None, save=True):
+    from ingest import save_parsed_resume
+
+    paths = sorted(glob.glob(os.path.join(directory, "*.pdf")))
+    if not paths:
+        print(f"No PDFs found in {directory}")
+        return
+
+    workers = workers or os.cpu_count() or 1
+    ok, failed, parse_seconds = 0, 0, 0.0
+    start = time.perf_counter()
+    for result in parse_many(paths, workers=workers, engine=engine):
+        parse_seconds += result["elapsed"]
+        if "error" in result:
+            failed += 1
+            print(f"[{result['error_code']}] {result['filename']}: {result['error']}")
+            continue
+        if save:
+            with open(paths[result["index"]], "rb") as f:
+                save_parsed_resume(result["filename"], f.read(), result)
+        ok += 1
+        print(f"[ok]    {result['filename']} ({result['elapsed']:.2f}s)")
+    wall = time.perf_counter() - start
+
+    total = ok + failed
+    print("\n=== Ingest Summary ===")
+    print(f"Files:       {total} ({ok} ok, {failed} failed)")
+    print(f"Workers:     {workers}")
+    print(f"Wall time:   {wall:.2f}s")
+    print(f"Throughput:  {total / wall:.2f} docs/s")
+    print(f"Mean parse:  {parse_seconds / total:.3f}s per document")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse a directory of resumes in parallel and store them.")
+    parser.add_argument("directory", help="Directory containing PDF resumes (e.g. uploads/ or Resume/)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--engine", default=None, help="Extraction engine (fitz or pdfplumber)")
+    parser.add_argument("--no-save", action="store_true", help="Parse only, do not write to the database")
+    args = parser.parse_args()
+    ingest_directory(args.directory, args.workers, args.engine, save=not args.no_save)
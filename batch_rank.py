@@ -0,0 +1,106 @@
+"""
+Rank the stored resumes against many job descriptions at once.
+
+Every JD (PDF, DOCX or plain text; directories are searched for those) is
+read and parsed once, the resume skill matrix is loaded once and all JDs are
+scored against all resumes in one pass (score.rank_jd_batch). Each JD's
+ranking is written to <out>/<jd name>.csv, or .json with --format json:
+
+    python batch_rank.py JD_uploads/ other_jd.docx [--top 50] [--out rankings/] [--format csv]
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import time
+
+from jd_parser import JD_EXTENSIONS, parse_job_description, read_job_description
+
+RANKING_FIELDS = ["rank", "id", "name", "phone", "email", "skills_score", "experience_score", "total_score"]
+
+
+def collect_jd_paths(paths):
+    """The JD files among the given paths, directories expanded (sorted) to the files they hold."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found += sorted(p for p in glob.glob(os.path.join(path, "*")) if p.lower().endswith(JD_EXTENSIONS))
+        else:
+            found.append(path)
+    return found
+
+
+def rank_jd_files(paths, limit):
+    """
+    Read, parse and rank a batch of JD files. Yields (path, jd_dict, rows,
+    total) per readable JD, in input order; unreadable ones are reported
+    and skipped.
+    """
+    from score import rank_jd_batch
+
+    parsed = []
+    for path in paths:
+        try:
+            parsed.append((path, parse_job_description(read_job_description(path))))
+        except Exception as e:
+            print(f"[error] {path}: {e}")
+    rankings = rank_jd_batch([jd_dict for _, jd_dict in parsed], limit) if parsed else []
+    for (path, jd_dict), (rows, total) in zip(parsed, rankings):
+        yield path, jd_dict, rows, total
+
+
+def write_ranking(out_path, jd_dict, rows, total, fmt):
+    ranked = [{"rank": rank, **row} for rank, row in enumerate(rows, 1)]
+    if fmt == "json":
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump({"jd": jd_dict, "total_matches": total, "resumes": ranked}, f, indent=2)
+    else:
+        with open(out_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RANKING_FIELDS)
+            writer.writeheader()
+            writer.writerows(ranked)
+
+
+def rank_jds(paths, out_dir="rankings", limit=50, fmt="csv"):
+    from database import init_db
+
+    jd_paths = collect_jd_paths(paths)
+    if not jd_paths:
+        print("No job descriptions found")
+        return
+
+    init_db()
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    used_names = set()
+    ranked = 0
+    for path, jd_dict, rows, total in rank_jd_files(jd_paths, limit):
+        name = os.path.splitext(os.path.basename(path))[0]
+        out_name, n = name, 1
+        while out_name in used_names:  # same file name in two directories
+            n += 1
+            out_name = f"{name}_{n}"
+        used_names.add(out_name)
+
+        out_path = os.path.join(out_dir, f"{out_name}.{fmt}")
+        write_ranking(out_path, jd_dict, rows, total, fmt)
+        ranked += 1
+        print(f"[ok]    {path}: {total} matching resumes, top {len(rows)} -> {out_path}")
+    wall = time.perf_counter() - start
+
+    print("\n=== Ranking Summary ===")
+    print(f"JDs:         {len(jd_paths)} ({ranked} ranked, {len(jd_paths) - ranked} failed)")
+    print(f"Wall time:   {wall:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank the stored resumes against a batch of job descriptions.")
+    parser.add_argument("paths", nargs="+", help="JD files (PDF, DOCX, TXT) or directories holding them")
+    parser.add_argument("--top", type=int, default=50, help="Resumes kept per JD (default: 50)")
+    parser.add_argument("--out", default="rankings", help="Output directory (default: rankings/)")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    args = parser.parse_args()
+    if args.top < 1:
+        parser.error("--top must be at least 1")
+    rank_jds(args.paths, args.out, args.top, args.format)
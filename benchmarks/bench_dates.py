@@ -0,0 +1,125 @@
+"""
+Parity fuzz and micro-benchmark for experience_calculator.parse_date.
+
+Checks the single-regex, memoized parse_date against the original
+DATE_FORMATS strptime loop on every format with random fields, on random
+near-miss strings (bad separators, stray spaces, invalid days, 2-digit
+years, unknown month spellings) and on plain random noise, then times both
+on a realistic mix of date strings.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_dates [--cases 200000] [--seed 0] [--repeat 5]
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from experience_calculator import DATE_FORMATS, PRESENT_WORDS, _parse_date_fields, parse_date
+
+MONTH_SPELLINGS = ["jan", "January", "FEB", "february", "mar", "march", "apr", "april", "may", "jun", "june",
+                   "jul", "july", "aug", "august", "sep", "Sept", "september", "oct", "october", "nov",
+                   "november", "dec", "december", "ja", "juni", "sepember", "ſep"]
+SEPARATORS = ["", " ", "  ", ".", ". ", "-", "/", ",", ", ", "\n", "\t", " - "]
+
+
+def legacy_parse_date(date_str):
+    """The original implementation: try every DATE_FORMATS entry with strptime."""
+    date_str = date_str.strip().lower().replace("(", "").replace(")", "")
+    if date_str in ["current", "present", "now", "till date", "ongoing"]:
+        return datetime.today()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def random_number(rng):
+    return rng.choice([
+        str(rng.randint(0, 40)), f"{rng.randint(0, 40):02d}", f" {rng.randint(1, 9)}",
+        str(rng.randint(1900, 2030)), f"{rng.randint(0, 99):02d}", f"{rng.randint(0, 99999)}", "0000",
+    ])
+
+
+def random_case(rng):
+    kind = rng.random()
+    if kind < 0.35:  # a real format with random fields
+        fmt = rng.choice(DATE_FORMATS)
+        text = fmt
+        for token, value in (("%d", random_number(rng)), ("%m", random_number(rng)), ("%Y", random_number(rng)),
+                             ("%b", rng.choice(MONTH_SPELLINGS)), ("%B", rng.choice(MONTH_SPELLINGS))):
+            text = text.replace(token, value)
+        return text
+    if kind < 0.85:  # near misses assembled from date-like pieces
+        pieces = [rng.choice([random_number(rng), rng.choice(MONTH_SPELLINGS)]) for _ in range(rng.randint(1, 3))]
+        text = pieces[0]
+        for piece in pieces[1:]:
+            text += rng.choice(SEPARATORS) + piece
+        if rng.random() < 0.15:
+            text = rng.choice(["(", " ", ""]) + text + rng.choice([")", " ", ""])
+        return text
+    alphabet = "0123456789 /.-,()janfebmrpyulgsoctvdeJANS\n٣"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+
+
+def fuzz(cases, seed):
+    rng = random.Random(seed)
+    mismatches, parsed = [], 0
+    for _ in range(cases):
+        text = random_case(rng)
+        if text.strip().lower().replace("(", "").replace(")", "") in PRESENT_WORDS:
+            continue
+        expected, got = legacy_parse_date(text), parse_date(text)
+        parsed += expected is not None
+        if expected != got:
+            mismatches.append((text, expected, got))
+    return parsed, mismatches
+
+
+def realistic_sample(rng, size=5000):
+    """Date strings in the shapes DATE_RANGE_REGEX extracts from resumes, with heavy repetition."""
+    months = ["Jan", "Feb", "March", "Apr", "May", "June", "Jul", "Aug", "Sep", "Oct", "Nov", "December"]
+    shapes = [
+        lambda: f"{rng.choice(months)} {rng.randint(2010, 2025)}",
+        lambda: f"{rng.choice(months)}{rng.randint(2010, 2025)}",
+        lambda: f"{rng.randint(1, 12):02d}/{rng.randint(2010, 2025)}",
+        lambda: f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2010, 2025)}",
+        lambda: str(rng.randint(2010, 2025)),
+        lambda: rng.choice(["Present", "Current", "ongoing"]),
+    ]
+    return [rng.choice(shapes)() for _ in range(size)]
+
+
+def time_per_call(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def run(cases=200000, seed=0, repeat=5):
+    parsed, mismatches = fuzz(cases, seed)
+    print(f"fuzz: {cases} strings, {parsed} valid dates, {len(mismatches)} mismatches")
+    for text, expected, got in mismatches[:20]:
+        print(f"  {text!r}: strptime {expected} vs parse_date {got}")
+
+    texts = realistic_sample(random.Random(seed))
+    _parse_date_fields.cache_clear()
+    before = time_per_call(legacy_parse_date, texts, repeat)
+    after = time_per_call(parse_date, texts, repeat)
+    print(f"\n{len(texts)} resume-style date strings, {len(set(texts))} distinct, {repeat} repetitions")
+    print(f"before (strptime loop): {before * 1e6:8.2f} us/date")
+    print(f"after  (regex + memo):  {after * 1e6:8.2f} us/date")
+    print(f"speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fuzz and benchmark parse_date against the strptime loop.")
+    parser.add_argument("--cases", type=int, default=200000, help="Random strings to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions over the sample")
+    args = parser.parse_args()
+    run(args.cases, args.seed, args.repeat)
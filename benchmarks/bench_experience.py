@@ -0,0 +1,191 @@
+"""
+Parity check and benchmark for experience_calculator.extract_experience_dict.
+
+Compares the single-pass scanner (one DATE_RANGE_REGEX scan and one year
+scan per block, bisect containment) with the original implementation, which
+re-ran the unfactored DATE_RANGE_REGEX over the whole block for every bare
+year, on a synthetic experience section of `--jobs` jobs and on random
+date-heavy noise.
+
+The two differ by design in two ways, so the parity check compares only the
+range matches and the range entries:
+  * a year is skipped only when it lies inside a range, not when the same
+    digits appear in some range elsewhere in the block ("10//2022" next to
+    "08/2022 - Present" used to be dropped);
+  * bare years are looked up in every block, not just the last one.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_experience [--jobs 50] [--cases 20000] [--seed 0] [--repeat 20]
+"""
+import argparse
+import random
+import re
+import time
+
+from experience_calculator import (DATE_RANGE_REGEX, MONTHS, calculate_experience, extract_experience_dict,
+                                   extract_job_role)
+
+LEGACY_DATE_RANGE_REGEX = re.compile(
+    rf"(?P<start>"
+    r"\d{1,2}[\/\-.]\d{1,2}[\/\-.]\d{2,4}"
+    r"|"
+    r"\d{1,2}[\/\-.]\d{4}"
+    r"|"
+    rf"(?:{MONTHS})[.,]?\s*\d{{1,2}},?\s*\d{{2,4}}"
+    r"|"
+    rf"(?:{MONTHS})[.,]?\s*\d{4}"
+    r"|"
+    rf"(?:{MONTHS})[-.]?\d{{4}}"
+    r"|"
+    r"\d{4}"
+    r")"
+    r"\s*(?:-|–|to)\s*"
+    r"(?P<end>"
+    r"\d{1,2}[\/\-.]\d{1,2}[\/\-.]\d{2,4}"
+    r"|\d{1,2}[\/\-.]\d{4}"
+    rf"|(?:{MONTHS})[.,]?\s*\d{{1,2}},?\s*\d{{2,4}}"
+    rf"|(?:{MONTHS})[.,]?\s*\d{{4}}"
+    rf"|(?:{MONTHS})[-.]?\d{{4}}"
+    r"|\d{4}"
+    r"|present|current|now|till\sdate|ongoing"
+    r")",
+    re.IGNORECASE
+)
+
+ROLES = ["Software Engineer", "Data Analyst", "AI Development Intern", "Flutter Developer", "Team Lead",
+         "Assistant Data Scientist", "Sales Executive", "Backend Developer", "QA Engineer", "Product Manager"]
+COMPANIES = ["BistartX", "Aquafarm (Govt Startup)", "Topline Marketing Pvt Ltd", "EoriSoft", "SecondBrain",
+             "Systems Ltd", "NetSol Technologies", "Arbisoft", "10Pearls", "Techlogix"]
+BULLETS = ["Assisted in building AI models and automating data pipelines.",
+           "Collected, organized, and analyzed data for farm yield predictions in 2019 and 2020.",
+           "Prepared regular reports in Excel and Google Sheets for stakeholders.",
+           "Communicated with customers through email and digital platforms.",
+           "Migrated 40 services to Kubernetes, cutting hosting costs by 30%.",
+           "Mentored 3 interns and reviewed 120+ pull requests."]
+MONTH_WORDS = ["Jan", "Feb", "March", "Apr", "May", "June", "Jul", "Aug", "Sept", "Oct", "Nov", "December"]
+
+
+def legacy_extract_experience_dict(text):
+    """The original implementation (range entries first, then bare years of the last block)."""
+    blocks = [b.strip() for b in text.split("\n\n") if b.strip()]
+    if not blocks:
+        return {}
+
+    exp_dict = {}
+    exp_counter = 1
+
+    for block in blocks:
+        for match in LEGACY_DATE_RANGE_REGEX.finditer(block):
+            start, end = match.group("start"), match.group("end")
+            exp_dict[f"exp_{exp_counter}"] = {
+                "role": extract_job_role(block, match),
+                "start_date": start,
+                "end_date": end,
+                "exp": calculate_experience(start, end)
+            }
+            exp_counter += 1
+
+    for year_match in re.finditer(r"\b(19|20)\d{2}\b", block):
+        year_str = year_match.group(0)
+        if any(year_str in m.group(0) for m in LEGACY_DATE_RANGE_REGEX.finditer(block)):
+            continue
+        exp_dict[f"exp_{exp_counter}"] = {
+            "role": extract_job_role(block, year_match),
+            "start_date": year_str,
+            "end_date": "",
+            "exp": "1 years 0 months"
+        }
+        exp_counter += 1
+
+    return exp_dict
+
+
+def random_date(rng):
+    year = rng.randint(2005, 2025)
+    return rng.choice([
+        f"{rng.choice(MONTH_WORDS)} {year}", f"{rng.choice(MONTH_WORDS)}{year}", f"{rng.choice(MONTH_WORDS)}-{year}",
+        f"{rng.choice(MONTH_WORDS)}. {year}", f"{rng.choice(MONTH_WORDS)} {rng.randint(1, 28)}, {year}",
+        f"{rng.randint(1, 12):02d}/{year}", f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{year}",
+        str(year),
+    ])
+
+
+def synthetic_section(rng, jobs=50):
+    """One extracted experience section (a single block, as extract_all_sections produces) of `jobs` jobs."""
+    parts = ["EXPERIENCE"]
+    for _ in range(jobs):
+        end = rng.choice([random_date(rng), "Present", "Current"])
+        dates = rng.choice([f"{random_date(rng)} – {end}", f"{random_date(rng)} - {end}",
+                            f"{random_date(rng)} to {end}", str(rng.randint(2005, 2025))])
+        parts.append(f"{rng.choice(COMPANIES)} | {rng.choice(ROLES)} {dates} | Islamabad, PK")
+        parts += [f"• {bullet}" for bullet in rng.sample(BULLETS, 3)]
+    return " ".join(parts)
+
+
+def random_noise(rng):
+    pieces = [rng.choice([random_date(rng), rng.choice(MONTH_WORDS), str(rng.randint(0, 3000)),
+                          rng.choice(ROLES), "Present", "till date"]) for _ in range(rng.randint(1, 8))]
+    text = pieces[0]
+    for piece in pieces[1:]:
+        text += rng.choice([" ", " - ", "-", "–", " to ", "/", ".", ", ", "\n", "\n\n", ""]) + piece
+    return text
+
+
+def ranges(pattern, text):
+    return [(m.span(), m.group("start"), m.group("end")) for m in pattern.finditer(text)]
+
+
+def range_entries(exp_dict):
+    """The range entries, limited to the fields the original implementation produced."""
+    return [{key: entry[key] for key in ("role", "start_date", "end_date", "exp")}
+            for entry in exp_dict.values() if entry["end_date"]]
+
+
+def parity(cases, seed, jobs):
+    rng = random.Random(seed)
+    texts = [synthetic_section(rng, jobs) for _ in range(20)] + [random_noise(rng) for _ in range(cases)]
+    mismatches = []
+    for text in texts:
+        if ranges(LEGACY_DATE_RANGE_REGEX, text) != ranges(DATE_RANGE_REGEX, text) or \
+                range_entries(legacy_extract_experience_dict(text)) != range_entries(extract_experience_dict(text)):
+            mismatches.append(text)
+    return len(texts), mismatches
+
+
+def best_of(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(jobs=50, cases=20000, seed=0, repeat=20):
+    checked, mismatches = parity(cases, seed, jobs)
+    print(f"parity: {checked} texts, {len(mismatches)} with different ranges")
+    for text in mismatches[:10]:
+        print(f"  {text[:120]!r}")
+
+    section = synthetic_section(random.Random(seed), jobs)
+    result = extract_experience_dict(section)
+    bare = len(result) - len(range_entries(result))
+    print(f"\nsynthetic section: {jobs} jobs, {len(section)} chars, "
+          f"{len(result) - bare} ranges + {bare} bare years")
+    for label, pattern in (("regex before", LEGACY_DATE_RANGE_REGEX), ("regex after", DATE_RANGE_REGEX)):
+        print(f"{label + ' (finditer)':<26}{best_of(lambda t: list(pattern.finditer(t)), section, repeat) * 1000:9.3f} ms")
+    before = best_of(legacy_extract_experience_dict, section, repeat)
+    after = best_of(extract_experience_dict, section, repeat)
+    print(f"{'before (rescan per year)':<26}{before * 1000:9.3f} ms")
+    print(f"{'after  (single pass)':<26}{after * 1000:9.3f} ms")
+    print(f"speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and benchmark extract_experience_dict.")
+    parser.add_argument("--jobs", type=int, default=50, help="Jobs in the synthetic experience section")
+    parser.add_argument("--cases", type=int, default=20000, help="Random date-heavy strings to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best is kept)")
+    args = parser.parse_args()
+    run(args.jobs, args.cases, args.seed, args.repeat)
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark for App2.normalize_headings.
+
+Compares the original per-variant re.sub loop with the precompiled
+single-pass normalizer on the extracted text of every resume in a corpus,
+checks both produce identical output and prints the per-resume cost.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_headings [--corpus uploads] [--limit N] [--repeat 20] [--engine fitz]
+"""
+import argparse
+import glob
+import os
+import re
+import time
+
+from App2 import ResumeDocument, extract_resume_text, fix_spaced_words, normalize_headings, resume_headings_base
+
+
+def legacy_normalize_headings(text: str) -> str:
+    """The original implementation: one fresh pattern and full re.sub per variant."""
+    for section, variants in resume_headings_base.items():
+        for variant in variants:
+            words = variant.split()
+            pattern = r"\s*".join(re.escape(w) for w in words)
+            text = re.sub(pattern, lambda m: re.sub(r"\s+", " ", m.group(0)), text, flags=re.I)
+    return text
+
+
+def time_per_call(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def run(corpus, limit=None, repeat=20, engine=None):
+    paths = sorted(glob.glob(os.path.join(corpus, "*.pdf")))[:limit]
+    texts = []
+    for path in list(paths):
+        try:
+            with ResumeDocument(path, engine=engine) as doc:
+                texts.append(fix_spaced_words(extract_resume_text(doc)))
+        except Exception as e:
+            print(f"skipping {os.path.basename(path)}: {e}")
+            paths.remove(path)
+    if not texts:
+        print(f"No PDFs found in {corpus}")
+        return
+
+    mismatches = [os.path.basename(p) for p, t in zip(paths, texts)
+                  if legacy_normalize_headings(t) != normalize_headings(t)]
+
+    before = time_per_call(legacy_normalize_headings, texts, repeat)
+    after = time_per_call(normalize_headings, texts, repeat)
+    avg_chars = sum(len(t) for t in texts) / len(texts)
+
+    print(f"{len(texts)} resumes, {avg_chars:.0f} chars on average, {repeat} repetitions")
+    print(f"before (per-variant re.sub): {before * 1000:8.3f} ms/resume")
+    print(f"after  (single pass):        {after * 1000:8.3f} ms/resume")
+    print(f"speedup: x{before / after:.1f}")
+    print(f"identical output: {len(texts) - len(mismatches)}/{len(texts)}")
+    for name in mismatches:
+        print(f"  differs: {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the heading normalizer.")
+    parser.add_argument("--corpus", default="uploads", help="Directory of PDF resumes")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N files")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions per resume")
+    parser.add_argument("--engine", default=None, help="Extraction engine used to obtain the text")
+    args = parser.parse_args()
+    run(args.corpus, args.limit, args.repeat, args.engine)
@@ -0,0 +1,124 @@
+"""
+Accuracy and speed of the layout detectors.
+
+Runs every strategy in layout_detectors.DETECTORS over the labelled corpus in
+benchmarks/layout_ground_truth.json (path -> "one-column" / "two-column";
+regenerate thumbnails for relabelling with benchmarks/layout_contact_sheet.py)
+and reports, per detector, the confusion matrix, accuracy, per-document
+latency and the number of first-page blocks it processed. Byte-identical
+copies of a resume are only counted once.
+
+The first-page blocks are extracted once per document and shared by all
+detectors; that extraction cost is reported separately, so the detector
+latencies compare the classification work alone.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_layout [--labels benchmarks/layout_ground_truth.json] [--repeat 20] [--verbose]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from App2 import ResumeDocument
+from layout_detectors import DETECTORS, first_page_blocks
+
+LABELS = ("one-column", "two-column")
+DEFAULT_LABELS_FILE = os.path.join(os.path.dirname(__file__), "layout_ground_truth.json")
+
+
+def load_documents(labels_file):
+    """[(path, label, blocks, page_w, page_h, extract_seconds)] for every distinct labelled PDF."""
+    with open(labels_file) as f:
+        labels = json.load(f)
+
+    documents, seen = [], set()
+    for path, label in labels.items():
+        if not os.path.exists(path):
+            print(f"missing: {path}")
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        with ResumeDocument(data) as doc:
+            start = time.perf_counter()
+            blocks, page_w, page_h = first_page_blocks(doc)
+            elapsed = time.perf_counter() - start
+        documents.append((path, label, blocks, page_w, page_h, elapsed))
+    return documents
+
+
+def evaluate(detector, documents, repeat):
+    """Predictions, best-of-`repeat` latencies and blocks used of one detector over the corpus."""
+    predictions, latencies, blocks_used = [], [], []
+    for path, label, blocks, page_w, page_h, _ in documents:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = detector.classify(blocks, page_w, page_h)
+            best = min(best, time.perf_counter() - start)
+        predictions.append(result)
+        latencies.append(best)
+        blocks_used.append(detector.classify(blocks, page_w, page_h, debug=True)["blocks_used"])
+    return predictions, latencies, blocks_used
+
+
+def confusion_matrix(truth, predictions):
+    """matrix[true][predicted] counts over LABELS."""
+    matrix = {t: {p: 0 for p in LABELS} for t in LABELS}
+    for t, p in zip(truth, predictions):
+        matrix[t][p] += 1
+    return matrix
+
+
+def run(labels_file, repeat=20, verbose=False):
+    documents = load_documents(labels_file)
+    if not documents:
+        print(f"No labelled documents found from {labels_file}")
+        return
+
+    truth = [label for _, label, *_ in documents]
+    blocks_total = [len(blocks) for _, _, blocks, *_ in documents]
+    extract = [elapsed for *_, elapsed in documents]
+    print(f"{len(documents)} distinct documents "
+          f"({truth.count('two-column')} two-column, {truth.count('one-column')} one-column)")
+    print(f"first-page block extraction (shared): mean {np.mean(extract) * 1000:.3f} ms, "
+          f"{np.mean(blocks_total):.1f} blocks/page\n")
+
+    print(f"{'detector':<18}{'accuracy':>9}{'TP':>5}{'FN':>5}{'FP':>5}{'TN':>5}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}{'blocks used':>13}")
+    misses = {}
+    for name, detector in DETECTORS.items():
+        predictions, latencies, blocks_used = evaluate(detector, documents, repeat)
+        matrix = confusion_matrix(truth, predictions)
+        correct = matrix["one-column"]["one-column"] + matrix["two-column"]["two-column"]
+        p50, p95 = np.percentile(latencies, (50, 95)) * 1000
+        print(f"{name:<18}{correct / len(documents):>9.1%}"
+              f"{matrix['two-column']['two-column']:>5}{matrix['two-column']['one-column']:>5}"
+              f"{matrix['one-column']['two-column']:>5}{matrix['one-column']['one-column']:>5}"
+              f"{p50:>9.3f}{p95:>9.3f}{np.mean(latencies) * 1000:>9.3f}"
+              f"{np.mean(blocks_used):>8.1f}/{np.mean(blocks_total):.0f}")
+        misses[name] = [(path, label) for (path, label, *_), p in zip(documents, predictions) if p != label]
+
+    print("\n(TP/FN: two-column documents detected / missed; FP/TN: one-column documents "
+          "flagged as two-column / kept)")
+    if verbose:
+        for name, wrong in misses.items():
+            print(f"\n{name}: {len(wrong)} misclassified")
+            for path, label in wrong:
+                print(f"  {path} (labelled {label})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare layout detectors against the labelled corpus.")
+    parser.add_argument("--labels", default=DEFAULT_LABELS_FILE, help="Ground-truth JSON (path -> layout)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions per document (best is kept)")
+    parser.add_argument("--verbose", action="store_true", help="List the misclassified documents per detector")
+    args = parser.parse_args()
+    run(args.labels, args.repeat, args.verbose)
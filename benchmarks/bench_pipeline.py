@@ -0,0 +1,258 @@
+"""
+Throughput benchmark for the resume parse pipeline.
+
+Runs the full pipeline (App2.parse_resume_document, no parse cache) over the
+bundled corpus, then every stage in isolation on pre-computed inputs, and
+reports documents per second, p50/p95/p99 latency per stage and the peak RSS
+of the process. Results can be written as a JSON baseline; later runs compared
+against it exit with status 1 when a metric regresses by more than the
+threshold.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_pipeline [--corpus uploads Resume JD_uploads] [--limit N] [--engine fitz]
+                                        [--repeat 3] [--write-baseline benchmarks/baseline.json]
+                                        [--baseline benchmarks/baseline.json] [--threshold 0.2] [--min-ms 1.0]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import database
+from App2 import (ResumeDocument, clean_section_dict, detect_resume_type, extract_all_sections,
+                  extract_contact_info, extract_experience_dict, extract_resume_text, normalize_sections,
+                  parse_resume_document, preprocess_resume_text, remove_phone_numbers, resume_headings_base)
+from ingest import save_parsed_resume
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_CORPUS = ("uploads", "Resume", "JD_uploads")
+PERCENTILES = (50, 95, 99)
+
+
+def load_corpus(directories, limit=None):
+    """Read every PDF of the given directories into memory as (name, bytes)."""
+    paths = []
+    for directory in directories:
+        paths += sorted(glob.glob(os.path.join(directory, "*.pdf")))
+    corpus = []
+    for path in paths[:limit]:
+        with open(path, "rb") as f:
+            corpus.append((os.path.relpath(path), f.read()))
+    return corpus
+
+
+def summarize(samples):
+    """Latency summary (seconds) of a list of per-document timings."""
+    if not samples:
+        return None
+    p50, p95, p99 = np.percentile(samples, PERCENTILES).tolist()
+    return {"count": len(samples), "mean": float(np.mean(samples)), "p50": p50, "p95": p95, "p99": p99}
+
+
+def peak_rss_mb():
+    """High-water mark of this process' resident set size, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+# -----------------------------
+# Full Pipeline
+# -----------------------------
+def run_pipeline(corpus, engine=None):
+    """Parse every document end to end; returns throughput, per-stage samples and the parse results."""
+    stages, totals, parsed, failed = {}, [], {}, []
+    start = time.perf_counter()
+    for name, data in corpus:
+        doc_start = time.perf_counter()
+        try:
+            with ResumeDocument(data, engine=engine) as doc:
+                result = parse_resume_document(doc)
+        except Exception as e:
+            failed.append((name, str(e)))
+            continue
+        totals.append(time.perf_counter() - doc_start)
+        for stage, timing in result.pop("stats")["stages"].items():
+            stages.setdefault(stage, []).append(timing["wall"])
+        parsed[name] = result
+    wall = time.perf_counter() - start
+
+    return {
+        "docs": len(totals),
+        "failed": failed,
+        "wall_seconds": wall,
+        "docs_per_sec": len(totals) / wall if wall else 0.0,
+        "latency": summarize(totals),
+        "stages": {stage: summarize(samples) for stage, samples in stages.items()},
+    }, parsed
+
+
+# -----------------------------
+# Stages in Isolation
+# -----------------------------
+def best_of(repeat, func, *args):
+    """Fastest of `repeat` timed calls, to keep scheduler noise out of the stage figures."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _with_document(func, data, engine, *args):
+    # open a fresh document so per-page caches of the PDF libraries are not reused between repeats
+    with ResumeDocument(data, engine=engine) as doc:
+        return func(doc, *args)
+
+
+def _sections(text):
+    return normalize_sections(clean_section_dict(extract_all_sections(text)), resume_headings_base)
+
+
+def run_isolated(corpus, parsed, engine=None, repeat=3):
+    """Time each stage on its own, feeding it the output of the previous stage computed beforehand."""
+    samples = {}
+
+    def record(stage, *call):
+        samples.setdefault(stage, []).append(best_of(repeat, *call))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        live_database, database.DATABASE = database.DATABASE, os.path.join(tmp, "bench.db")
+        try:
+            database.init_db()
+            for name, data in corpus:
+                if name not in parsed:
+                    continue  # failed in the full pipeline run
+                resume_type = _with_document(detect_resume_type, data, engine)
+                text = _with_document(extract_resume_text, data, engine, resume_type)
+                preprocessed = preprocess_resume_text(text)
+                exp_text = remove_phone_numbers(_sections(preprocessed).get("experience", ""))
+
+                record("detect_resume_type", _with_document, detect_resume_type, data, engine)
+                record("extract_contact_info", _with_document, extract_contact_info, data, engine)
+                record("extract_resume_text", _with_document, extract_resume_text, data, engine, resume_type)
+                record("preprocess_resume_text", preprocess_resume_text, text)
+                record("extract_all_sections", _sections, preprocessed)
+                record("extract_experience_dict", extract_experience_dict, exp_text)
+                record("db_write", save_parsed_resume, name, data, parsed[name])
+        finally:
+            database.DATABASE = live_database
+
+    return {stage: summarize(values) for stage, values in samples.items()}
+
+
+# -----------------------------
+# Baseline Comparison
+# -----------------------------
+def compare(current, baseline, threshold, min_ms):
+    """
+    Return a list of regression messages. Throughput regresses when it drops
+    by more than `threshold` (a fraction); latency and memory regress when they
+    grow by more than `threshold` and, for latencies, by more than `min_ms`.
+    """
+    regressions = []
+
+    def check(label, new, old, higher_is_better=False, floor=0.0):
+        if new is None or old is None or old == 0:
+            return
+        change = (old - new) / old if higher_is_better else (new - old) / old
+        if change > threshold and abs(new - old) > floor:
+            regressions.append(f"{label}: {old:.4g} -> {new:.4g} ({change:+.0%})")
+
+    check("pipeline docs/s", current["pipeline"]["docs_per_sec"], baseline["pipeline"]["docs_per_sec"],
+          higher_is_better=True)
+    check("peak RSS MB", current["peak_rss_mb"], baseline.get("peak_rss_mb"))
+    for group in ("pipeline", "isolated"):
+        old_stages = baseline[group]["stages"] if group == "pipeline" else baseline[group]
+        new_stages = current[group]["stages"] if group == "pipeline" else current[group]
+        for stage, new in new_stages.items():
+            old = old_stages.get(stage)
+            if not new or not old:
+                continue
+            for p in ("p50", "p95"):
+                check(f"{group} {stage} {p} (s)", new[p], old[p], floor=min_ms / 1000)
+    return regressions
+
+
+def print_stage_table(title, stages):
+    print(f"\n{title} (ms)")
+    print(f"  {'stage':<26}{'n':>5}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for stage, stats in stages.items():
+        if stats:
+            print(f"  {stage:<26}{stats['count']:>5}"
+                  + "".join(f"{stats[k] * 1000:>10.2f}" for k in ("mean", "p50", "p95", "p99")))
+
+
+def run(corpus_dirs, limit=None, engine=None, repeat=3):
+    corpus = load_corpus(corpus_dirs, limit)
+    if not corpus:
+        print(f"No PDFs found in {', '.join(corpus_dirs)}")
+        return None
+
+    pipeline, parsed = run_pipeline(corpus, engine)
+    isolated = run_isolated(corpus, parsed, engine, repeat)
+    results = {
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "engine": engine or "default",
+        "corpus": list(corpus_dirs),
+        "pipeline": pipeline,
+        "isolated": isolated,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    print(f"{pipeline['docs']} documents parsed, {len(pipeline['failed'])} failed")
+    for name, error in pipeline["failed"]:
+        print(f"  failed: {name}: {error}")
+    print(f"Throughput: {pipeline['docs_per_sec']:.2f} docs/s ({pipeline['wall_seconds']:.2f}s wall)")
+    if results["peak_rss_mb"] is not None:
+        print(f"Peak RSS:   {results['peak_rss_mb']:.1f} MB")
+    print_stage_table("Full pipeline, per stage", dict(pipeline["stages"], total=pipeline["latency"]))
+    print_stage_table(f"Stages in isolation, best of {repeat}", isolated)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the resume parse pipeline over the bundled corpus.")
+    parser.add_argument("--corpus", nargs="+", default=list(DEFAULT_CORPUS), help="Directories of PDFs")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N files")
+    parser.add_argument("--engine", default=None, help="Extraction engine (fitz or pdfplumber)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per document for isolated stages")
+    parser.add_argument("--write-baseline", metavar="PATH", help="Write the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a baseline and fail on regression")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative regression before failing (default 0.2 = 20%%)")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="Ignore latency changes smaller than this many milliseconds (default 1.0)")
+    args = parser.parse_args()
+
+    results = run(args.corpus, args.limit, args.engine, args.repeat)
+    if results is None:
+        sys.exit(1)
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
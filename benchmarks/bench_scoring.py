@@ -0,0 +1,80 @@
+"""
+Parity check and benchmark for the batch resume scorer (score.score_batch).
+
+Scores random JDs built from SKILLS_DB against the resumes in the database
+with score.calculate_scores_for_all_resumes (one resume at a time) and with
+score.rank_resumes (the packed skill matrix), checks that both give the same
+rows in the same order and times them. Then scores all the JDs at once with
+score.score_jd_batch and compares it with one score_batch call per JD. Run
+it against a large database (e.g. one filled with synthetic resumes) to see
+the scaling.
+
+Usage (from the repo root, or the directory holding the database):
+    python -m benchmarks.bench_scoring [--jds 20] [--seed 0]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from jd_parser import SKILLS_DB
+from score import calculate_scores_for_all_resumes, rank_resumes, score_batch, score_jd_batch
+from skill_matrix import load_skill_matrix
+
+
+def random_jd(rng):
+    skills = rng.sample(SKILLS_DB, rng.choice([0, 3, 8, 20]))
+    return {"skills": ", ".join(skills), "min_experience": rng.choice([0, 1, 2, 3.5, 5])}
+
+
+def reference_rows(jd_dict):
+    rows = calculate_scores_for_all_resumes(jd_dict)
+    if jd_dict["skills"]:
+        rows = [row for row in rows if row["skills_score"] > 0]
+    return rows
+
+
+def run(jds=20, seed=0):
+    start = time.perf_counter()
+    matrix = load_skill_matrix()
+    print(f"skill matrix: {len(matrix)} resumes loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = random.Random(seed)
+    jd_dicts = [random_jd(rng) for _ in range(jds)]
+    before = after = batch = 0.0
+    mismatches = 0
+    for jd_dict in jd_dicts:
+        start = time.perf_counter()
+        expected = reference_rows(jd_dict)
+        before += time.perf_counter() - start
+
+        start = time.perf_counter()
+        score_batch(jd_dict)
+        batch += time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows, total = rank_resumes(jd_dict, limit=len(matrix) or 1)
+        after += time.perf_counter() - start
+        if rows != expected or total != len(expected):
+            mismatches += 1
+
+    print(f"parity: {jds} JDs, {mismatches} mismatches")
+    print(f"before (per resume):   {before / jds * 1000:8.1f} ms/JD")
+    print(f"score_batch:           {batch / jds * 1000:8.1f} ms/JD")
+    print(f"rank_resumes (all):    {after / jds * 1000:8.1f} ms/JD")
+
+    start = time.perf_counter()
+    scores = score_jd_batch(jd_dicts, matrix)
+    multi = time.perf_counter() - start
+    differ = sum(not np.array_equal(scores["total_score"][j], score_batch(jd_dict, matrix)["total_score"])
+                 for j, jd_dict in enumerate(jd_dicts))
+    print(f"score_jd_batch ({jds} JDs): {multi * 1000:8.1f} ms in total, {differ} JDs differ from score_batch")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and benchmark the batch resume scorer.")
+    parser.add_argument("--jds", type=int, default=20, help="Random JDs to score")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.jds, args.seed)
@@ -0,0 +1,93 @@
+"""
+Parity check and benchmark for the SKILLS_DB matcher (skill_matcher.SkillMatcher).
+
+Compares jd_parser.SKILL_MATCHER with the loop it replaced, one
+re.search(rf"\b{skill}\b", text, re.IGNORECASE) per SKILLS_DB entry, on the
+resume skills sections and full texts of the corpus, on the JDs in
+JD_uploads/ and on random strings built around the tricky entries (C++, C#,
+.NET, CI/CD, ...), then times both per document.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_skills [--cases 50000] [--seed 0] [--repeat 5]
+"""
+import argparse
+import glob
+import random
+import re
+import time
+
+from App2 import ResumeDocument, extract_resume_text
+from jd_parser import SKILL_MATCHER, SKILLS_DB, read_docx, read_pdf
+
+NOISE = [" ", "  ", ",", ", ", ".", "/", "-", "(", ")", "+", "#", "_", "\n", "•", "|", "ASP", "x", "1", "İ", "ſ", "K"]
+
+
+def legacy_find_skills(text):
+    """The original per-skill regex loop."""
+    return [
+        skill for skill in SKILLS_DB
+        if re.search(rf"\b{re.escape(skill)}\b", text, re.IGNORECASE)
+    ]
+
+
+def corpus_texts():
+    texts = []
+    for path in sorted(glob.glob("uploads/*.pdf")):
+        try:
+            with ResumeDocument(path) as doc:
+                texts.append(extract_resume_text(doc))
+        except Exception as e:
+            print(f"skipped {path}: {e}")
+    for path in sorted(glob.glob("JD_uploads/*")):
+        if path.lower().endswith(".pdf"):
+            texts.append(read_pdf(path))
+        elif path.lower().endswith(".docx"):
+            texts.append(read_docx(path))
+    return texts
+
+
+def random_text(rng):
+    pieces = []
+    for _ in range(rng.randint(1, 8)):
+        skill = rng.choice(SKILLS_DB)
+        pieces.append(rng.choice([skill, skill.upper(), skill.lower(), skill[:-1], skill + rng.choice(NOISE)]))
+        pieces.append(rng.choice(NOISE))
+    return "".join(pieces)
+
+
+def time_per_document(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def run(cases=50000, seed=0, repeat=5):
+    texts = corpus_texts()
+    rng = random.Random(seed)
+    checked = texts + [random_text(rng) for _ in range(cases)]
+    mismatches = [text for text in checked if legacy_find_skills(text) != SKILL_MATCHER.find(text)]
+    print(f"parity: {len(checked)} texts ({len(texts)} corpus documents), {len(mismatches)} mismatches")
+    for text in mismatches[:10]:
+        print(f"  {text[:100]!r}: regex {legacy_find_skills(text)} vs matcher {SKILL_MATCHER.find(text)}")
+
+    if not texts:
+        print("No corpus documents to time")
+        return
+    chars = sum(map(len, texts)) / len(texts)
+    before = time_per_document(legacy_find_skills, texts, repeat)
+    after = time_per_document(SKILL_MATCHER.find, texts, repeat)
+    print(f"\n{len(texts)} documents, {chars:.0f} chars on average, {len(SKILLS_DB)} skills")
+    print(f"before (regex per skill): {before * 1000:8.3f} ms/document")
+    print(f"after  (Aho-Corasick):    {after * 1000:8.3f} ms/document")
+    print(f"speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and benchmark the SKILLS_DB matcher against the regex loop.")
+    parser.add_argument("--cases", type=int, default=50000, help="Random strings to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions over the corpus")
+    args = parser.parse_args()
+    run(args.cases, args.seed, args.repeat)
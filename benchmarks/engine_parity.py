@@ -0,0 +1,119 @@
+"""
+Parity report between the extraction engines over a resume corpus.
+
+Runs contact + text extraction with every engine in extraction_engines.ENGINES,
+pushes the text through the normal section pipeline and reports, per document,
+which sections differ and how similar their content is, followed by the
+per-engine extraction time and the speedup over pdfplumber.
+
+Usage (from the repo root):
+    python -m benchmarks.engine_parity [--corpus uploads] [--limit N] [--verbose]
+"""
+import argparse
+import glob
+import os
+import time
+from difflib import SequenceMatcher
+
+from App2 import (ResumeDocument, extract_contact_info, extract_resume_text, preprocess_resume_text,
+                  extract_all_sections, clean_section_dict, normalize_sections, resume_headings_base)
+from extraction_engines import ENGINES
+
+BASELINE_ENGINE = "pdfplumber"
+
+
+def parse_sections(pdf_path, engine):
+    """Return (contact, sections, extraction_seconds) for one document and engine."""
+    start = time.perf_counter()
+    with ResumeDocument(pdf_path, engine=engine) as doc:
+        contact = extract_contact_info(doc)
+        text = extract_resume_text(doc)
+    elapsed = time.perf_counter() - start
+
+    text = preprocess_resume_text(text)
+    sections = extract_all_sections(text)
+    sections = clean_section_dict(sections)
+    sections = normalize_sections(sections, resume_headings_base)
+    return contact, sections, elapsed
+
+
+def compare_sections(base, other):
+    """Per-section similarity (0..1) of `other` against `base`, plus missing/extra keys."""
+    missing = sorted(set(base) - set(other))
+    extra = sorted(set(other) - set(base))
+    similarity = {
+        key: SequenceMatcher(None, base[key], other[key], autojunk=False).ratio()
+        for key in sorted(set(base) & set(other))
+    }
+    return similarity, missing, extra
+
+
+def run(corpus, limit=None, verbose=False):
+    paths = sorted(glob.glob(os.path.join(corpus, "*.pdf")))
+    if limit:
+        paths = paths[:limit]
+    if not paths:
+        print(f"No PDFs found in {corpus}")
+        return
+
+    engines = [BASELINE_ENGINE] + [name for name in ENGINES if name != BASELINE_ENGINE]
+    totals = {name: 0.0 for name in engines}
+    same_keys = {name: 0 for name in engines}
+    same_contact = {name: 0 for name in engines}
+    section_scores = {name: [] for name in engines}
+
+    for path in paths:
+        results = {}
+        for name in engines:
+            try:
+                results[name] = parse_sections(path, name)
+            except Exception as e:
+                print(f"{os.path.basename(path)} [{name}] failed: {e}")
+        if BASELINE_ENGINE not in results:
+            continue
+
+        base_contact, base_sections, base_time = results[BASELINE_ENGINE]
+        lines = []
+        for name, (contact, sections, elapsed) in results.items():
+            totals[name] += elapsed
+            similarity, missing, extra = compare_sections(base_sections, sections)
+            section_scores[name].extend(similarity.values())
+            if not missing and not extra:
+                same_keys[name] += 1
+            if contact == base_contact:
+                same_contact[name] += 1
+            if name == BASELINE_ENGINE:
+                continue
+
+            differing = {k: v for k, v in similarity.items() if v < 0.99}
+            if verbose or missing or extra or differing:
+                lines.append(f"  [{name}] {elapsed:.3f}s vs {base_time:.3f}s"
+                             f"{'  contact differs' if contact != base_contact else ''}")
+                if missing:
+                    lines.append(f"    missing sections: {', '.join(missing)}")
+                if extra:
+                    lines.append(f"    extra sections:   {', '.join(extra)}")
+                for key, ratio in differing.items():
+                    lines.append(f"    {key:<24} similarity {ratio:.2f}")
+        if lines:
+            print(os.path.basename(path))
+            print("\n".join(lines))
+
+    print("\n=== Summary ({} documents) ===".format(len(paths)))
+    for name in engines:
+        scores = section_scores[name]
+        mean_sim = sum(scores) / len(scores) if scores else 0
+        speedup = totals[BASELINE_ENGINE] / totals[name] if totals[name] else 0
+        print(f"{name:<12} extraction {totals[name]:7.2f}s  speedup x{speedup:5.2f}  "
+              f"same section keys {same_keys[name]}/{len(paths)}  "
+              f"same contact {same_contact[name]}/{len(paths)}  "
+              f"mean section similarity {mean_sim:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare extraction engines over a resume corpus.")
+    parser.add_argument("--corpus", default="uploads", help="Directory of PDF resumes")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N files")
+    parser.add_argument("--verbose", action="store_true", help="Print every document, not only differences")
+    args = parser.parse_args()
+    run(args.corpus, args.limit, args.verbose)
@@ -0,0 +1,71 @@
+"""
+Contact sheets for labelling resume layouts.
+
+Renders the first page of every PDF in the corpus as a numbered thumbnail,
+several per PNG, so one- vs two-column layouts can be labelled by eye for
+benchmarks/layout_ground_truth.json. Byte-identical copies (the same resume
+in uploads/ and Resume/) are drawn once. The numbers match the listing
+printed to stdout.
+
+Usage (from the repo root):
+    python -m benchmarks.layout_contact_sheet [--corpus uploads Resume JD_uploads] [--out contact_sheets]
+                                              [--cols 5] [--rows 3]
+"""
+import argparse
+import glob
+import hashlib
+import os
+
+import fitz  # PyMuPDF
+
+THUMB_W, THUMB_H, LABEL_H = 240, 310, 16
+
+
+def corpus_paths(directories):
+    paths = []
+    for directory in directories:
+        paths += sorted(glob.glob(os.path.join(directory, "*.pdf")))
+    return [os.path.relpath(path) for path in paths]
+
+
+def write_sheets(paths, out_dir, cols=5, rows=3, dpi=72):
+    os.makedirs(out_dir, exist_ok=True)
+    per_sheet = cols * rows
+    sheets = fitz.open()
+    for start in range(0, len(paths), per_sheet):
+        sheet = sheets.new_page(width=cols * THUMB_W, height=rows * (THUMB_H + LABEL_H))
+        for offset, path in enumerate(paths[start:start + per_sheet]):
+            x = (offset % cols) * THUMB_W
+            y = (offset // cols) * (THUMB_H + LABEL_H)
+            sheet.insert_text((x + 4, y + 12), f"{start + offset}: {os.path.basename(path)[:34]}", fontsize=9)
+            cell = fitz.Rect(x + 2, y + LABEL_H, x + THUMB_W - 2, y + LABEL_H + THUMB_H - 2)
+            sheet.draw_rect(cell, color=(0.6, 0.6, 0.6), width=0.5)
+            try:
+                with fitz.open(path) as src:
+                    sheet.show_pdf_page(cell, src, 0)
+            except Exception as e:
+                sheet.insert_text((cell.x0 + 4, cell.y0 + 20), f"unreadable: {e}"[:40], fontsize=8)
+        target = os.path.join(out_dir, f"sheet_{start // per_sheet:02d}.png")
+        sheet.get_pixmap(dpi=dpi).save(target)
+        print(f"wrote {target}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render first-page thumbnails of a resume corpus.")
+    parser.add_argument("--corpus", nargs="+", default=["uploads", "Resume", "JD_uploads"], help="Directories of PDFs")
+    parser.add_argument("--out", default="contact_sheets", help="Output directory for the PNG sheets")
+    parser.add_argument("--cols", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--dpi", type=int, default=72)
+    args = parser.parse_args()
+
+    unique = {}
+    for path in corpus_paths(args.corpus):
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if digest in unique:
+            print(f"      {path} (same as {unique[digest]})")
+            continue
+        print(f"{len(unique):4d}  {path}")
+        unique[digest] = path
+    write_sheets(list(unique.values()), args.out, args.cols, args.rows, args.dpi)
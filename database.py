@@ -1,8 +1,21 @@
 import sqlite3
 import json
+import time
 
 DATABASE = "database.db"
 
+# Timed stages of a resume parse, in pipeline order; parse_stats stores a
+# <stage>_wall and <stage>_cpu column (seconds) for each of them, NULL when the
+# stage did not run (a parse-cache hit only times db_write).
+PARSE_STAGES = (
+    "detect_resume_type",
+    "extraction",
+    "preprocess_resume_text",
+    "extract_all_sections",
+    "extract_experience_dict",
+    "db_write",
+)
+
 def init_db():
     conn = sqlite3.connect(DATABASE)
     cursor = conn.cursor()
@@ -17,25 +30,339 @@ def init_db():
             filedata BLOB,
             skills TEXT DEFAULT NULL,
             exp_data TEXT DEFAULT NULL, -- store JSON string
-            total_exp FLOAT DEFAULT 0
+            total_exp FLOAT DEFAULT 0,
+            skills_indexed INTEGER DEFAULT 0, -- 1 once resume_skills holds its skills
+            education_rank INTEGER DEFAULT NULL -- education_matcher rank of `education`, NULL until computed
+        )
+    """)
+    for column in ("skills_indexed INTEGER DEFAULT 0", "education_rank INTEGER DEFAULT NULL"):
+        try:
+            cursor.execute(f"ALTER TABLE resumes ADD COLUMN {column}")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resumes_total_exp ON resumes (total_exp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resumes_education_rank ON resumes (education_rank)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE       -- lower-cased SKILLS_DB entry
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS resume_skills (
+            resume_id INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+            skill_id INTEGER NOT NULL REFERENCES skills (id),
+            PRIMARY KEY (resume_id, skill_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills (skill_id, resume_id)")
+    # One-row counters bumped by triggers on every write batch scoring reads, so
+    # scoring_data_version is a single-row lookup instead of a table scan.
+    # `version` moves on any change; `rebuild_version` only on those that touch
+    # resumes already stored (delete, new total_exp, skills indexed or dropped
+    # later), which a loaded skill matrix cannot catch up on by appending rows.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scoring_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            rebuild_version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    try:
+        cursor.execute("ALTER TABLE scoring_version ADD COLUMN rebuild_version INTEGER NOT NULL DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass  # column already exists
+    cursor.execute("INSERT OR IGNORE INTO scoring_version (id, version) VALUES (1, 0)")
+    for name, event in (("resumes_insert", "INSERT ON resumes"),
+                        ("resumes_delete", "DELETE ON resumes"),
+                        ("resumes_total_exp", "UPDATE OF total_exp ON resumes"),
+                        ("resume_skills_insert", "INSERT ON resume_skills"),
+                        ("resume_skills_delete", "DELETE ON resume_skills")):
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS scoring_version_{name} AFTER {event} "
+                       f"BEGIN UPDATE scoring_version SET version = version + 1 WHERE id = 1; END")
+    # a new resume is stored with skills_indexed = 1 together with its skills,
+    # so skills inserted for a resume not marked indexed are a later re-index
+    for name, event in (("resumes_delete", "DELETE ON resumes"),
+                        ("resumes_total_exp", "UPDATE OF total_exp ON resumes"),
+                        ("resume_skills_insert", "INSERT ON resume_skills WHEN (SELECT skills_indexed "
+                                                 "FROM resumes WHERE id = NEW.resume_id) IS NOT 1"),
+                        ("resume_skills_delete", "DELETE ON resume_skills")):
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS scoring_rebuild_{name} AFTER {event} "
+                       f"BEGIN UPDATE scoring_version SET rebuild_version = rebuild_version + 1 WHERE id = 1; END")
+    # Settings the stored data was derived with (e.g. the SKILLS_DB digest of resume_skills)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS parse_cache (
+            file_hash TEXT NOT NULL,        -- SHA-256 of the PDF bytes
+            parser_version TEXT NOT NULL,
+            result TEXT NOT NULL,           -- JSON: contact, sections, experience
+            last_used REAL NOT NULL,
+            PRIMARY KEY (file_hash, parser_version)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache (last_used)")
+    stage_columns = ",\n".join(f"            {stage}_wall REAL, {stage}_cpu REAL" for stage in PARSE_STAGES)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS parse_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id INTEGER,
+            filename TEXT,
+            created_at REAL NOT NULL,
+            cache_hit INTEGER DEFAULT 0,
+            layout TEXT,                    -- one-column / two-column
+            page_count INTEGER,
+            char_count INTEGER,
+{stage_columns}
         )
     """)
     conn.commit()
     conn.close()
 
 
-def save_resume_to_db(name, phone, email, education, filename, filedata, skills, exp_data, total_exp):
+def add_skills(skill_names):
+    """Register skill names (lower-cased) in skills; names already present keep their id."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)",
+                       [(name.strip().lower(),) for name in skill_names if name.strip()])
+    conn.commit()
+    conn.close()
+
+
+def _insert_resume_skills(cursor, resume_id, skill_names):
+    """Link a resume to its skills (names are lower-cased; unseen names are added to skills)."""
+    names = sorted({name.strip().lower() for name in skill_names if name.strip()})
+    cursor.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+    cursor.executemany("""
+        INSERT OR IGNORE INTO resume_skills (resume_id, skill_id)
+        SELECT ?, id FROM skills WHERE name = ?
+    """, [(resume_id, name) for name in names])
+    cursor.execute("UPDATE resumes SET skills_indexed = 1 WHERE id = ?", (resume_id,))
+
+
+def save_resume_to_db(name, phone, email, education, filename, filedata, skills, exp_data, total_exp,
+                      skill_names=(), education_rank=0):
+    """Insert a resume and, in the same transaction, its extracted skill names into resume_skills."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO resumes (name, phone, email, education, filename, filedata, skills, exp_data, total_exp,
+                             education_rank, skills_indexed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+    """, (name, phone, email, education, filename, filedata, skills, exp_data, total_exp, education_rank))
+    resume_id = cursor.lastrowid
+    _insert_resume_skills(cursor, resume_id, skill_names)
+
+    conn.commit()
+    conn.close()
+    return resume_id
+
+
+def fetch_resume_skill_sets():
+    """{resume_id: {skill name, ...}} of every indexed resume, read from resume_skills in one query."""
     conn = sqlite3.connect(DATABASE)
     cursor = conn.cursor()
     cursor.execute("""
-        INSERT INTO resumes (name, phone, email, education, filename, filedata, skills, exp_data, total_exp)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (name, phone, email, education, filename, filedata, skills, exp_data, total_exp))
+        SELECT resume_skills.resume_id, skills.name
+        FROM resume_skills JOIN skills ON skills.id = resume_skills.skill_id
+    """)
+    skill_sets = {}
+    for resume_id, name in cursor.fetchall():
+        skill_sets.setdefault(resume_id, set()).add(name)
+    conn.close()
+    return skill_sets
 
+
+def reset_skill_index():
+    """Drop every resume's indexed skills so the next backfill re-extracts them (e.g. after SKILLS_DB changed)."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM resume_skills")
+    cursor.execute("UPDATE resumes SET skills_indexed = 0")
     conn.commit()
     conn.close()
 
 
+def get_meta(key):
+    """Value stored under `key` in meta, or None."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("SELECT value FROM meta WHERE key = ?", (key,))
+    row = cursor.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def set_meta(key, value):
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+    conn.commit()
+    conn.close()
+
+
+def fetch_resumes_without_skill_index():
+    """(id, skills) of the resumes whose skills are not in resume_skills yet (stored before the table existed)."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, skills FROM resumes WHERE skills_indexed = 0 OR skills_indexed IS NULL")
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def save_resume_skills(resume_skill_names):
+    """Index the skills of many stored resumes; `resume_skill_names` is [(resume_id, [skill name, ...])]."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    for resume_id, skill_names in resume_skill_names:
+        _insert_resume_skills(cursor, resume_id, skill_names)
+    conn.commit()
+    conn.close()
+
+
+def save_parse_stats(resume_id, filename, stats):
+    """
+    Record the per-stage timings of one parse.
+
+    `stats` is the "stats" dict of a parse result: layout, page_count,
+    char_count, cache_hit and "stages" mapping a PARSE_STAGES name to
+    {"wall": seconds, "cpu": seconds}.
+    """
+    stages = stats.get("stages", {})
+    columns = ["resume_id", "filename", "created_at", "cache_hit", "layout", "page_count", "char_count"]
+    values = [resume_id, filename, time.time(), int(bool(stats.get("cache_hit"))),
+              stats.get("layout"), stats.get("page_count"), stats.get("char_count")]
+    for stage in PARSE_STAGES:
+        timing = stages.get(stage, {})
+        columns += [f"{stage}_wall", f"{stage}_cpu"]
+        values += [timing.get("wall"), timing.get("cpu")]
+
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute(f"INSERT INTO parse_stats ({', '.join(columns)}) VALUES ({', '.join('?' * len(values))})",
+                   values)
+    conn.commit()
+    conn.close()
+
+
+def fetch_parse_stats(since=None):
+    """Return every parse_stats row (optionally only those recorded after `since` epoch seconds) as dicts."""
+    conn = sqlite3.connect(DATABASE)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM parse_stats WHERE created_at >= ? ORDER BY id", (since or 0,))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def get_cached_parse(file_hash, parser_version):
+    """Return the cached parse result JSON for this file + parser version, or None."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("SELECT result FROM parse_cache WHERE file_hash=? AND parser_version=?",
+                   (file_hash, parser_version))
+    row = cursor.fetchone()
+    if row:
+        cursor.execute("UPDATE parse_cache SET last_used=? WHERE file_hash=? AND parser_version=?",
+                       (time.time(), file_hash, parser_version))
+        conn.commit()
+    conn.close()
+    return row[0] if row else None
+
+
+def save_cached_parse(file_hash, parser_version, result, max_entries, current_prefix="", current_suffix=""):
+    """
+    Store a parse result and keep the cache bounded: entries whose version
+    does not start with `current_prefix` and end with `current_suffix` (an
+    older parser code version or heading dictionary) are dropped, then the
+    least recently used entries beyond `max_entries`. Entries of the same
+    code written with other settings (engine, page cap, layout detector) are
+    left to the LRU bound, so processes configured differently can share the
+    cache.
+    """
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT OR REPLACE INTO parse_cache (file_hash, parser_version, result, last_used)
+        VALUES (?, ?, ?, ?)
+    """, (file_hash, parser_version, result, time.time()))
+    cursor.execute("""
+        DELETE FROM parse_cache
+        WHERE substr(parser_version, 1, length(:prefix)) != :prefix
+           OR (length(:suffix) > 0 AND substr(parser_version, -length(:suffix)) != :suffix)
+    """, {"prefix": current_prefix, "suffix": current_suffix})
+    cursor.execute("""
+        DELETE FROM parse_cache WHERE rowid IN (
+            SELECT rowid FROM parse_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+        )
+    """, (max_entries,))
+    conn.commit()
+    conn.close()
+
+
+def fetch_resumes_without_experience_months():
+    """(id, exp_data) of the resumes whose exp_data entries predate start_month/end_month/months."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, exp_data FROM resumes
+        WHERE exp_data IS NOT NULL AND exp_data NOT LIKE '%"start_month":%'
+    """)
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def update_resume_experience(updates):
+    """Rewrite exp_data and total_exp for many resumes; `updates` is [(exp_data, total_exp, resume_id)]."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.executemany("UPDATE resumes SET exp_data=?, total_exp=? WHERE id=?", updates)
+    conn.commit()
+    conn.close()
+
+
+def fetch_resumes_with_education(keywords):
+    """(id, education, filedata) of the stored PDFs whose education keyword is one of `keywords` (any case)."""
+    keywords = [keyword.upper() for keyword in keywords]
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT id, education, filedata FROM resumes WHERE filedata IS NOT NULL "
+                   f"AND upper(education) IN ({', '.join('?' * len(keywords))})", keywords)
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def update_resume_education(updates):
+    """Rewrite education and education_rank for many resumes; `updates` is [(education, education_rank, resume_id)]."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.executemany("UPDATE resumes SET education=?, education_rank=? WHERE id=?", updates)
+    conn.commit()
+    conn.close()
+
+
+def fill_education_ranks(keyword_ranks):
+    """Set education_rank on resumes stored without one from their education keyword (unknown -> 0)."""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.executemany("UPDATE resumes SET education_rank = ? WHERE education_rank IS NULL AND upper(education) = ?",
+                       [(rank, keyword.upper()) for keyword, rank in keyword_ranks.items()])
+    cursor.execute("UPDATE resumes SET education_rank = 0 WHERE education_rank IS NULL")
+    updated = conn.total_changes
+    conn.commit()
+    conn.close()
+    return updated
+
+
 def fetch_all_resumes():
     conn = sqlite3.connect(DATABASE)
     conn.row_factory = sqlite3.Row
@@ -46,6 +373,128 @@ def fetch_all_resumes():
     result = [dict(row) for row in rows]
     return result
 
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def _like_pattern(term):
+    """LIKE pattern matching `term` anywhere, with LIKE wildcards in the term escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def fetch_filtered_resumes(skill_terms=(), min_exp=None):
+    """
+    Resumes having any of `skill_terms` and at least `min_exp` years of
+    experience, in the same shape as fetch_all_resumes.
+
+    Both filters run in SQL. A term that is a known skill (a row of skills)
+    is looked up through resume_skills' skill index; any other term falls
+    back to a case-insensitive substring match on the raw skills text, which
+    needs a scan. min_exp is a range predicate on the indexed total_exp.
+    """
+    terms = [term.strip().lower() for term in skill_terms if term.strip()]
+    conn = sqlite3.connect(DATABASE)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    known = {}
+    if terms:
+        cursor.execute(f"SELECT name, id FROM skills WHERE name IN ({', '.join('?' * len(terms))})", terms)
+        # Skills are found with \b...\b, which rarely holds around a name that starts or ends with
+        # punctuation (c++, c#, .net), so resume_skills misses those; they keep the substring match.
+        known = {name: skill_id for name, skill_id in cursor.fetchall()
+                 if _is_word_char(name[0]) and _is_word_char(name[-1])}
+
+    where, params = [], []
+    if terms:
+        alternatives = []
+        skill_ids = [known[term] for term in terms if term in known]
+        if skill_ids:
+            alternatives.append(f"id IN (SELECT resume_id FROM resume_skills "
+                                f"WHERE skill_id IN ({', '.join('?' * len(skill_ids))}))")
+            params += skill_ids
+        for term in terms:
+            if term not in known:
+                alternatives.append("lower(skills) LIKE ? ESCAPE '\\'")
+                params.append(_like_pattern(term))
+        where.append(f"({' OR '.join(alternatives)})")
+    if min_exp is not None:
+        where.append("total_exp >= ?")
+        params.append(min_exp)
+
+    query = "SELECT id, name, phone, email, education, filename, skills, exp_data, total_exp FROM resumes"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    conn.close()
+    # Sorted here rather than with ORDER BY id, which would make SQLite walk the table in id order
+    # instead of using the total_exp index
+    return sorted((dict(row) for row in rows), key=lambda row: row["id"])
+
+# Bound parameters per statement, below SQLite's historical 999 limit
+MAX_SQL_PARAMS = 900
+
+
+def fetch_resumes_by_ids(resume_ids):
+    """id, name, phone, email, total_exp of the given resumes (as dicts, in no particular order)."""
+    resume_ids = list(resume_ids)
+    conn = sqlite3.connect(DATABASE)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    rows = []
+    for start in range(0, len(resume_ids), MAX_SQL_PARAMS):
+        chunk = resume_ids[start:start + MAX_SQL_PARAMS]
+        cursor.execute(f"SELECT id, name, phone, email, total_exp FROM resumes "
+                       f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        rows += [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def fetch_scoring_features(after_id=0):
+    """
+    What batch scoring needs for the resumes with an id above `after_id` (all
+    of them by default), in two queries: ([(id, total_exp)] ordered by id,
+    [(resume_id, skill name)] from resume_skills), preceded by the
+    scoring_data_version they are current for. All three are read in one
+    transaction, so they see the same snapshot even while resumes are being
+    inserted or deleted.
+    """
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    cursor.execute("SELECT version, rebuild_version FROM scoring_version WHERE id = 1")
+    version = cursor.fetchone()
+    cursor.execute("SELECT id, total_exp FROM resumes WHERE id > ? ORDER BY id", (after_id,))
+    resumes = cursor.fetchall()
+    cursor.execute("""
+        SELECT resume_skills.resume_id, skills.name
+        FROM resume_skills JOIN skills ON skills.id = resume_skills.skill_id
+        WHERE resume_skills.resume_id > ?
+    """, (after_id,))
+    skill_pairs = cursor.fetchall()
+    conn.commit()
+    conn.close()
+    return version, resumes, skill_pairs
+
+
+def scoring_data_version():
+    """
+    (version, rebuild_version): counters kept by triggers (see init_db).
+    `version` changes whenever a resume or its indexed skills are added,
+    removed or rescored, `rebuild_version` only when stored resumes changed
+    (not for newly inserted ones); a single-row read.
+    """
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    cursor.execute("SELECT version, rebuild_version FROM scoring_version WHERE id = 1")
+    row = cursor.fetchone()
+    conn.close()
+    return row
+
+
 def get_resume_file(resume_id):
     conn = sqlite3.connect(DATABASE)
     cursor = conn.cursor()
@@ -57,6 +506,7 @@ def get_resume_file(resume_id):
 def delete_resume(resume_id):
     conn = sqlite3.connect(DATABASE)
     cursor = conn.cursor()
+    cursor.execute("DELETE FROM resume_skills WHERE resume_id=?", (resume_id,))
     cursor.execute("DELETE FROM resumes WHERE id=?", (resume_id,))
     conn.commit()
     conn.close()
@@ -65,6 +515,7 @@ def delete_resume(resume_id):
 def delete_all_records():
     conn = sqlite3.connect(DATABASE)
     cursor = conn.cursor()
+    cursor.execute("DELETE FROM resume_skills")
     cursor.execute("DELETE FROM resumes")  # Deletes all rows
     conn.commit()
     conn.close()
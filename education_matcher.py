@@ -0,0 +1,89 @@
+import re
+
+
+# -----------------------------
+# Education Levels
+# -----------------------------
+# Every education keyword the resume and JD sides look for, grouped by level.
+# A higher rank is a higher qualification; within a level the first keyword
+# listed is the one reported when several of that level are found (so a resume
+# listing "BS" and "BACHELOR" is stored as "BS", as before).
+EDUCATION_LEVELS = [
+    (6, "Doctorate", ["PHD", "DOCTORATE", "D.PHIL"]),
+    (5, "Master", ["MASTER", "MASTERS", "MS", "M.SC", "MSC", "M.TECH", "MTECH",
+                   "MBA", "M.COM", "MCA", "M.ED", "M.PHIL"]),
+    (4, "Bachelor", ["BS", "BACHELOR", "BACHELORS", "BSCS", "BSC", "B.SC", "BA", "B.A",
+                     "BBA", "B.COM", "BCA", "B.TECH", "BTECH", "BE", "B.E",
+                     "BSIT", "BSSE", "BCE", "BS SOFTWARE ENGINEERING",
+                     "BS INFORMATION TECHNOLOGY", "BS COMPUTER SCIENCE"]),
+    (3, "Diploma", ["DIPLOMA", "ASSOCIATE DEGREE"]),
+    (2, "Intermediate", ["INTERMEDIATE", "HSC", "A-LEVEL", "HIGH SCHOOL", "GED"]),
+    (1, "Secondary", ["MATRIC", "SSC", "O-LEVEL", "SECONDARY SCHOOL"]),
+]
+
+EDUCATION_KEYWORDS = [keyword for _, _, keywords in EDUCATION_LEVELS for keyword in keywords]
+KEYWORD_RANKS = {keyword: rank for rank, _, keywords in EDUCATION_LEVELS for keyword in keywords}
+LEVEL_NAMES = {rank: name for rank, name, _ in EDUCATION_LEVELS}
+_KEYWORD_ORDER = {keyword: i for i, keyword in enumerate(EDUCATION_KEYWORDS)}
+
+# Two-letter keywords that are also plain words or other abbreviations ("to be
+# announced", "Ba Town", "MS Office"). They only count written in capitals,
+# and MS not when it names a Microsoft product; the dotted forms (B.A, B.E,
+# M.SC) and the longer keywords stay case-insensitive.
+AMBIGUOUS_KEYWORDS = {
+    "BS": "",
+    "BA": "",
+    "BE": "",
+    "MS": r"(?!\s+(?:office|excel|word|powerpoint|access|outlook|project|teams|visio|sql|dynamics)\b)",
+}
+
+
+def _keyword_pattern(keyword):
+    if keyword in AMBIGUOUS_KEYWORDS:
+        return f"(?-i:{re.escape(keyword)}){AMBIGUOUS_KEYWORDS[keyword]}"
+    return re.escape(keyword)
+
+
+# All keywords in one alternation, longest first so "BS COMPUTER SCIENCE" wins
+# over "BS" at the same position. Every keyword starts and ends with a letter,
+# so the outer \b gives each of them the same whole-word rule as a separate
+# \b{keyword}\b search. The keyword sits in a lookahead so matches may overlap
+# ("B.A-LEVEL" holds both "B.A" and "A-LEVEL").
+EDUCATION_REGEX = re.compile(
+    r"\b(?=(" + "|".join(_keyword_pattern(k) for k in sorted(EDUCATION_KEYWORDS, key=len, reverse=True)) + r")\b)",
+    re.IGNORECASE
+)
+
+# Only the longest keyword at a position is reported, so the shorter ones it
+# starts with ("BS" in "BS COMPUTER SCIENCE") are added back from this table.
+_CONTAINED = {
+    keyword: [other for other in EDUCATION_KEYWORDS
+              if other != keyword and re.search(rf"\b{re.escape(other)}\b", keyword)]
+    for keyword in EDUCATION_KEYWORDS
+}
+
+
+def find_education(text):
+    """
+    Every education keyword in the text (whole words, case-insensitive), in
+    one regex pass, as [(keyword, rank)] ordered from the highest level down.
+    """
+    found = set()
+    for match in EDUCATION_REGEX.finditer(text or ""):
+        keyword = match.group(1).upper()
+        if keyword not in KEYWORD_RANKS:  # case folding matched a non-ASCII spelling
+            keyword = next(k for k in EDUCATION_KEYWORDS if re.fullmatch(re.escape(k), match.group(1), re.I))
+        found.add(keyword)
+        found.update(_CONTAINED[keyword])
+    return sorted(((k, KEYWORD_RANKS[k]) for k in found), key=lambda item: (-item[1], _KEYWORD_ORDER[item[0]]))
+
+
+def highest_education(text):
+    """(keyword, rank) of the highest education level in the text, or None."""
+    found = find_education(text)
+    return found[0] if found else None
+
+
+def education_rank(keyword):
+    """Rank of a stored education keyword (e.g. resumes.education), 0 if unknown or "Not Found"."""
+    return KEYWORD_RANKS.get((keyword or "").upper(), 0)
@@ -1,7 +1,11 @@
 import re
+from bisect import bisect_right
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
+from functools import lru_cache
+
+from education_matcher import highest_education
 
 # ✅ Regex for date ranges only (blocks single years)
 
@@ -11,42 +15,34 @@ MONTHS = (
     r"Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?"
 )
 
-DATE_RANGE_REGEX = re.compile(
-    rf"(?P<start>"
-    # --- DD/MM/YYYY ---
-    r"\d{1,2}[\/\-.]\d{1,2}[\/\-.]\d{2,4}"
-    r"|"
-    # --- MM/YYYY ---
-    r"\d{1,2}[\/\-.]\d{4}"
-    r"|"
-    # --- Month YYYY / Month, DD, YYYY ---
-    rf"(?:{MONTHS})[.,]?\s*\d{{1,2}},?\s*\d{{2,4}}"
+# One date as written in a range. Alternatives sharing a prefix are factored
+# (a month name is matched once, then one of its tails) so the engine does not
+# re-scan the same month name for every variant; the accepted text is unchanged.
+_RANGE_DATE = (
+    # --- DD/MM/YYYY / MM/YYYY ---
+    r"\d{1,2}[\/\-.](?:\d{1,2}[\/\-.]\d{2,4}|\d{4})"
     r"|"
-    rf"(?:{MONTHS})[.,]?\s*\d{4}"
-    r"|"
-    # --- Month-YYYY / MonthYYYY / Month.YYYY ---
-    rf"(?:{MONTHS})[-.]?\d{{4}}"
+    # --- Month, DD, YYYY / Month YYYY / Month-YYYY / MonthYYYY / Month.YYYY ---
+    rf"(?:{MONTHS})(?:[.,]?\s*\d{{1,2}},?\s*\d{{2,4}}|[.,]?\s*\d{{4}}|[-.]?\d{{4}})"
     r"|"
     # --- Year ---
     r"\d{4}"
-    r")"
+)
+
+DATE_RANGE_REGEX = re.compile(
+    rf"(?P<start>{_RANGE_DATE})"
     r"\s*(?:-|–|to)\s*"
-    r"(?P<end>"
     # same patterns OR present/current
-    r"\d{1,2}[\/\-.]\d{1,2}[\/\-.]\d{2,4}"
-    r"|\d{1,2}[\/\-.]\d{4}"
-    rf"|(?:{MONTHS})[.,]?\s*\d{{1,2}},?\s*\d{{2,4}}"
-    rf"|(?:{MONTHS})[.,]?\s*\d{{4}}"
-    rf"|(?:{MONTHS})[-.]?\d{{4}}"
-    r"|\d{4}"
-    r"|present|current|now|till\sdate|ongoing"
-    r")",
+    rf"(?P<end>{_RANGE_DATE}|present|current|now|till\sdate|ongoing)",
     re.IGNORECASE
 )
 
+# A bare year outside any range, e.g. "ASSISTANT DATA SCIENTIST 2023"
+YEAR_REGEX = re.compile(r"\b(19|20)\d{2}\b")
+
 
 
-# Supported date formats
+# Supported date formats (matched by DATE_TOKEN_REGEX in parse_date)
 DATE_FORMATS = [
     # Day/Month/Year
     "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
@@ -68,17 +64,75 @@ DATE_FORMATS = [
 
 
 
+PRESENT_WORDS = {"current", "present", "now", "till date", "ongoing"}
+
+MONTH_NUMBERS = {
+    name: number
+    for number, names in enumerate([
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december"),
+    ], start=1)
+    for name in names
+}
+
+# One pattern for every entry of DATE_FORMATS, using the same field rules as
+# strptime (%d, %m, %Y = exactly 4 digits, a space in the format = \s+).
+_DAY = r"3[01]|[12]\d|0[1-9]|[1-9]| [1-9]"
+_MONTH = r"1[0-2]|0[1-9]|[1-9]"
+_MONTH_NAME = "|".join(sorted(MONTH_NUMBERS, key=len, reverse=True))
+DATE_TOKEN_REGEX = re.compile(
+    # %d/%m/%Y, %d-%m-%Y, %d.%m.%Y
+    rf"(?P<dmy_d>{_DAY})(?P<sep>[/.-])(?P<dmy_m>{_MONTH})(?P=sep)(?P<dmy_y>\d{{4}})"
+    # %m/%Y, %m-%Y, %m.%Y
+    rf"|(?P<my_m>{_MONTH})[/.-](?P<my_y>\d{{4}})"
+    # %b %Y, %b. %Y, %b-%Y, %b%Y, %b.%Y, %b %d, %Y (and the %B variants)
+    rf"|(?P<name>{_MONTH_NAME})(?:\s+(?P<name_d>{_DAY}),\s+|\.\s+|\s+|[-.]|)(?P<name_y>\d{{4}})"
+    # %Y
+    r"|(?P<y>\d{4})",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_fields(date_str):
+    """(year, month, day) for a normalized date string in one of DATE_FORMATS, else None."""
+    match = DATE_TOKEN_REGEX.fullmatch(date_str)
+    if not match:
+        return None
+    if match.group("dmy_y"):
+        fields = (match.group("dmy_y"), match.group("dmy_m"), match.group("dmy_d"))
+    elif match.group("my_y"):
+        fields = (match.group("my_y"), match.group("my_m"), 1)
+    elif match.group("name_y"):
+        month = MONTH_NUMBERS.get(match.group("name").lower())
+        if month is None:
+            return None
+        fields = (match.group("name_y"), month, match.group("name_d") or 1)
+    else:
+        fields = (match.group("y"), 1, 1)
+    year, month, day = (int(f) for f in fields)
+    try:
+        datetime(year, month, day)  # e.g. 31/02/2020 or year 0000, rejected by strptime too
+    except ValueError:
+        return None
+    return year, month, day
+
+
 def parse_date(date_str):
-    """Convert string into datetime object."""
+    """
+    Convert string into datetime object.
+
+    Accepts exactly what the DATE_FORMATS strptime loop accepts (day kept, as
+    it affects the relativedelta durations) but with a single regex match,
+    memoized per distinct string. present/current/... map to today and are
+    never cached.
+    """
     date_str = date_str.strip().lower().replace("(", "").replace(")", "")
-    if date_str in ["current", "present", "now", "till date", "ongoing"]:
+    if date_str in PRESENT_WORDS:
         return datetime.today()
-    for fmt in DATE_FORMATS:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
-    return None
+    fields = _parse_date_fields(date_str)
+    return datetime(*fields) if fields else None
 
 
 def extract_job_role(block, match):
@@ -92,93 +146,178 @@ def extract_job_role(block, match):
     return last_part.strip() if last_part else "Role not found"
 
 
-def calculate_experience(start, end):
-    """Calculate duration between two dates (inclusive of start month)."""
+def month_ordinal(date):
+    """Months since year 0 (Jan 2020 -> 2020 * 12), the unit of the stored experience intervals."""
+    return date.year * 12 + date.month - 1
+
+
+def experience_interval(start, end):
+    """
+    (start_month, end_month, months) of a date range.
+
+    start_month is the month ordinal of the start date, months the duration
+    (inclusive of start month) and end_month = start_month + months, i.e. the
+    interval is [start_month, end_month). All three are None when the start
+    cannot be parsed; a missing or unparsable end counts as a fixed 1 year.
+    """
     sd, ed = parse_date(start), parse_date(end)
     if not sd:
-        return "Duration not found"
+        return None, None, None
 
-        # If end date is missing -> fixed 1 year
     if not ed:
-        return "1 years 0 months"
+        months = 12  # If end date is missing -> fixed 1 year
+    else:
+        diff = relativedelta(ed, sd)
+        months = diff.years * 12 + diff.months
+    start_month = month_ordinal(sd)
+    return start_month, start_month + months, months
 
-        # Otherwise calculate normally
-    diff = relativedelta(ed, sd)
-    months = diff.years * 12 + diff.months
+
+def format_months(months):
+    """Human-readable duration, e.g. 14 -> "1 years 2 months"."""
+    if months is None:
+        return "Duration not found"
     return f"{months // 12} years {months % 12} months"
 
 
+def calculate_experience(start, end):
+    """Calculate duration between two dates (inclusive of start month)."""
+    return format_months(experience_interval(start, end)[2])
+
+
+def experience_entry(role, start, end):
+    """One exp_data entry: the dates as written, the readable duration and its numeric interval."""
+    start_month, end_month, months = experience_interval(start, end)
+    return {
+        "role": role,
+        "start_date": start,
+        "end_date": end,
+        "exp": format_months(months),
+        "start_month": start_month,
+        "end_month": end_month,
+        "months": months
+    }
+
+
 def extract_experience_dict(text):
-    """Return structured dict with role and experience for all ranges."""
+    """
+    Return structured dict with role and experience for all ranges.
+
+    Each block is scanned once for date ranges and once for bare years; a year
+    whose span lies inside one of the block's ranges (found by bisecting the
+    sorted range starts) belongs to that range and is skipped, any other one
+    becomes a 1-year entry of its own.
+    """
     blocks = [b.strip() for b in text.split("\n\n") if b.strip()]
+    if not blocks:
+        return {}
 
     exp_dict = {}
     exp_counter = 1
 
     for block in blocks:
+        range_starts, range_ends = [], []
         for match in DATE_RANGE_REGEX.finditer(block):
             start, end = match.group("start"), match.group("end")
             role = extract_job_role(block, match)
-            exp_value = calculate_experience(start, end)
-
-            exp_dict[f"exp_{exp_counter}"] = {
-                "role": role,
-                "start_date": start,
-                "end_date": end,
-                "exp": exp_value
-            }
+            exp_dict[f"exp_{exp_counter}"] = experience_entry(role, start, end)
             exp_counter += 1
+            range_starts.append(match.start())
+            range_ends.append(match.end())
+
+        for year_match in YEAR_REGEX.finditer(block):
+            # Skip if this year already inside a matched range (ranges never overlap)
+            i = bisect_right(range_starts, year_match.start()) - 1
+            if i >= 0 and year_match.end() <= range_ends[i]:
+                continue
 
-    for year_match in re.finditer(r"\b(19|20)\d{2}\b", block):
-        year_str = year_match.group(0)
-        # Skip if this year already inside a matched range
-        if any(year_str in m.group(0) for m in DATE_RANGE_REGEX.finditer(block)):
-            continue
-
-        role = extract_job_role(block, year_match)
-        exp_dict[f"exp_{exp_counter}"] = {
-            "role": role,
-            "start_date": year_str,
-            "end_date": "",
-            "exp": "1 years 0 months"  # ✅ auto-assign 1 year
-        }
-        exp_counter += 1
+            year_str = year_match.group(0)
+            role = extract_job_role(block, year_match)
+            exp_dict[f"exp_{exp_counter}"] = experience_entry(role, year_str, "")  # ✅ no end -> 1 year
+            exp_counter += 1
 
     return exp_dict
 
 
+def _legacy_entry_months(exp_value):
+    """Months of an "X years Y months" string, as stored before entries carried "months"."""
+    months = 0
+    years = 0
+    if "years" in exp_value:
+        years = int(exp_value.split("years")[0].strip())
+    if "months" in exp_value:
+        months_part = exp_value.split("years")[-1].replace("months", "").strip()
+        if months_part.isdigit():
+            months = int(months_part)
+    return years * 12 + months
+
+
+def merged_months(intervals):
+    """Total length of the union of [start, end) month intervals: sort, then merge overlaps in one sweep."""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        elif end > current_end:
+            current_end = end
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def add_experience_months(exp_dict):
+    """Fill in start_month/end_month/months on entries stored before they existed (re-read from the dates)."""
+    for key, exp in exp_dict.items():
+        if "months" not in exp:
+            exp_dict[key] = experience_entry(exp.get("role", ""), exp.get("start_date", ""), exp.get("end_date", ""))
+    return exp_dict
+
+
+def is_open_ended(end):
+    """True when an end date is present/current/... (the role runs until today)."""
+    return end.strip().lower().replace("(", "").replace(")", "") in PRESENT_WORDS
+
+
+def refresh_open_ended(exp_dict):
+    """Re-read the entries ending present/current/... so their end_month and months run until today again."""
+    for key, exp in exp_dict.items():
+        if is_open_ended(exp.get("end_date", "")):
+            exp_dict[key] = experience_entry(exp.get("role", ""), exp.get("start_date", ""), exp["end_date"])
+    return exp_dict
+
+
+def total_experience_months(exp_dict):
+    """
+    Months of experience in an exp_data dict, counting overlapping (concurrent)
+    roles once. Entries without "months" (rows stored by older versions) fall
+    back to their "exp" string and are simply added up.
+    """
+    intervals = []
+    legacy_months = 0
+    for exp in exp_dict.values():
+        if "months" not in exp:
+            legacy_months += _legacy_entry_months(exp["exp"])
+        elif exp["months"] and exp["months"] > 0:
+            intervals.append((exp["start_month"], exp["end_month"]))
+    return merged_months(intervals) + legacy_months
+
+
 def calculate_total_experience(exp_data_json):
+    """Total experience in years of an exp_data dict or JSON string (see total_experience_months), 0 on bad data."""
     try:
         exp_dict = exp_data_json if isinstance(exp_data_json, dict) else json.loads(exp_data_json)
-        total_months = 0
-        for exp in exp_dict.values():
-            months = 0
-            years = 0
-            if "years" in exp["exp"]:
-                years = int(exp["exp"].split("years")[0].strip())
-            if "months" in exp["exp"]:
-                months_part = exp["exp"].split("years")[-1].replace("months", "").strip()
-                if months_part.isdigit():
-                    months = int(months_part)
-            total_months += years * 12 + months
-        return total_months / 12
+        return total_experience_months(exp_dict) / 12
     except:
         return 0
 
 
 def extract_highest_education(edu_text):
-    edu_text = edu_text.upper()
-    levels = [
-        "PHD", "MASTER", "MS", "BS", "M.SC", "MSC",
-        "BACHELOR", "BSCS", "BSC",
-        "INTERMEDIATE", "HSC",
-        "MATRIC", "O-LEVEL", "A-LEVEL"
-    ]
-    found_levels = []
-    for level in levels:
-        if re.search(r'\b' + re.escape(level) + r'\b', edu_text):
-            found_levels.append(level)
-    return found_levels[0] if found_levels else "Not Found"
+    """Keyword of the highest-ranked education level in the text (see education_matcher), else "Not Found"."""
+    found = highest_education(edu_text)
+    return found[0] if found else "Not Found"
 
 
 # print(extract_experience_dict("""EXPERIENCE BISTARTX |AIDEVELOPMENTINTERN Feb2025–Mar2025|Remote • AssistedinbuildingAImodelsandautomatingdatapipelines. • AssigntotrainmodelsondifferentDataset AQUAFARM(GOVTSTARTUP) |ASSISTANTDATASCIENTIST 2023 • Collected,organized,andanalyzeddataforfarmyieldpredictions. • PreparedregularreportsinExcelandGoogleSheetsforstakeholders. TOPLINEMARKETINGPVTLTD |SALESEXECUTIVE Sep2021–Feb2022|Islamabad,PK • Communicatedwithcustomersthroughemailanddigitalplatforms. • FollowupswithClients"""))
\ No newline at end of file
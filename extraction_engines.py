@@ -0,0 +1,85 @@
+import os
+
+
+# -----------------------------
+# Extraction Engines
+# -----------------------------
+# An engine turns an opened ResumeDocument into the three raw views the parser
+# needs: positioned words (column split), reading-order page text (one-column
+# resumes) and the plain first-page text (contact info). Words are returned as
+# dicts with the pdfplumber keys ("x0", "x1", "top", "text") so the line and
+# column helpers in App2 work unchanged on either engine.
+
+class PdfplumberEngine:
+    """Original pdfplumber-based extraction. Slower, kept as the fallback."""
+
+    name = "pdfplumber"
+
+    def page_words(self, doc):
+        for page in doc.plumber_pdf.pages[:doc.pages_to_parse]:
+            yield page.extract_words()
+            page.close()  # drop the cached chars/objects of pages already extracted
+
+    def page_texts(self, doc):
+        for page in doc.plumber_pdf.pages[:doc.pages_to_parse]:
+            yield page.extract_text(layout=True)
+            page.close()
+
+    def first_page_text(self, doc):
+        pdf = doc.plumber_pdf
+        if pdf.pages:
+            return pdf.pages[0].extract_text()
+        return ""
+
+
+class FitzEngine:
+    """Pure PyMuPDF extraction built on get_text("words") / get_text("dict")."""
+
+    name = "fitz"
+
+    def page_words(self, doc):
+        for page in doc.fitz_doc.pages(0, doc.pages_to_parse):
+            yield [
+                {"x0": x0, "x1": x1, "top": y0, "text": word}
+                for x0, y0, x1, y1, word, *_ in page.get_text("words")
+            ]
+
+    def page_texts(self, doc):
+        for page in doc.fitz_doc.pages(0, doc.pages_to_parse):
+            yield "\n".join(self._page_lines(page))
+
+    def first_page_text(self, doc):
+        if len(doc.fitz_doc):
+            return "\n".join(self._page_lines(doc.fitz_doc[0]))
+        return ""
+
+    @staticmethod
+    def _page_lines(page):
+        """Text lines of a page in reading order (top-to-bottom, left-to-right)."""
+        lines = []
+        for block in page.get_text("dict")["blocks"]:
+            if block.get("type") != 0:  # skip image blocks
+                continue
+            for line in block["lines"]:
+                text = "".join(span["text"] for span in line["spans"]).strip()
+                if text:
+                    x0, y0 = line["bbox"][0], line["bbox"][1]
+                    lines.append((round(y0), x0, text))
+        lines.sort(key=lambda l: (l[0], l[1]))
+        return [text for _, _, text in lines]
+
+
+ENGINES = {
+    FitzEngine.name: FitzEngine(),
+    PdfplumberEngine.name: PdfplumberEngine(),
+}
+
+# Engine used when a ResumeDocument is opened without an explicit choice.
+DEFAULT_ENGINE = os.environ.get("RESUME_EXTRACTION_ENGINE", "pdfplumber")
+
+
+def get_engine(name=None):
+    name = name or DEFAULT_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"Unknown extraction engine '{name}'. Available: {', '.join(ENGINES)}")
+    return ENGINES[name]
@@ -0,0 +1,129 @@
+import hashlib
+import json
+
+from App2 import timed_stage
+from batch_parse import parse_one
+from database import (add_skills, fetch_resumes_with_education, fetch_resumes_without_experience_months,
+                      fetch_resumes_without_skill_index, fill_education_ranks, get_meta, reset_skill_index,
+                      save_parse_stats, save_resume_skills, save_resume_to_db, set_meta, update_resume_education,
+                      update_resume_experience)
+from education_matcher import AMBIGUOUS_KEYWORDS, KEYWORD_RANKS, education_rank
+from experience_calculator import add_experience_months, extract_highest_education, calculate_total_experience
+from jd_parser import SKILLS_DB, find_skills
+
+# Fingerprint of the skill list resume_skills was extracted with; a change re-indexes every resume
+SKILLS_DB_DIGEST = hashlib.sha256(json.dumps(SKILLS_DB).encode("utf-8")).hexdigest()[:16]
+
+
+# -----------------------------
+# Store a Parsed Resume
+# -----------------------------
+def save_parsed_resume(filename, filedata, parsed):
+    """
+    Derive the stored fields (skills, highest education and its rank, total
+    experience) from a parse result and insert the resume into the database,
+    with the SKILLS_DB entries found in its skills section indexed in
+    resume_skills.
+
+    `parsed` is the dict returned by App2.parse_resume_document (or the parse
+    cache): {"contact": ..., "sections": ..., "experience": ..., "stats": ...}.
+    When "stats" is present the parse timings, plus the time spent on this
+    database write, are recorded in parse_stats.
+    """
+    contact = parsed["contact"]
+    sections = parsed["sections"]
+    exp_dict = parsed["experience"]
+
+    name = contact.get("name", "")
+    phone = contact.get("phone", "")
+    email = contact.get("email", "")
+
+    skills = sections.get("skills", "")
+    education = extract_highest_education(sections.get("education", ""))
+    exp_json = json.dumps(exp_dict) if exp_dict else None
+    total_exp = round(calculate_total_experience(exp_dict or {}), 2)
+    skill_names = find_skills(skills or "")
+    edu_rank = education_rank(education)
+
+    stats = parsed.get("stats")
+    if stats is None:
+        return save_resume_to_db(name, phone, email, education, filename, filedata, skills, exp_json, total_exp,
+                                 skill_names, edu_rank)
+
+    stages = dict(stats.get("stages", {}))
+    with timed_stage(stages, "db_write"):
+        resume_id = save_resume_to_db(name, phone, email, education, filename, filedata, skills, exp_json, total_exp,
+                                      skill_names, edu_rank)
+    save_parse_stats(resume_id, filename, dict(stats, stages=stages))
+    return resume_id
+
+
+# -----------------------------
+# Upgrade Stored Experience
+# -----------------------------
+def backfill_experience():
+    """
+    Add the numeric experience fields (start_month, end_month, months) to
+    resumes stored before they existed and recompute their total_exp with
+    overlapping roles merged, so readers can rely on the stored total_exp.
+    Returns the number of resumes updated; rows already upgraded are skipped.
+    """
+    updates = []
+    for resume_id, exp_json in fetch_resumes_without_experience_months():
+        try:
+            exp_dict = add_experience_months(json.loads(exp_json))
+        except (ValueError, TypeError, AttributeError):
+            continue
+        updates.append((json.dumps(exp_dict), round(calculate_total_experience(exp_dict), 2), resume_id))
+    if updates:
+        update_resume_experience(updates)
+    return len(updates)
+
+
+def backfill_resume_skills():
+    """
+    Index the skills of resumes stored before resume_skills existed, so the
+    /data skill filter finds them. Returns the number of resumes indexed.
+    Every SKILLS_DB entry is registered in skills first, so a filter on a
+    known skill always takes the indexed path. When SKILLS_DB changed since
+    the stored index was built (its digest in meta differs), every resume is
+    re-indexed, so skills added to the list are found in resumes stored before.
+    """
+    add_skills(SKILLS_DB)
+    if get_meta("skills_db_digest") != SKILLS_DB_DIGEST:
+        reset_skill_index()
+    pending = [(resume_id, find_skills(skills or "")) for resume_id, skills in fetch_resumes_without_skill_index()]
+    if pending:
+        save_resume_skills(pending)
+    set_meta("skills_db_digest", SKILLS_DB_DIGEST)
+    return len(pending)
+
+
+def backfill_education_ranks():
+    """Rank the stored education keyword of resumes saved before education_rank existed; returns rows updated."""
+    return fill_education_ranks(KEYWORD_RANKS)
+
+
+def reextract_ambiguous_education():
+    """
+    Re-derive the education of resumes stored as one of the AMBIGUOUS_KEYWORDS
+    (BS, BA, BE, MS), which older matching also took from plain words such as
+    "to be announced". The education section is not stored, so each of these
+    resumes is re-parsed from its stored PDF by batch_parse.parse_one, the path
+    the parse workers take: the same page cap, so a parse cache hit when it is
+    still cached, and misses parsed under the parse_guard limits. Returns the
+    number of resumes whose education changed.
+    """
+    updates = []
+    for resume_id, stored, filedata in fetch_resumes_with_education(AMBIGUOUS_KEYWORDS):
+        parsed = parse_one(resume_id, f"resume_{resume_id}.pdf", filedata, None)
+        if "error" in parsed:
+            print(f"resume {resume_id}: could not re-parse ({parsed['error']})")
+            continue
+        education = extract_highest_education(parsed["sections"].get("education", ""))
+        if education != stored:
+            updates.append((education, education_rank(education), resume_id))
+    if updates:
+        update_resume_education(updates)
+    return len(updates)
+
@@ -1,6 +1,9 @@
+import io
 import re
 import fitz
 import docx
+from education_matcher import EDUCATION_KEYWORDS, find_education
+from skill_matcher import SkillMatcher
 # ==============================
 # Expanded Master Skills Database (Updated with your stack)
 # ==============================
@@ -95,30 +98,15 @@ SKILLS_DB = [
     "Scrum", "Kanban", "Lean", "Project Management", "Stakeholder Management"
 ]
 
+# One automaton for the whole list, shared by JD parsing, ingest and scoring
+SKILL_MATCHER = SkillMatcher(SKILLS_DB)
+
 
 # ==============================
 # Education Keywords for JD Parsing
 # ==============================
-
-education = [
-    # Doctorate
-    "PHD", "DOCTORATE", "D.PHIL",
-
-    # Master's level
-    "MASTER", "MASTERS", "MS", "M.SC", "MSC", "M.TECH", "MTECH",
-    "MBA", "M.COM", "MCA", "M.ED", "M.PHIL",
-
-    # Bachelor's level
-    "BACHELOR", "BACHELORS", "BS", "BSC", "B.SC", "BA", "B.A",
-    "BBA", "B.COM", "BCA", "B.TECH", "BTECH", "BE", "B.E", "BSCS",
-    "BSIT", "BSSE", "BCE", "BS SOFTWARE ENGINEERING",
-    "BS INFORMATION TECHNOLOGY", "BS COMPUTER SCIENCE",
-
-    # Diploma / Intermediate
-    "INTERMEDIATE", "HSC", "SSC", "DIPLOMA", "ASSOCIATE DEGREE",
-    "MATRIC", "HIGH SCHOOL", "SECONDARY SCHOOL",
-    "O-LEVEL", "A-LEVEL", "GED"
-]
+# Shared with the resume side; levels and ranks live in education_matcher.
+education = EDUCATION_KEYWORDS
 
 
 experience_reg = [
@@ -130,13 +118,15 @@ experience_reg = [
         r"\b(?:fresher|fresh graduate|entry level)\b"  # fresher / entry level
 ]
 
+def find_skills(text: str):
+    """SKILLS_DB entries mentioned in the text (whole words, case-insensitive), in SKILLS_DB order."""
+    return SKILL_MATCHER.find(text)
+
+
 def parse_job_description(text: str):
 
     # --- Extract Skills ---
-    found_skills = [
-        skill for skill in SKILLS_DB
-        if re.search(rf"\b{re.escape(skill)}\b", text, re.IGNORECASE)
-    ]
+    found_skills = find_skills(text)
     skills_str = ", ".join(found_skills)
 
     # --- Extract Experience ---
@@ -164,36 +154,68 @@ def parse_job_description(text: str):
 
 
     # --- Extract Education ---
-    found_education = []
-    for edu in education:
-        if re.search(rf"\b{re.escape(edu)}\b", text, re.I):
-            found_education.append(edu)
-
-    found_education = list(set(found_education))
+    # highest level first; the lowest level mentioned is taken as the requirement
+    found_education = find_education(text)
 
     return {
         "skills": skills_str,
         "min_experience": min_experience,
-        "education": found_education,
+        "education": [edu for edu, _ in found_education],
+        "min_education_rank": found_education[-1][1] if found_education else 0,
     }
 
 
 # ==============================
 # File Readers
 # ==============================
+# Both readers accept a file path, raw bytes or a binary file-like object
+# (e.g. an uploaded file stream), so uploads never need to touch the disk.
 def read_pdf(file_path):
+    if hasattr(file_path, "read"):
+        file_path = file_path.read()
     text = ""
-    with fitz.open(file_path) as doc:
+    if isinstance(file_path, (bytes, bytearray)):
+        doc = fitz.open(stream=file_path, filetype="pdf")
+    else:
+        doc = fitz.open(file_path)
+    with doc:
         for page in doc:
             text += page.get_text("text")
     return text
 
 
 def read_docx(file_path):
+    if isinstance(file_path, (bytes, bytearray)):
+        file_path = io.BytesIO(file_path)
     doc = docx.Document(file_path)
     return "\n".join([p.text for p in doc.paragraphs])
 
 
+JD_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+def read_job_description(filename, source=None):
+    """
+    Text of a JD file, read by its extension (.pdf, .docx or plain .txt).
+    `source` is a path, bytes or a binary file-like object and defaults to
+    `filename` itself; other extensions raise ValueError.
+    """
+    source = filename if source is None else source
+    if hasattr(source, "read"):
+        source = source.read()
+    name = filename.lower()
+    if name.endswith(".pdf"):
+        return read_pdf(source)
+    if name.endswith(".docx"):
+        return read_docx(source)
+    if name.endswith(".txt"):
+        if isinstance(source, (bytes, bytearray)):
+            return bytes(source).decode("utf-8", errors="replace")
+        with open(source, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    raise ValueError(f"Unsupported file format: {filename}. Only PDF, DOCX and TXT are allowed.")
+
+
 # ==============================
 # Main
 # ==============================
@@ -0,0 +1,385 @@
+import os
+import statistics
+
+import numpy as np
+
+
+# -----------------------------
+# Layout Detectors
+# -----------------------------
+# A detector decides whether a resume is "one-column" or "two-column" from the
+# text blocks of its first page (PyMuPDF get_text("blocks") tuples) and the
+# page size. App2.detect_resume_type extracts the blocks once and hands them to
+# the selected detector. With debug=True a detector returns a dict holding the
+# "result", the clusters it built, the figures behind its decision and
+# "blocks_used" (blocks left after noise filtering) instead of the bare label.
+#
+# V4 is the live detector. The hybrid_* variants are the earlier generations
+# kept in a.py, ported as-is so they can be compared on the same corpus
+# (benchmarks/bench_layout.py).
+
+def first_page_blocks(doc):
+    """(blocks, page_width, page_height) of the first page of a ResumeDocument."""
+    page = doc.fitz_doc[0]
+    return page.get_text("blocks"), page.rect.width, page.rect.height
+
+
+def _one_column(debug, clusters, blocks_used):
+    if debug:
+        return {"result": "one-column", "clusters": clusters, "blocks_used": blocks_used}
+    return "one-column"
+
+
+def _leftmost_first(proc):
+    """The two clusters with the largest text share, leftmost first."""
+    c1, c2 = proc[0], proc[1]
+    if c1["x0"] > c2["x0"]:
+        c1, c2 = c2, c1
+    return c1, c2
+
+
+def _overlap_frac(c1, c2):
+    """Vertical overlap of two clusters as a fraction of the shorter one's span."""
+    overlap = max(0, min(c1["ymax"], c2["ymax"]) - max(c1["ymin"], c2["ymin"]))
+    min_y_span = min(c1["ymax"] - c1["ymin"], c2["ymax"] - c2["ymin"])
+    return overlap / min_y_span if min_y_span > 0 else 0
+
+
+class V4Detector:
+    """
+    Detects if a PDF resume is a one-column or two-column layout using block analysis.
+    V4 is tuned for robust detection of sidebar/main-content two-column layouts.
+    """
+
+    name = "v4"
+
+    def classify(self, blocks, page_w, page_h, debug=False):
+        # --- Collect block info and filter noise ---
+        # Columns: x0, x1, width, chars, ymin, ymax
+        rows = []
+        for b in blocks:
+            x0, y0, x1, y1, text, *_ = b
+            txt = text.strip()
+            if not txt:
+                continue
+
+            char_count = len(txt)
+            # Filter out very short blocks (e.g., single letters, icons)
+            if char_count < 5:
+                continue
+
+            block_w = x1 - x0
+            # Ignore very wide blocks (likely headers/footers spanning the page)
+            if block_w / page_w > 0.95:
+                continue
+
+            rows.append((x0, x1, block_w, char_count, y0, y1))
+
+        if not rows:
+            return _one_column(debug, [], 0)
+
+        data = np.array(rows, dtype=float)
+        data = data[np.argsort(data[:, 0], kind="stable")]  # sort by x0
+        x0s, x1s, widths = data[:, 0], data[:, 1], data[:, 2]
+        chars = data[:, 3].astype(np.int64)
+        total_chars = int(chars.sum())
+
+        # --- Group by x0 (binning) ---
+        # x0s are sorted, so a cluster's median x0 is its middle element(s):
+        # the running center is O(1) per block instead of a fresh median.
+        # V4 Change: Increased tolerance to handle minor misalignments
+        grouping_tolerance = 60
+
+        starts = [0]
+        for i in range(1, len(x0s)):
+            s0 = starts[-1]
+            n = i - s0
+            center = (x0s[s0 + (n - 1) // 2] + x0s[s0 + n // 2]) / 2
+            if not abs(center - x0s[i]) < grouping_tolerance:
+                starts.append(i)
+        starts = np.array(starts)
+
+        # --- Compute cluster stats (vectorized over all clusters) ---
+        counts = np.diff(np.append(starts, len(x0s)))
+        lo = starts + (counts - 1) // 2
+        hi = starts + counts // 2
+        cluster_ids = np.repeat(np.arange(len(starts)), counts)
+
+        def cluster_medians(values):
+            ordered = values[np.lexsort((values, cluster_ids))]
+            return (ordered[lo] + ordered[hi]) / 2
+
+        med_x0 = (x0s[lo] + x0s[hi]) / 2
+        med_x1 = cluster_medians(x1s)
+        med_width = cluster_medians(widths)
+        char_fracs = np.add.reduceat(chars, starts) / total_chars
+        ymins = np.minimum.reduceat(data[:, 4], starts)
+        ymaxs = np.maximum.reduceat(data[:, 5], starts)
+
+        proc = []
+        for i in range(len(starts)):
+            # Filter out minor clusters that don't contribute much text
+            if char_fracs[i] < 0.03 and counts[i] < 3:
+                continue
+            ymin, ymax = float(ymins[i]), float(ymaxs[i])
+            proc.append({
+                "x0": float(med_x0[i]),
+                "x1": float(med_x1[i]),
+                "width": float(med_width[i]),
+                "char_frac": float(char_fracs[i]),
+                "coverage": (ymax - ymin) / page_h,
+                "ymin": ymin, "ymax": ymax
+            })
+
+        # Sort by char share
+        proc.sort(key=lambda c: c["char_frac"], reverse=True)
+
+        if len(proc) < 2:
+            return _one_column(debug, proc, len(rows))
+
+        # c1 is always the leftmost cluster
+        c1, c2 = _leftmost_first(proc)
+
+        # Calculate horizontal gap between columns
+        gap = c2["x0"] - c1["x1"]
+
+        # Check overlap
+        overlap_frac = _overlap_frac(c1, c2)
+
+        # --- ROBUST HYBRID CONDITIONS (V4) ---
+        is_two_col = (
+            # 1. Sufficient total text explained by the two main clusters
+                (c1["char_frac"] + c2["char_frac"]) >= 0.60 and
+
+                # 2. Both columns must have significant, even if small, content
+                c1["char_frac"] >= 0.05 and  # Leftmost column must be ≥ 5% text
+                c2["char_frac"] >= 0.03 and  # Rightmost column must be ≥ 3% text
+
+                # 3. V4 CHANGE: At least ONE of the two columns must cover half the page height.
+                max(c1["coverage"], c2["coverage"]) >= 0.50 and
+
+                # 4. At least some vertical overlap (20%)
+                overlap_frac >= 0.20 and
+
+                # 5. Right column must start past the 30% mark
+                c2["x0"] >= page_w * 0.30 and
+
+                # 6. The horizontal gap must be large (e.g., 5% of page width)
+                gap / page_w >= 0.05 and
+
+                # 7. Max width constraint to prevent single-column, highly-indented False Positives.
+                max(c1["width"], c2["width"]) / page_w <= 0.70
+        )
+
+        result = "two-column" if is_two_col else "one-column"
+
+        if debug:
+            return {
+                "result": result,
+                "clusters": proc,
+                "together_frac": c1["char_frac"] + c2["char_frac"],
+                "overlap_frac": overlap_frac,
+                "c1_char_frac": c1["char_frac"],
+                "c2_coverage": c2["coverage"],
+                "c1_coverage": c1["coverage"],
+                "max_coverage": max(c1["coverage"], c2["coverage"]),
+                "gap_ratio": gap / page_w,
+                "max_width_ratio": max(c1["width"], c2["width"]) / page_w,
+                "blocks_used": len(rows),
+            }
+        return result
+
+
+# --- Earlier generations (from a.py) ---
+def _median_clusters(blocks, page_w, page_h, grouping_tolerance, min_char_frac):
+    """
+    Block filtering, x0 grouping and cluster stats shared by the hybrid
+    detectors: blocks of 3+ chars no wider than 92% of the page, grouped while
+    their x0 stays within `grouping_tolerance` of the running cluster median.
+    Clusters under `min_char_frac` of the text with fewer than 3 blocks are
+    dropped. Returns (clusters sorted by char share, blocks used).
+    """
+    clusters_data = []
+    total_chars = 0
+    for b in blocks:
+        x0, y0, x1, y1, text, *_ = b
+        txt = text.strip()
+        if len(txt) < 3:
+            continue
+        block_w = x1 - x0
+        if block_w / page_w > 0.92:  # ignore headers/footers
+            continue
+        clusters_data.append({"x0": x0, "width": block_w, "chars": len(txt), "ymin": y0, "ymax": y1})
+        total_chars += len(txt)
+
+    if total_chars == 0:
+        return [], 0
+
+    # --- Group by x0 (rough binning) ---
+    clusters_data.sort(key=lambda c: c["x0"])
+    grouped, cur = [], None
+    for c in clusters_data:
+        if cur and abs(statistics.median(cur["x0"]) - c["x0"]) < grouping_tolerance:
+            for k in ("x0", "width", "ymin", "ymax"):
+                cur[k].append(c[k])
+            cur["chars"] += c["chars"]
+        else:
+            if cur:
+                grouped.append(cur)
+            cur = {"x0": [c["x0"]], "width": [c["width"]], "ymin": [c["ymin"]], "ymax": [c["ymax"]],
+                   "chars": c["chars"]}
+    grouped.append(cur)
+
+    # --- Compute cluster stats ---
+    proc = []
+    for g in grouped:
+        char_frac = g["chars"] / total_chars
+        if char_frac < min_char_frac and len(g["x0"]) < 3:  # ignore tiny noise blocks
+            continue
+        ymin, ymax = min(g["ymin"]), max(g["ymax"])
+        proc.append({
+            "x0": statistics.median(g["x0"]),
+            "width": statistics.median(g["width"]),
+            "char_frac": char_frac,
+            "coverage": (ymax - ymin) / page_h,
+            "ymin": ymin, "ymax": ymax
+        })
+
+    proc.sort(key=lambda c: c["char_frac"], reverse=True)
+    return proc, len(clusters_data)
+
+
+class HybridOptimizedDetector:
+    """Optimized for modern, slightly unbalanced two-column layouts (a.py detect_resume_type_hybrid_optimized)."""
+
+    name = "hybrid_optimized"
+
+    def classify(self, blocks, page_w, page_h, debug=False):
+        proc, blocks_used = _median_clusters(blocks, page_w, page_h, grouping_tolerance=50, min_char_frac=0.02)
+        if len(proc) < 2:
+            return _one_column(debug, proc, blocks_used)
+
+        c1, c2 = _leftmost_first(proc)
+        together_frac = c1["char_frac"] + c2["char_frac"]
+        overlap_frac = _overlap_frac(c1, c2)
+
+        is_two_col = (
+                together_frac >= 0.75 and  # 75%+ of text explained
+                c1["coverage"] >= 0.5 and  # left column covers half the page height
+                c2["coverage"] >= 0.20 and  # right column/sidebar can be shorter
+                overlap_frac >= 0.2 and
+                c2["x0"] >= page_w * 0.35 and  # right column starts past the 35% mark
+                c1["char_frac"] >= 0.05 and
+                c2["char_frac"] >= 0.05 and
+                max(c1["width"], c2["width"]) / page_w <= 0.65  # no column dominates the width
+        )
+
+        result = "two-column" if is_two_col else "one-column"
+        if debug:
+            return {
+                "result": result,
+                "clusters": proc,
+                "together_frac": together_frac,
+                "overlap_frac": overlap_frac,
+                "c1_width_ratio": c1["width"] / page_w,
+                "c2_coverage": c2["coverage"],
+                "blocks_used": blocks_used,
+            }
+        return result
+
+
+class Hybrid1Detector:
+    """Additive score over the column conditions (a.py detect_resume_type_hybrid1)."""
+
+    name = "hybrid1"
+
+    def classify(self, blocks, page_w, page_h, debug=False):
+        proc, blocks_used = _median_clusters(blocks, page_w, page_h, grouping_tolerance=40, min_char_frac=0)
+        if len(proc) < 2:
+            return _one_column(debug, proc, blocks_used)
+
+        c1, c2 = _leftmost_first(proc)
+        together_frac = c1["char_frac"] + c2["char_frac"]
+        overlap_frac = _overlap_frac(c1, c2)
+
+        score = 0
+        if c1["coverage"] >= 0.5 and c2["coverage"] >= 0.2:
+            score += 2
+        if together_frac >= 0.8:
+            score += 2
+        if overlap_frac >= 0.2:
+            score += 1
+        if c2["x0"] >= page_w * 0.25:
+            score += 1
+        if max(c1["width"], c2["width"]) / page_w > 0.65:
+            score -= 2  # penalty
+
+        result = "two-column" if score >= 3 else "one-column"
+        if debug:
+            return {
+                "result": result,
+                "clusters": proc,
+                "together_frac": together_frac,
+                "overlap_frac": overlap_frac,
+                "score": score,
+                "blocks_used": blocks_used,
+            }
+        return result
+
+
+class Hybrid2Detector:
+    """Robust, tuned conditions for high accuracy (a.py detect_resume_type_hybrid2)."""
+
+    name = "hybrid2"
+
+    def classify(self, blocks, page_w, page_h, debug=False):
+        proc, blocks_used = _median_clusters(blocks, page_w, page_h, grouping_tolerance=40, min_char_frac=0.03)
+        if len(proc) < 2:
+            return _one_column(debug, proc, blocks_used)
+
+        c1, c2 = _leftmost_first(proc)
+        together_frac = c1["char_frac"] + c2["char_frac"]
+        overlap_frac = _overlap_frac(c1, c2)
+
+        is_two_col = (
+                together_frac >= 0.75 and
+                c1["char_frac"] >= 0.10 and  # main column must be ≥ 10% text
+                c2["char_frac"] >= 0.05 and  # sidebar must be ≥ 5% text
+                c1["coverage"] >= 0.50 and
+                c2["coverage"] >= 0.20 and
+                overlap_frac >= 0.20 and
+                c2["x0"] >= page_w * 0.35 and
+                max(c1["width"], c2["width"]) / page_w <= 0.65
+        )
+
+        result = "two-column" if is_two_col else "one-column"
+        if debug:
+            return {
+                "result": result,
+                "clusters": proc,
+                "together_frac": together_frac,
+                "overlap_frac": overlap_frac,
+                "c1_char_frac": c1["char_frac"],
+                "c2_coverage": c2["coverage"],
+                "max_width_ratio": max(c1["width"], c2["width"]) / page_w,
+                "blocks_used": blocks_used,
+            }
+        return result
+
+
+DETECTORS = {
+    V4Detector.name: V4Detector(),
+    HybridOptimizedDetector.name: HybridOptimizedDetector(),
+    Hybrid1Detector.name: Hybrid1Detector(),
+    Hybrid2Detector.name: Hybrid2Detector(),
+}
+
+# Detector used by App2.detect_resume_type when none is passed explicitly.
+DEFAULT_DETECTOR = os.environ.get("RESUME_LAYOUT_DETECTOR", "v4")
+
+
+def get_detector(name=None):
+    name = name or DEFAULT_DETECTOR
+    if name not in DETECTORS:
+        raise ValueError(f"Unknown layout detector '{name}'. Available: {', '.join(DETECTORS)}")
+    return DETECTORS[name]
@@ -1,123 +1,126 @@
-from flask import Flask, request, jsonify, render_template, send_file, abort
+from flask import Flask, Response, request, jsonify, render_template, send_file, abort
 import io
 import json
-import os
 from werkzeug.utils import secure_filename
-from database import init_db, save_resume_to_db, fetch_all_resumes, fetch_resume_from_db
-from App2 import extract_contact_info, extract_resume_text, extract_all_sections, normalize_sections, resume_headings_base, clean_section_dict, preprocess_resume_text,remove_phone_numbers
-from experience_calculator import extract_experience_dict, extract_highest_education, calculate_total_experience
-from jd_parser import parse_job_description, read_pdf, read_docx
-from score import calculate_scores_for_all_resumes
+from database import init_db, fetch_filtered_resumes, fetch_resume_from_db
+from App2 import register_headings, resume_headings_base
+from ingest import backfill_education_ranks, backfill_experience, backfill_resume_skills
+from parse_jobs import ParseJobQueue, QueueFullError, QueueUnavailableError
+from jd_parser import parse_job_description, read_job_description
+from score import DEFAULT_PAGE_SIZE, rank_jd_batch, rank_resumes
 
 
 app = Flask(__name__)
 
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-JD_FOLDER = "JD_uploads"
-os.makedirs(JD_FOLDER, exist_ok=True)
+# Job descriptions accepted per /jd_batch request
+JD_BATCH_MAX = 50
 
 init_db()
+backfill_experience()
+backfill_resume_skills()
+backfill_education_ranks()
+parse_queue = ParseJobQueue()
 
 @app.route("/")
 def index():
     return render_template("index.html")
 
 
-@app.route("/parse", methods=["POST"])
-def parse_resume():
+def _enqueue_uploads():
+    """Queue the uploaded PDFs. Returns (jobs, rejected, error_response)."""
     files = request.files.getlist("file")
-    results = []
 
     if not files:
-        return jsonify({"error": "No files uploaded"}), 400
+        return None, None, (jsonify({"error": "No files uploaded"}), 400)
 
+    rejected = []
+    uploads = []
     for f in files:
         # Only accept PDF/DOCX
         if not f.filename.lower().endswith(".pdf"):
-            results.append({"filename": f.filename, "error": "Unsupported file type"})
+            rejected.append({"filename": f.filename, "error": "Unsupported file type"})
             continue
+        # Keep the bytes in memory; nothing is written to disk
+        uploads.append((f.filename, f.read()))
 
-        # Save file with unique name
-        filename = f"{f.filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, filename)
-        f.save(save_path)
+    try:
+        job_ids = parse_queue.submit_many(uploads)
+    except QueueFullError as e:
+        response = jsonify({"error": f"Parse queue is full, retry shortly ({e})"})
+        response.headers["Retry-After"] = "5"
+        return None, None, (response, 429)
+    except QueueUnavailableError as e:
+        response = jsonify({"error": f"Parse workers are restarting, retry shortly ({e})"})
+        response.headers["Retry-After"] = "5"
+        return None, None, (response, 503)
 
-        contact = {}
-        sections = {}
+    jobs = [{"job_id": job_id, "filename": filename} for job_id, (filename, _) in zip(job_ids, uploads)]
+    return jobs, rejected, None
 
 
-        try:
-            # Extract contact info
-            contact = extract_contact_info(save_path)
-            name = contact.get("name", "")
-            phone = contact.get("phone", "")
-            email = contact.get("email", "")
-
-
-            # Extract resume text and sections
-            text = extract_resume_text(save_path)
-            text = preprocess_resume_text(text)
-            sections = extract_all_sections(text) # Should return a dict
-            sections = clean_section_dict(sections)
-            sections = normalize_sections(sections, resume_headings_base)
-
-            exp_text = remove_phone_numbers(sections.get("experience", ""))  # assume normalized section
-            exp_dict = extract_experience_dict(exp_text)
-            skills = sections.get("skills", "")
-            education = extract_highest_education(sections.get("education", ""))
-            exp_json = json.dumps(exp_dict) if exp_dict else None
-            total_exp = round(calculate_total_experience(exp_json),2)
-
-
-            # Save all info to database
-            with open(save_path, "rb") as file_obj:
-                save_resume_to_db(name, phone, email, education, f.filename, file_obj.read(), skills, exp_json, total_exp)
-
-            results.append({
-                "filename": f.filename,
-                "contact": contact,
-                "sections": sections
-            })
+@app.route("/parse", methods=["POST"])
+def parse_resume():
+    """Queue every uploaded PDF as a parse job and return the job ids right away (202).
 
-        except Exception as e:
-            print(f"Error processing {f.filename}: {e}")
-            results.append({
-                "filename": f.filename,
-                "error": str(e),
-                "contact": contact,
-                "sections": sections
-            })
+    Poll /jobs/<job_id> for each job's state and result. Answers 429 when the
+    queue cannot take the whole batch, and 503 when the worker pool refused it
+    (nothing is queued either way). A document stopped by the per-document
+    guards ends in state "error" with an "error_code" ("timeout",
+    "memory_limit", "crashed") and the limit hit in "error_details".
+    """
+    jobs, rejected, error = _enqueue_uploads()
+    if error:
+        return error
+    return jsonify({"jobs": jobs, "rejected": rejected}), 202
+
+
+@app.route("/parse/stream", methods=["POST"])
+def parse_resume_stream():
+    """Streaming variant of /parse: NDJSON, one line per resume as soon as it is parsed.
 
-    return jsonify(results)
+    The first line is {"type": "accepted", "jobs": [...], "rejected": [...]},
+    followed by one {"type": "result", ...job status...} line per job in
+    completion order.
+    """
+    jobs, rejected, error = _enqueue_uploads()
+    if error:
+        return error
+
+    def generate():
+        yield json.dumps({"type": "accepted", "jobs": jobs, "rejected": rejected}) + "\n"
+        for status in parse_queue.iter_finished([job["job_id"] for job in jobs]):
+            yield json.dumps({"type": "result", **status}) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson",
+                    headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"})
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    status = parse_queue.status(job_id)
+    if status is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(status)
 
 
 @app.route("/data", methods=["GET"])
 def resume_data():
+    """List resumes, optionally only those with any of the comma-separated `skill`s and at least `exp` years.
+
+    Both filters run as SQL predicates (see database.fetch_filtered_resumes).
+    """
     skill = request.args.get("skill", None)
     exp = request.args.get("exp", None)
 
-    resumes = fetch_all_resumes()
-
-    # Filter resumes
-    filtered_resumes = []
-    for row in resumes:
-        row_skill = row["skills"] or ""
-        row_exp_json = row["exp_data"] or "{}"
-        total_exp = calculate_total_experience(row_exp_json) # Apply only the provided filter
-        if skill:
-            skill_list = [s.strip().lower() for s in skill.split(",")]
-            if not any(s in row_skill.lower() for s in skill_list):
-                continue
-                # === Experience filter ===
-        if exp:
-            try:
-                if total_exp < float(exp):
-                    continue
-            except ValueError:
-                pass
-        filtered_resumes.append(row)
+    skill_list = skill.split(",") if skill else []
+    min_exp = None
+    if exp:
+        try:
+            min_exp = float(exp)
+        except ValueError:
+            pass
+
+    filtered_resumes = fetch_filtered_resumes(skill_list, min_exp)
 
     return render_template(
         "data.html",
@@ -130,23 +133,26 @@ def resume_data():
 
 @app.route("/jd_parser", methods=["GET", "POST"])
 def jd_parser_view():
+    """Rank the stored resumes against an uploaded or pasted JD, one page (form field `page`) at a time."""
     jd_text = ""
     jd_dict = None
     matched_resumes = []
+    total_matches = 0
+    try:
+        page = max(int(request.form.get("page", 1)), 1)
+    except ValueError:
+        page = 1
 
     if request.method == "POST":
         # --- Handle file upload ---
         file = request.files.get("jdFile")
         if file and file.filename:
             filename = secure_filename(file.filename)
-            temp_path = os.path.join(JD_FOLDER, filename)
-            file.save(temp_path)  # Save temporarily
-
-            if filename.lower().endswith(".pdf"):
-                jd_text = read_pdf(temp_path)
-            elif filename.lower().endswith(".docx"):
-                jd_text = read_docx(temp_path)
-            else:
+
+            # Read straight from the upload stream, no temporary file
+            try:
+                jd_text = read_job_description(filename, file.stream)
+            except ValueError:
                 return jsonify({"error": "Unsupported file format"}), 400
 
         # --- Handle text input ---
@@ -158,16 +164,87 @@ def jd_parser_view():
 
         # --- Parse JD and calculate scores ---
         jd_dict = parse_job_description(jd_text)
-        matched_resumes = calculate_scores_for_all_resumes(jd_dict)
+        matched_resumes, total_matches = rank_resumes(jd_dict, DEFAULT_PAGE_SIZE, (page - 1) * DEFAULT_PAGE_SIZE)
 
     # ✅ Always render page with data (if available)
     return render_template(
         "jd_parser.html",
-        matched_resumes=matched_resumes
-        # jdText=jd_text  # Keep JD text in textarea
+        matched_resumes=matched_resumes,
+        total_matches=total_matches,
+        page=page,
+        page_size=DEFAULT_PAGE_SIZE,
+        jdText=jd_text  # Keep JD text in textarea, so the page buttons resubmit it
     )
 
 
+@app.route("/jd_batch", methods=["POST"])
+def jd_batch():
+    """Rank the stored resumes against several JDs at once (files `jdFile`, PDF/DOCX/TXT, and/or texts `jdText`).
+
+    At most JD_BATCH_MAX JDs per request (400 beyond). Every JD is parsed
+    once and they are scored together (see score.rank_jd_batch). Returns {"rankings": [...]}, one entry per JD in
+    upload order with its "jd" name, "total_matches" and top `top` (default
+    DEFAULT_PAGE_SIZE, at least 1) "resumes".
+    """
+    try:
+        top = int(request.form.get("top", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        top = 0
+    if top < 1:
+        return jsonify({"error": "'top' must be a positive number"}), 400
+
+    files = [f for f in request.files.getlist("jdFile") if f.filename]
+    texts = [text for text in request.form.getlist("jdText") if text.strip()]
+    if len(files) + len(texts) > JD_BATCH_MAX:
+        return jsonify({"error": f"At most {JD_BATCH_MAX} job descriptions per request"}), 400
+
+    names, jd_dicts, rejected = [], [], []
+    for f in files:
+        try:
+            jd_text = read_job_description(secure_filename(f.filename), f.stream)
+        except Exception as e:
+            rejected.append({"filename": f.filename, "error": str(e)})
+            continue
+        names.append(f.filename)
+        jd_dicts.append(parse_job_description(jd_text))
+    for i, jd_text in enumerate(texts, 1):
+        names.append(f"text_{i}")
+        jd_dicts.append(parse_job_description(jd_text))
+
+    if not jd_dicts:
+        return jsonify({"error": "No job descriptions uploaded", "rejected": rejected}), 400
+
+    rankings = [
+        {"jd": name, "total_matches": total, "resumes": rows}
+        for name, (rows, total) in zip(names, rank_jd_batch(jd_dicts, top))
+    ]
+    return jsonify({"rankings": rankings, "rejected": rejected})
+
+
+@app.route("/headings", methods=["GET", "POST"])
+def headings():
+    """List the section heading dictionary or register new heading variants at runtime.
+
+    POST JSON: {"section": "experience", "headings": ["Relevant Experience", ...]}
+    """
+    if request.method == "POST":
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
+        section = payload.get("section")
+        raw_headings = payload.get("headings")
+        if (not isinstance(section, str) or not isinstance(raw_headings, list)
+                or not all(isinstance(h, str) for h in raw_headings)):
+            return jsonify({"error": "'section' must be a string and 'headings' a list of strings"}), 400
+        section = section.strip().lower()
+        new_headings = [h.strip() for h in raw_headings if h.strip()]
+        if not section or not new_headings:
+            return jsonify({"error": "Provide a 'section' and a non-empty 'headings' list"}), 400
+        return jsonify({"section": section, "headings": register_headings(section, new_headings)})
+
+    return jsonify({section: sorted(variants) for section, variants in resume_headings_base.items()})
+
+
 @app.route("/download_resume/<int:resume_id>")
 def download_resume(resume_id):
     result = fetch_resume_from_db(resume_id)
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+
+from App2 import current_version_bounds, parse_resume_document, parser_version
+from database import get_cached_parse, save_cached_parse
+from experience_calculator import refresh_open_ended
+
+# Maximum number of cached parse results kept in the database (LRU eviction).
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", 5000))
+
+
+# -----------------------------
+# Content-Hash Parse Cache
+# -----------------------------
+def cached_parse_resume(doc, parse=parse_resume_document):
+    """
+    Parse a ResumeDocument, reusing a previous result for identical bytes.
+
+    The cache key is the SHA-256 of the PDF bytes plus App2.parser_version(),
+    so a re-uploaded file skips extraction entirely (the PDF is never even
+    opened), while a parser code bump, a different extraction engine or a
+    change to the heading dictionary automatically misses. Entries of older
+    code or an older heading dictionary are purged; those of other settings
+    (engine, page cap, detector) stay until the LRU bound drops them.
+
+    Roles ending "Present" (current, ongoing, ...) are measured up to the
+    day they were parsed, so a hit re-reads those entries from their stored
+    dates (experience_calculator.refresh_open_ended) instead of returning a
+    frozen duration.
+
+    Stage timings are only meaningful for the run that measured them, so they
+    are not cached: a hit returns the stored layout/page/char counts with an
+    empty "stages" dict and stats["cache_hit"] set.
+
+    `parse` is called with the document on a miss (batch_parse wraps
+    parse_resume_document in the per-document guards).
+    """
+    file_hash = hashlib.sha256(doc.data).hexdigest()
+    version = parser_version(doc.engine.name, doc.max_pages)
+
+    cached = get_cached_parse(file_hash, version)
+    if cached is not None:
+        result = json.loads(cached)
+        refresh_open_ended(result.get("experience", {}))
+        result["stats"] = dict(result.get("stats", {}), stages={}, cache_hit=True)
+        return result
+
+    result = parse(doc)
+    stored = dict(result, stats={k: v for k, v in result["stats"].items() if k != "stages"})
+    save_cached_parse(file_hash, version, json.dumps(stored), PARSE_CACHE_MAX_ENTRIES, *current_version_bounds())
+    result["stats"]["cache_hit"] = False
+    return result
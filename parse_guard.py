@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import time
+
+# Per-document limits applied by batch_parse.parse_one. 0 disables a limit.
+PARSE_TIMEOUT_SECONDS = float(os.environ.get("PARSE_TIMEOUT_SECONDS", 60))
+PARSE_MAX_PAGES = int(os.environ.get("PARSE_MAX_PAGES", 10))
+PARSE_MAX_RSS_GROWTH_MB = float(os.environ.get("PARSE_MAX_RSS_GROWTH_MB", 512))
+
+# How often the supervising process checks on the child.
+POLL_INTERVAL = 0.05
+
+
+class DocumentLimitError(Exception):
+    """A document was stopped by a guard. `code` is "timeout", "memory_limit" or "crashed"."""
+
+    def __init__(self, code, message, **details):
+        super().__init__(message)
+        self.code = code
+        self.details = details
+
+
+def rss_mb(pid=None):
+    """Resident set size of a process in MB, or None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _context():
+    # fork shares the already imported PDF stack with the child; spawn is the fallback (Windows)
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _child_main(conn, func, args):
+    conn.send(("started", rss_mb()))
+    try:
+        conn.send(("ok", func(*args)))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+# -----------------------------
+# Isolated Execution
+# -----------------------------
+def run_isolated(func, args=(), timeout=PARSE_TIMEOUT_SECONDS, max_rss_growth_mb=PARSE_MAX_RSS_GROWTH_MB):
+    """
+    Run func(*args) in a child process and return its result.
+
+    The caller (a parse pool worker) supervises the child: it is killed once
+    it runs longer than `timeout` seconds or its RSS grows by more than
+    `max_rss_growth_mb` over what it had when it started, and a
+    DocumentLimitError is raised. A child that dies without answering (e.g. a
+    segfault inside a PDF library) raises DocumentLimitError("crashed").
+    Exceptions raised by `func` are re-raised as RuntimeError with the same
+    message. The memory limit needs /proc (Linux); elsewhere only the timeout
+    applies. `func` and `args` must be picklable where fork is unavailable.
+    """
+    ctx = _context()
+    receiver, sender = ctx.Pipe(duplex=False)
+    child = ctx.Process(target=_child_main, args=(sender, func, args), daemon=True)
+    start = time.monotonic()
+    child.start()
+    sender.close()
+
+    baseline = None
+    try:
+        while True:
+            elapsed = time.monotonic() - start
+            if timeout and elapsed > timeout:
+                raise DocumentLimitError("timeout", f"Parsing took longer than {timeout:g}s and was stopped",
+                                         limit=timeout, elapsed=round(elapsed, 3))
+
+            if receiver.poll(POLL_INTERVAL):
+                try:
+                    kind, payload = receiver.recv()
+                except EOFError:
+                    child.join()
+                    raise DocumentLimitError("crashed", f"Parser process died (exit code {child.exitcode})",
+                                             exitcode=child.exitcode) from None
+                if kind == "started":
+                    baseline = payload
+                    continue
+                if kind == "ok":
+                    return payload
+                raise RuntimeError(payload)
+
+            if max_rss_growth_mb and baseline is not None:
+                current = rss_mb(child.pid)
+                if current is not None and current - baseline > max_rss_growth_mb:
+                    raise DocumentLimitError(
+                        "memory_limit",
+                        f"Parsing used more than {max_rss_growth_mb:g} MB of extra memory and was stopped",
+                        limit=max_rss_growth_mb, rss_growth_mb=round(current - baseline, 1))
+    finally:
+        if child.is_alive():
+            child.kill()
+        child.join()
+        receiver.close()
@@ -0,0 +1,223 @@
+import os
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from App2 import heading_snapshot
+from batch_parse import init_worker, parse_one
+from ingest import save_parsed_resume
+
+# Worker processes parsing uploads, and how many jobs may be queued or running
+# at once before /parse answers 429.
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", os.cpu_count() or 1))
+PARSE_QUEUE_MAX = int(os.environ.get("PARSE_QUEUE_MAX", 200))
+# Finished jobs kept around for /jobs/<id> lookups (oldest dropped first).
+FINISHED_JOBS_KEPT = int(os.environ.get("FINISHED_JOBS_KEPT", 1000))
+
+
+class QueueFullError(Exception):
+    """Raised when accepting more jobs would exceed the queue bound."""
+
+
+class QueueUnavailableError(Exception):
+    """Raised when the worker pool refused a submission (e.g. a worker died); nothing was queued."""
+
+
+# -----------------------------
+# Parse Job Queue
+# -----------------------------
+class ParseJobQueue:
+    """
+    Bounded queue of resume parse jobs backed by a process pool.
+
+    Each job goes queued -> running -> done | error. Finished results are
+    stored in the database from the pool's completion callback, so the HTTP
+    worker that enqueued them returns immediately.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS, max_pending=PARSE_QUEUE_MAX, engine=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.engine = engine
+        self._pool = None
+        self._jobs = OrderedDict()
+        self._pending = 0
+        self._streamed = Counter()  # job ids an iter_finished call still has to report; not evicted
+        self._lock = threading.RLock()  # completion callbacks may run inside submit_many
+        self._job_finished = threading.Condition(self._lock)
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        return self._pool
+
+    def submit_many(self, uploads):
+        """
+        Enqueue (filename, pdf_bytes) pairs and return their job ids.
+
+        All-or-nothing: if the batch does not fit under max_pending, nothing is
+        queued and QueueFullError is raised so the caller can apply backpressure.
+        If the pool refuses a submission (BrokenProcessPool or RuntimeError
+        after a worker died), the jobs already queued from this batch are
+        cancelled, the pool is dropped so the next batch starts a fresh one,
+        and QueueUnavailableError is raised.
+        """
+        with self._lock:
+            if self._pending + len(uploads) > self.max_pending:
+                raise QueueFullError(f"{self._pending} jobs pending, limit is {self.max_pending}")
+            pool = self._get_pool()
+            headings = heading_snapshot()  # workers outlive POST /headings; each job carries the dictionary
+            job_ids = []
+            try:
+                for filename, data in uploads:
+                    future = pool.submit(parse_one, 0, filename, data, self.engine, headings)
+                    job_id = uuid.uuid4().hex
+                    job = {
+                        "job_id": job_id,
+                        "filename": filename,
+                        "state": "queued",
+                        "queued_at": time.time(),
+                        "started_at": None,
+                        "finished_at": None,
+                        "parse_seconds": None,
+                        "result": None,
+                        "error": None,
+                        "error_code": None,
+                        "future": future,
+                    }
+                    self._jobs[job_id] = job
+                    self._pending += 1
+                    job_ids.append(job_id)
+                    future.add_done_callback(lambda fut, job=job, data=data: self._finish(job, data, fut))
+            except (BrokenProcessPool, RuntimeError) as e:
+                self._rollback(job_ids)
+                if self._pool is pool:
+                    self._pool = None
+                pool.shutdown(wait=False)
+                raise QueueUnavailableError(f"parse workers unavailable: {e}") from e
+            return job_ids
+
+    def _rollback(self, job_ids):
+        """Withdraw jobs of a failed batch: cancelled ones vanish, ones already running are left to finish."""
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            future = job and job.get("future")
+            if future is not None and future.cancel():  # runs _finish, which releases the pending slot
+                self._jobs.pop(job_id, None)
+
+    def _finish(self, job, data, future):
+        """Completion callback: persist the resume and record timings."""
+        try:
+            if future.cancelled():
+                raise RuntimeError("Job cancelled")
+            result = future.result()
+            job["started_at"] = result.get("started_at")
+            job["parse_seconds"] = result.get("elapsed")
+            if "error" in result:
+                job["error"] = result["error"]
+                job["error_code"] = result["error_code"]
+                if "error_details" in result:
+                    job["error_details"] = result["error_details"]
+            else:
+                save_parsed_resume(job["filename"], data, result)
+                job["result"] = {"filename": job["filename"],
+                                 "contact": result["contact"],
+                                 "sections": result["sections"]}
+        except BrokenProcessPool as e:
+            # a worker died; start a fresh pool for the next submissions
+            job["error"] = f"parse worker crashed: {e}"
+            job["error_code"] = "crashed"
+            with self._lock:
+                self._pool = None
+        except Exception as e:
+            job["error"] = str(e)
+            job["error_code"] = "internal_error"
+        job["finished_at"] = time.time()
+        job["state"] = "error" if job["error"] else "done"
+
+        with self._lock:
+            self._pending -= 1
+            job.pop("future", None)
+            self._evict_finished()
+            self._job_finished.notify_all()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job["state"] in ("done", "error") and job_id not in self._streamed]
+        for job_id in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del self._jobs[job_id]
+
+    def status(self, job_id):
+        """JSON-ready snapshot of a job, or None if unknown (or already evicted)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            state = job["state"]
+            future = job.get("future")
+            if state == "queued" and future is not None and future.running():
+                state = "running"
+            snapshot = {k: v for k, v in job.items() if k != "future"}
+        snapshot["state"] = state
+
+        timings = {
+            "queued_at": snapshot.pop("queued_at"),
+            "started_at": snapshot.pop("started_at"),
+            "finished_at": snapshot.pop("finished_at"),
+            "parse_seconds": snapshot.pop("parse_seconds"),
+        }
+        if timings["started_at"]:
+            timings["queue_seconds"] = timings["started_at"] - timings["queued_at"]
+        if timings["finished_at"]:
+            timings["total_seconds"] = timings["finished_at"] - timings["queued_at"]
+        snapshot["timings"] = timings
+        return snapshot
+
+    def iter_finished(self, job_ids):
+        """
+        Yield status snapshots of the given jobs in completion order, blocking until each finishes.
+
+        Jobs stay exempt from eviction until they are yielded. One evicted before
+        the call started is reported with state "unknown" (its result may well
+        have been saved), never as an error.
+        """
+        remaining = set(job_ids)
+        with self._lock:
+            self._streamed.update(remaining)
+        try:
+            while remaining:
+                with self._lock:
+                    ready = [job_id for job_id in remaining
+                             if self._jobs.get(job_id, {"state": "done"})["state"] in ("done", "error")]
+                    if not ready:
+                        self._job_finished.wait(timeout=1.0)
+                        continue
+                for job_id in ready:
+                    remaining.discard(job_id)
+                    status = self.status(job_id)
+                    self._release_streamed([job_id])
+                    yield status or {"job_id": job_id, "state": "unknown", "error": None,
+                                     "detail": "Job no longer tracked (finished and evicted before it was streamed)"}
+        finally:
+            self._release_streamed(remaining)  # the client went away mid-stream
+
+    def _release_streamed(self, job_ids):
+        with self._lock:
+            for job_id in job_ids:
+                self._streamed[job_id] -= 1
+                if self._streamed[job_id] <= 0:
+                    del self._streamed[job_id]
+
+    def pending(self):
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes; the next submission starts a fresh pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
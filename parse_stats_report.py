@@ -0,0 +1,73 @@
+"""
+Parse timing report.
+
+Reads the parse_stats table filled by ingest.save_parsed_resume and prints
+p50/p95/p99 wall and CPU latency per stage, then the slowest documents with
+the stage that dominated each of them:
+
+    python parse_stats_report.py [--top 10] [--since-hours 24] [--include-cache-hits]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from database import PARSE_STAGES, fetch_parse_stats, init_db
+
+PERCENTILES = (50, 95, 99)
+
+
+def total_wall(row):
+    return sum(row[f"{stage}_wall"] or 0.0 for stage in PARSE_STAGES)
+
+
+def stage_percentiles(rows):
+    """{stage: {"count", "wall": [p50, p95, p99], "cpu": [...]}} over the rows where the stage ran."""
+    report = {}
+    for stage in PARSE_STAGES:
+        wall = [row[f"{stage}_wall"] for row in rows if row[f"{stage}_wall"] is not None]
+        cpu = [row[f"{stage}_cpu"] for row in rows if row[f"{stage}_cpu"] is not None]
+        if wall:
+            report[stage] = {"count": len(wall),
+                             "wall": np.percentile(wall, PERCENTILES).tolist(),
+                             "cpu": np.percentile(cpu, PERCENTILES).tolist()}
+    return report
+
+
+def print_report(top=10, since_hours=None, include_cache_hits=False):
+    init_db()
+    since = time.time() - since_hours * 3600 if since_hours else None
+    rows = fetch_parse_stats(since)
+    if not include_cache_hits:
+        rows = [row for row in rows if not row["cache_hit"]]
+    if not rows:
+        print("No parse stats recorded yet.")
+        return
+
+    print(f"=== Stage latency over {len(rows)} parses (ms) ===")
+    header = " / ".join(f"p{p}" for p in PERCENTILES)
+    print(f"{'stage':<26}{'n':>6}   {'wall ' + header:<28}{'cpu ' + header}")
+    for stage, stats in stage_percentiles(rows).items():
+        wall = " / ".join(f"{v * 1000:.1f}" for v in stats["wall"])
+        cpu = " / ".join(f"{v * 1000:.1f}" for v in stats["cpu"])
+        print(f"{stage:<26}{stats['count']:>6}   {wall:<28}{cpu}")
+    totals = [total_wall(row) for row in rows]
+    print(f"{'total':<26}{len(totals):>6}   "
+          + " / ".join(f"{v * 1000:.1f}" for v in np.percentile(totals, PERCENTILES)))
+
+    print(f"\n=== Slowest {min(top, len(rows))} documents ===")
+    for row in sorted(rows, key=total_wall, reverse=True)[:top]:
+        slowest = max(PARSE_STAGES, key=lambda stage: row[f"{stage}_wall"] or 0.0)
+        print(f"{total_wall(row) * 1000:9.1f} ms  {row['filename']}  "
+              f"[{row['layout']}, {row['page_count']} pages, {row['char_count']} chars; "
+              f"slowest stage {slowest} {(row[f'{slowest}_wall'] or 0.0) * 1000:.1f} ms]")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report per-stage parse latency from the parse_stats table.")
+    parser.add_argument("--top", type=int, default=10, help="How many of the slowest documents to list")
+    parser.add_argument("--since-hours", type=float, default=None, help="Only include parses from the last N hours")
+    parser.add_argument("--include-cache-hits", action="store_true",
+                        help="Also count parse-cache hits (only their db_write stage is timed)")
+    args = parser.parse_args()
+    print_report(args.top, args.since_hours, args.include_cache_hits)
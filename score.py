@@ -1,65 +1,253 @@
-from experience_calculator import calculate_total_experience
-from database import fetch_all_resumes
-from jd_parser import SKILLS_DB
-import re
-import json
+import numpy as np
 
-def calculate_resume_score(jd_dict, resume):
+from database import fetch_all_resumes, fetch_resume_skill_sets, fetch_resumes_by_ids
+from jd_parser import SKILLS_DB, find_skills
+from skill_matrix import ROW_BYTES, load_skill_matrix, pack_skills
 
-    jd_skills = set([s.strip().lower() for s in jd_dict.get("skills", "").split(",") if s.strip()])
-    resume_skill = resume.get("skills", "")
-    found_skills = [
-        skill for skill in SKILLS_DB
-        if re.search(rf"\b{re.escape(skill)}\b", resume_skill, re.IGNORECASE)
-    ]
-    skills_str = ", ".join(found_skills)
-    print("Skills: ", skills_str)
-    resume_skills = set([s.strip().lower() for s in skills_str.split(",") if s.strip()])
+# Rows per page of /jd_parser results
+DEFAULT_PAGE_SIZE = 25
 
-    if jd_skills:
-        skills_match_count = len(jd_skills & resume_skills)
-        skills_score = (skills_match_count / len(jd_skills))*100
-    else:
-        skills_score = 0
 
+def jd_skill_set(jd_dict):
+    """Lower-cased skill names of a parsed JD."""
+    return set([s.strip().lower() for s in jd_dict.get("skills", "").split(",") if s.strip()])
 
-    jd_exp = jd_dict.get("min_experience", 0)
-    exp_data = resume.get("exp_data", "{}")
-    if isinstance(exp_data, str):
-        try:
-            exp_data = json.loads(exp_data)  # convert JSON string -> dict
-        except Exception:
-            exp_data = {}
 
-    total_exp = calculate_total_experience(exp_data)
+def skills_score_for(match_count, jd_skill_count):
+    """Share of the JD skills the resume has, in percent (0 when the JD lists none)."""
+    if jd_skill_count:
+        return (match_count / jd_skill_count)*100
+    return 0
+
 
+def experience_score_for(total_exp, jd_exp):
+    """100 when the resume meets the JD's minimum experience, else the fraction of it reached, in percent."""
     if jd_exp == 0:
-        exp_score = 100
+        return 100
     elif total_exp >= jd_exp:
-        exp_score = 100
-    elif total_exp < jd_exp:
-        exp_score = (total_exp/jd_exp)*100
+        return 100
+    return (total_exp/jd_exp)*100
+
+
+def calculate_resume_score(jd_dict, resume):
+    """
+    (experience score, skills score, total score) of one resume for a parsed JD.
+
+    The resume's skills are the lower-cased SKILLS_DB names in
+    resume["skill_names"] (indexed at ingest, see database.resume_skills);
+    a resume dict without them has its raw skills text matched here.
+    """
+    jd_skills = jd_skill_set(jd_dict)
+    resume_skills = resume.get("skill_names")
+    if resume_skills is None:
+        resume_skills = {skill.lower() for skill in find_skills(resume.get("skills") or "")}
+
+    skills_score = skills_score_for(len(jd_skills & resume_skills), len(jd_skills))
+
+    jd_exp = jd_dict.get("min_experience", 0)
+    total_exp = resume.get("total_exp") or 0  # overlap-merged total stored at ingest
+    exp_score = experience_score_for(total_exp, jd_exp)
 
     total_score = round(((skills_score + exp_score)/2), 2)
     return round(exp_score,2) , round(skills_score,2), total_score
 
 
+def _result_row(resume, exp_score, skills_score, total_score):
+    return {
+        "id": resume["id"],   # resume id from DB
+        "name": resume.get("name", ""),
+        "phone": resume.get("phone", ""),
+        "email": resume.get("email", ""),
+        "skills_score": skills_score,
+        "experience_score": exp_score,
+        "total_score": total_score,
+    }
+
+
 def calculate_scores_for_all_resumes(jd_dict):
+    """Score every resume in the database, best first (exhaustive; see rank_resumes for the top K)."""
     resumes = fetch_all_resumes()  # fetch list of dicts from DB
+    skill_sets = fetch_resume_skill_sets()
     results = []
 
     for resume in resumes:
+        resume["skill_names"] = skill_sets.get(resume["id"], set())
         exp_score, skills_score, total_score = calculate_resume_score(jd_dict, resume)
-        results.append({
-            "id": resume["id"],   # resume id from DB
-            "name": resume.get("name", ""),
-            "phone": resume.get("phone", ""),
-            "email": resume.get("email", ""),
-            "skills_score": skills_score,
-            "experience_score": exp_score,
-            "total_score": total_score,
-        })
+        results.append(_result_row(resume, exp_score, skills_score, total_score))
 
     # Sort by score descending
     results.sort(key=lambda x: x["total_score"], reverse=True)
     return results
+
+
+def round2(values):
+    """round(value, 2) of every element, exactly as Python rounds (np.round differs on ties such as 4.825)."""
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(value, 2) for value in values[near_half].tolist()]
+    return rounded
+
+
+def _score_arrays(ids, overlap, jd_skill_counts, jd_exps, total_exp):
+    """
+    Score arrays from skill overlaps, shape (JDs, resumes), with the JD-side
+    values given per JD; the arithmetic is calculate_resume_score's.
+    """
+    counts = np.asarray(jd_skill_counts, dtype=np.float64)[:, None]
+    exps = np.asarray(jd_exps, dtype=np.float64)[:, None]
+    skills_score = np.where(counts > 0, (overlap / np.maximum(counts, 1))*100, 0.0)
+    exp_score = np.where((exps == 0) | (total_exp >= exps), 100.0, (total_exp / np.where(exps == 0, 1, exps))*100)
+    return {
+        "ids": ids,
+        "overlap": overlap,
+        "skills_score": round2(skills_score),
+        "experience_score": round2(exp_score),
+        "total_score": round2((skills_score + exp_score)/2),
+    }
+
+
+def score_batch(jd_dict, matrix=None, rows=None):
+    """
+    Score every resume for a parsed JD at once.
+
+    Uses the packed skill matrix (skill_matrix.load_skill_matrix unless one is
+    given): the skill overlap of all resumes is one AND + popcount over the
+    matrix, and the scores are array expressions with exactly the values
+    calculate_resume_score gives. Returns a dict of arrays, one entry per
+    resume, ordered by id: "ids", "overlap", "skills_score",
+    "experience_score" and "total_score" (the scores rounded like
+    calculate_resume_score's). With `rows` (matrix row positions) only those
+    resumes are scored, in that order.
+    """
+    matrix = load_skill_matrix() if matrix is None else matrix
+    jd_skills = jd_skill_set(jd_dict)
+    ids, total_exp = (matrix.ids, matrix.total_exp) if rows is None else (matrix.ids[rows], matrix.total_exp[rows])
+    overlap = matrix.overlap(pack_skills(jd_skills), rows)[None, :]
+    scores = _score_arrays(ids, overlap, [len(jd_skills)], [jd_dict.get("min_experience", 0)], total_exp)
+    return {key: values if key == "ids" else values[0] for key, values in scores.items()}
+
+
+# resumes per block of the JD x resume product, bounding the unpacked copy of the matrix
+SCORE_BLOCK_ROWS = 16384
+# JDs scored together by rank_jd_batch, bounding its JDs x resumes score arrays
+SCORE_BLOCK_JDS = 8
+
+
+def score_jd_batch(jd_dicts, matrix=None):
+    """
+    Score every resume for many parsed JDs in one pass.
+
+    The JDs' skills are stacked into a 0/1 JD x skill matrix and multiplied
+    with the unpacked resume skill matrix (in blocks of SCORE_BLOCK_ROWS
+    resumes), giving the overlap of every JD with every resume at once. Same
+    result as score_batch per JD, with each array gaining a leading JD axis:
+    scores["total_score"][j] is the row of jd_dicts[j]. The arrays grow with
+    JDs x resumes, so many JDs are better scored in blocks (see rank_jd_batch).
+    """
+    matrix = load_skill_matrix() if matrix is None else matrix
+    jd_skills = [jd_skill_set(jd_dict) for jd_dict in jd_dicts]
+    jd_bits = np.unpackbits(np.array([pack_skills(skills) for skills in jd_skills], dtype=np.uint8).reshape(-1, ROW_BYTES),
+                            axis=1, count=len(SKILLS_DB)).astype(np.float32)
+
+    overlap = np.zeros((len(jd_dicts), len(matrix)), dtype=np.int32)
+    for start in range(0, len(matrix), SCORE_BLOCK_ROWS):
+        block = matrix.unpacked(start=start, stop=start + SCORE_BLOCK_ROWS)
+        # small integer counts, exact in float32
+        overlap[:, start:start + len(block)] = jd_bits @ block.T
+
+    return _score_arrays(matrix.ids, overlap, [len(skills) for skills in jd_skills],
+                         [jd_dict.get("min_experience", 0) for jd_dict in jd_dicts], matrix.total_exp)
+
+
+def top_k(scores, candidates, limit, offset=0):
+    """
+    Positions (into the score arrays) of one page of `candidates`, best
+    first: total score descending, then resume id. Only the rows that can
+    reach the page (scores at or above the K-th best, K = offset + limit)
+    are sorted.
+    """
+    if limit <= 0:
+        return candidates[:0]
+    total = scores["total_score"][candidates]
+    keep = offset + limit
+    if keep < len(candidates):
+        kth_best = np.partition(total, len(total) - keep)[len(total) - keep]
+        reachable = total >= kth_best
+        candidates, total = candidates[reachable], total[reachable]
+    order = np.lexsort((scores["ids"][candidates], -total))
+    return candidates[order[offset:offset + limit]]
+
+
+def match_candidates(matrix, jd_skills):
+    """
+    Candidate generation for one JD: the matrix rows (ascending) of the
+    resumes having at least one of `jd_skills`, read from the skill matrix's
+    posting lists, so resumes sharing no skill are never touched. None (every
+    row) for a JD without skills, which can then only rank on experience.
+    """
+    if not jd_skills:
+        return None
+    return matrix.candidates(jd_skills)
+
+
+def _candidates(scores, has_skills):
+    """Resumes sharing a skill with the JD, or all of them when the JD lists none."""
+    if has_skills:
+        return np.flatnonzero(scores["overlap"] > 0)
+    return np.arange(len(scores["ids"]))
+
+
+def _page_rows(scores, page, resumes):
+    return [_result_row(resumes[int(scores["ids"][i])], float(scores["experience_score"][i]),
+                        float(scores["skills_score"][i]), float(scores["total_score"][i]))
+            for i in page]
+
+
+def rank_resumes(jd_dict, limit=DEFAULT_PAGE_SIZE, offset=0):
+    """
+    One page of the best-matching resumes for a parsed JD: (rows, total).
+
+    Resumes sharing no skill with the JD are not candidates and `total`
+    counts the rest. Only the candidates (match_candidates) are scored
+    (score_batch with their rows) and ranked (top_k), so the cost grows with
+    the number of matching resumes, not with the corpus. A JD without skills
+    cannot match on them, so every resume is then a candidate and the
+    ranking falls to experience. Only the page's rows are read back from the
+    database.
+
+    Rows have the calculate_scores_for_all_resumes shape and the same order
+    (total score descending, then resume id).
+    """
+    matrix = load_skill_matrix()
+    scores = score_batch(jd_dict, matrix, match_candidates(matrix, jd_skill_set(jd_dict)))
+    candidates = np.arange(len(scores["ids"]))
+    page = top_k(scores, candidates, limit, offset)
+    resumes = {resume["id"]: resume for resume in fetch_resumes_by_ids(scores["ids"][page].tolist())}
+    return _page_rows(scores, page, resumes), len(candidates)
+
+
+def rank_jd_batch(jd_dicts, limit=DEFAULT_PAGE_SIZE):
+    """
+    The top `limit` resumes of each parsed JD: [(rows, total)], in the order
+    of jd_dicts, each as rank_resumes(jd_dict, limit) returns it. The
+    resumes are scored with score_jd_batch, SCORE_BLOCK_JDS JDs per pass, and
+    only each JD's top list is kept from a pass; the rows of all top lists
+    are read from the database in one go.
+    """
+    matrix = load_skill_matrix()
+    pages = []
+    for start in range(0, len(jd_dicts), SCORE_BLOCK_JDS):
+        block = jd_dicts[start:start + SCORE_BLOCK_JDS]
+        scores = score_jd_batch(block, matrix)
+        for j, jd_dict in enumerate(block):
+            jd_scores = {key: values if key == "ids" else values[j] for key, values in scores.items()}
+            candidates = _candidates(jd_scores, jd_skill_set(jd_dict))
+            page = top_k(jd_scores, candidates, limit)
+            pages.append(({key: values[page] for key, values in jd_scores.items()}, len(candidates)))
+
+    page_ids = {int(resume_id) for page_scores, _ in pages for resume_id in page_scores["ids"]}
+    resumes = {resume["id"]: resume for resume in fetch_resumes_by_ids(sorted(page_ids))}
+    return [(_page_rows(page_scores, range(len(page_scores["ids"])), resumes), total)
+            for page_scores, total in pages]
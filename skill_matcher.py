@@ -0,0 +1,96 @@
+from collections import deque
+
+
+# -----------------------------
+# Skill Matcher
+# -----------------------------
+# Finds every entry of a skill list in a text in one left-to-right pass with an
+# Aho-Corasick automaton, instead of one re.search per skill. A hit counts with
+# exactly the rules of re.search(rf"\b{re.escape(skill)}\b", text, re.IGNORECASE):
+#
+# * case-insensitive: the skills are ASCII, so the text is folded one
+#   character to one character (ASCII lower-casing plus the four non-ASCII
+#   letters IGNORECASE equates with ASCII ones: İ ı -> i, ſ -> s, K -> k),
+#   keeping positions aligned with the original text;
+# * \b at both ends, i.e. a boundary holds where is_word(previous character)
+#   differs from is_word(first character of the hit), and likewise at the end,
+#   with is_word = isalnum() or "_" and nothing beyond the text counting as
+#   non-word. So "C++" or ".NET" follow the same (odd) rules as their regex:
+#   ".NET" is found in "ASP.NET" but not in "knows .NET".
+
+def _is_word(char):
+    return char.isalnum() or char == "_"
+
+
+_NON_ASCII_FOLDS = {"İ": "i", "ı": "i", "ſ": "s", "K": "k"}
+
+
+class SkillMatcher:
+    """Aho-Corasick matcher over a skill list; build once, then call find() per text."""
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        keys = []
+        for index, skill in enumerate(self.skills):
+            key = skill.lower()
+            if not key or not key.isascii():
+                raise ValueError(f"Skill {skill!r} must be a non-empty ASCII string")
+            keys.append((key, index))
+
+        # Trie: goto[state] maps a character to the next state; out[state] lists the
+        # (skill index, length, starts with word char, ends with word char) ending here.
+        goto, out = [{}], [[]]
+        for key, index in keys:
+            state = 0
+            for char in key:
+                if char not in goto[state]:
+                    goto.append({})
+                    out.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            out[state].append((index, len(key), _is_word(key[0]), _is_word(key[-1])))
+
+        # Failure links, breadth first, folded into a complete transition table so the
+        # scan does one dict lookup per character (a missing entry means the root).
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                out[child] = out[child] + out[fail[child]]
+                queue.append(child)
+
+        self._delta = delta
+        self._out = out
+        alphabet = {char for key, _ in keys for char in key}
+        fold = {char: char for char in alphabet}
+        fold.update({char.upper(): char for char in alphabet if char.upper() != char and len(char.upper()) == 1})
+        fold.update({char: ascii_char for char, ascii_char in _NON_ASCII_FOLDS.items() if ascii_char in alphabet})
+        self._fold = fold
+
+    def find_indices(self, text):
+        """Sorted indices (into self.skills) of the skills found in the text."""
+        found = set()
+        delta, out, fold = self._delta, self._out, self._fold
+        last = len(text) - 1
+        state = 0
+        for i, char in enumerate(text):
+            state = delta[state].get(fold.get(char), 0)
+            if out[state]:
+                for index, length, starts_word, ends_word in out[state]:
+                    if index in found:
+                        continue
+                    start = i - length + 1
+                    before_word = start > 0 and _is_word(text[start - 1])
+                    after_word = i < last and _is_word(text[i + 1])
+                    if before_word != starts_word and after_word != ends_word:
+                        found.add(index)
+        return sorted(found)
+
+    def find(self, text):
+        """Skills found in the text, in skill-list order (duplicates in the list are all reported)."""
+        return [self.skills[index] for index in self.find_indices(text)]
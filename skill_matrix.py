@@ -0,0 +1,150 @@
+import threading
+
+import numpy as np
+
+from database import fetch_scoring_features, scoring_data_version
+from jd_parser import SKILLS_DB
+
+
+# -----------------------------
+# Skill Matrix
+# -----------------------------
+# Every resume's skills as a packed bit vector over SKILLS_DB: bit j of a row
+# (np.packbits order, most significant bit first) is set when the resume has
+# skill j. Skills are compared by lower-cased name, as everywhere else, so
+# entries that differ only in case ("Elasticsearch" / "ElasticSearch") share
+# the bit of their first occurrence. The overlap of a JD with a set of resumes
+# is then an AND against the JD's own vector and a popcount, done for all of
+# them at once. Alongside, each skill's posting list (the rows having it) gives
+# the resumes sharing any skill with a JD without touching the other rows.
+
+SKILL_BITS = {}
+for _index, _skill in enumerate(SKILLS_DB):
+    SKILL_BITS.setdefault(_skill.lower(), _index)
+
+ROW_BYTES = (len(SKILLS_DB) + 7) // 8
+
+# set bits of every byte value
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def pack_skills(skill_names):
+    """Packed bit vector (uint8[ROW_BYTES]) of skill names; names outside SKILLS_DB are ignored."""
+    bits = np.zeros(len(SKILLS_DB), dtype=np.uint8)
+    for name in skill_names:
+        index = SKILL_BITS.get(name.strip().lower())
+        if index is not None:
+            bits[index] = 1
+    return np.packbits(bits, bitorder="big")[:ROW_BYTES]
+
+
+def _postings(bits):
+    """
+    (posting_rows, posting_starts) of packed skill rows: the rows having
+    skill j, ascending, are posting_rows[posting_starts[j]:posting_starts[j + 1]].
+    """
+    skill_columns, rows = np.nonzero(np.unpackbits(bits, axis=1, count=len(SKILLS_DB)).T)
+    return rows, np.searchsorted(skill_columns, np.arange(len(SKILLS_DB) + 1))
+
+
+class SkillMatrix:
+    """
+    Resume ids, total experience and packed skill bits, one row per resume
+    (ordered by id). `version` is the database.scoring_data_version the rows
+    are current for, when loaded from the database.
+    """
+
+    def __init__(self, ids, total_exp, bits, version=None, postings=None):
+        self.ids = ids
+        self.total_exp = total_exp
+        self.bits = bits
+        self.version = version
+        # rows of skill j: posting_rows[posting_starts[j]:posting_starts[j + 1]], ascending
+        self.posting_rows, self.posting_starts = postings if postings is not None else _postings(bits)
+
+    @staticmethod
+    def _read(after_id=0):
+        """(ids, total_exp, bits, version) of the stored resumes with an id above after_id."""
+        version, resumes, skill_pairs = fetch_scoring_features(after_id)
+        ids = np.array([resume_id for resume_id, _ in resumes], dtype=np.int64)
+        total_exp = np.array([exp or 0 for _, exp in resumes], dtype=np.float64)
+        bits = np.zeros((len(ids), ROW_BYTES), dtype=np.uint8)
+
+        pairs = [(resume_id, SKILL_BITS[name]) for resume_id, name in skill_pairs if name in SKILL_BITS]
+        if pairs:
+            resume_ids, columns = np.array(pairs, dtype=np.int64).T
+            rows = np.searchsorted(ids, resume_ids)
+            # skills left behind by a deleted resume (foreign keys are not enforced) have no row
+            known = rows < len(ids)
+            known[known] = ids[rows[known]] == resume_ids[known]
+            rows, columns = rows[known], columns[known]
+            np.bitwise_or.at(bits, (rows, columns // 8), (0x80 >> (columns % 8)).astype(np.uint8))
+        return ids, total_exp, bits, version
+
+    @classmethod
+    def from_database(cls):
+        return cls(*cls._read())
+
+    def appended(self):
+        """
+        This matrix plus the resumes stored since it was loaded. Ids only
+        grow, so those are the rows above the last id, read and packed on
+        their own; a full reload instead when stored resumes changed
+        meanwhile (the rebuild_version of scoring_data_version moved).
+        """
+        ids, total_exp, bits, version = self._read(int(self.ids[-1]) if len(self.ids) else 0)
+        if self.version is None or version[1] != self.version[1]:
+            return SkillMatrix.from_database()
+        # the new rows come after every loaded one, so each goes at the end of its skills' posting lists
+        new_rows, new_starts = _postings(bits)
+        new_columns = np.repeat(np.arange(len(SKILLS_DB)), np.diff(new_starts))
+        postings = (np.insert(self.posting_rows, self.posting_starts[new_columns + 1], new_rows + len(self.ids)),
+                    self.posting_starts + new_starts)
+        return SkillMatrix(np.concatenate((self.ids, ids)), np.concatenate((self.total_exp, total_exp)),
+                           np.concatenate((self.bits, bits)), version, postings)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def candidates(self, skill_names):
+        """Rows (ascending) of the resumes having any of the skill names; reads only those skills' posting lists."""
+        columns = sorted({SKILL_BITS[name.strip().lower()] for name in skill_names
+                          if name.strip().lower() in SKILL_BITS})
+        postings = [self.posting_rows[self.posting_starts[j]:self.posting_starts[j + 1]] for j in columns]
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(postings))
+
+    def overlap(self, jd_bits, rows=None):
+        """Number of the JD's skills each resume has (int array, one entry per row, or per given row)."""
+        bits = self.bits if rows is None else self.bits[rows]
+        return POPCOUNT[bits & jd_bits].sum(axis=1, dtype=np.int32)
+
+    def unpacked(self, dtype=np.float32, start=0, stop=None):
+        """
+        Rows start:stop of the matrix as one 0/1 column per SKILLS_DB entry,
+        for matrix products (see score.score_jd_batch).
+        """
+        return np.unpackbits(self.bits[start:stop], axis=1, count=len(SKILLS_DB)).astype(dtype)
+
+
+_cache_lock = threading.Lock()
+_cache = {"matrix": None}
+
+
+def load_skill_matrix():
+    """
+    The SkillMatrix of the current database. database.scoring_data_version
+    tells what changed since the last load: nothing (the cached matrix is
+    returned), only new resumes (their rows are appended, see
+    SkillMatrix.appended) or stored resumes (full reload).
+    """
+    version = scoring_data_version()
+    with _cache_lock:
+        matrix = _cache["matrix"]
+        if matrix is None or matrix.version is None or matrix.version[1] != version[1]:
+            matrix = SkillMatrix.from_database()
+        elif matrix.version[0] != version[0]:
+            matrix = matrix.appended()
+        _cache["matrix"] = matrix
+        return matrix
@@ -1,5 +1,5 @@
 // ============ CONFIG ============
-const PARSE_ENDPOINT = "/parse"; // Flask route
+const PARSE_STREAM_ENDPOINT = "/parse/stream"; // Flask route, streams one result per resume
 
 // ============ SELECTORS ============
 const fileInput = document.getElementById("fileInput");
@@ -46,56 +46,80 @@ function showError(msg) {
 }
 
 // ============ RENDER RESULTS ============
-function renderResults(data) {
+function startResults(count) {
   clearResults();
-
-  if (!Array.isArray(data) || data.length === 0) {
-    return showError("No parsed resumes returned.");
-  }
-
   noData.style.display = "none";
   results.style.display = "";
 
-  if (data.length >= 2) {
+  if (count >= 2) {
     results.classList.add("multiple");
   }
+}
 
-  data.forEach(resume => {
-    const card = document.createElement("div");
-    card.className = "card";
-
-    let contactHTML = `
-      <div class="section-title">Contact - ${escapeHtml(resume.filename || "Unknown")}</div>
-      <div class="contact-row">
-        <span class="badge">Name: ${escapeHtml(resume.contact?.name || "N/A")}</span>
-        <span class="badge">Email: ${escapeHtml(resume.contact?.email || "N/A")}</span>
-        <span class="badge">Phone: ${escapeHtml(resume.contact?.phone || "N/A")}</span>
-      </div>
-    `;
-
-    let sectionsHTML = `<div class="section-title">Sections</div>`;
-    if (resume.sections && Object.keys(resume.sections).length > 0) {
-      Object.entries(resume.sections).forEach(([key, value]) => {
-        const isOCR = key.toLowerCase().includes("ocr");
-        sectionsHTML += `
-          <div>
-            <strong>${escapeHtml(key)}</strong>:
-            <div class="mini muted" style="${isOCR ? 'background-color:#fff7e6;padding:3px;border-left:3px solid #ffa500;' : ''}">
-              ${truncate(escapeHtml(value || ""), 1000)}
-            </div>
+function renderCard(resume) {
+  const card = document.createElement("div");
+  card.className = "card";
+
+  let contactHTML = `
+    <div class="section-title">Contact - ${escapeHtml(resume.filename || "Unknown")}</div>
+    <div class="contact-row">
+      <span class="badge">Name: ${escapeHtml(resume.contact?.name || "N/A")}</span>
+      <span class="badge">Email: ${escapeHtml(resume.contact?.email || "N/A")}</span>
+      <span class="badge">Phone: ${escapeHtml(resume.contact?.phone || "N/A")}</span>
+    </div>
+  `;
+
+  let sectionsHTML = `<div class="section-title">Sections</div>`;
+  if (resume.error) {
+    sectionsHTML += `<div class="muted mini">Error: ${escapeHtml(resume.error)}</div>`;
+  } else if (resume.sections && Object.keys(resume.sections).length > 0) {
+    Object.entries(resume.sections).forEach(([key, value]) => {
+      const isOCR = key.toLowerCase().includes("ocr");
+      sectionsHTML += `
+        <div>
+          <strong>${escapeHtml(key)}</strong>:
+          <div class="mini muted" style="${isOCR ? 'background-color:#fff7e6;padding:3px;border-left:3px solid #ffa500;' : ''}">
+            ${truncate(escapeHtml(value || ""), 1000)}
           </div>
-        `;
-      });
-    } else {
-      sectionsHTML += `<div class="muted mini">No sections found</div>`;
-    }
+        </div>
+      `;
+    });
+  } else {
+    sectionsHTML += `<div class="muted mini">No sections found</div>`;
+  }
 
-    card.innerHTML = contactHTML + sectionsHTML;
-    results.appendChild(card);
-  });
+  card.innerHTML = contactHTML + sectionsHTML;
+  results.appendChild(card);
+}
 
-  progressWrap.style.visibility = "hidden";
-  setStatus("parsed");
+// ============ STREAMED RESULTS ============
+// /parse/stream sends one JSON line per event: first the accepted jobs, then one
+// line per resume as soon as it is parsed, so cards appear one by one.
+function createStreamHandler() {
+  let total = 0;
+  let finished = 0;
+
+  return function handleLine(line) {
+    const msg = JSON.parse(line);
+
+    if (msg.type === "accepted") {
+      const jobs = msg.jobs || [];
+      const rejected = msg.rejected || [];
+      total = jobs.length;
+      if (jobs.length + rejected.length === 0) {
+        return showError("No parsed resumes returned.");
+      }
+      startResults(jobs.length + rejected.length);
+      rejected.forEach(renderCard);
+      progressBar.style.width = "0%";
+      setStatus(`parsing 0/${total}`);
+    } else if (msg.type === "result") {
+      renderCard(msg.result || { filename: msg.filename, error: msg.error });
+      finished++;
+      progressBar.style.width = (finished / total) * 100 + "%";
+      setStatus(`parsing ${finished}/${total}`);
+    }
+  };
 }
 
 // ============ UPLOAD FILES ============
@@ -110,7 +134,7 @@ function uploadFiles(files) {
   for (let i = 0; i < files.length; i++) formData.append("file", files[i]);
 
   const xhr = new XMLHttpRequest();
-  xhr.open("POST", PARSE_ENDPOINT, true);
+  xhr.open("POST", PARSE_STREAM_ENDPOINT, true);
 
   xhr.upload.onprogress = function(e) {
     if (e.lengthComputable) {
@@ -119,12 +143,29 @@ function uploadFiles(files) {
     }
   };
 
+  // Consume every complete NDJSON line received so far
+  const handleLine = createStreamHandler();
+  let consumed = 0;
+  function drain() {
+    if (xhr.status !== 200) return;
+    let newline;
+    while ((newline = xhr.responseText.indexOf("\n", consumed)) !== -1) {
+      const line = xhr.responseText.slice(consumed, newline).trim();
+      consumed = newline + 1;
+      if (line) handleLine(line);
+    }
+  }
+
+  xhr.onprogress = drain;
+
   xhr.onload = function() {
     if (xhr.status === 200) {
-      progressBar.style.width = "100%";
+      drain();
+      progressWrap.style.visibility = "hidden";
       progressBar.style.animation = "none"; // stop moving gradient
-      const data = JSON.parse(xhr.responseText);
-      renderResults(data);
+      setStatus("parsed");
+    } else if (xhr.status === 429) {
+      showError("The server is busy parsing other resumes. Please try again in a few seconds.");
     } else {
       showError("Upload failed with status: " + xhr.status);
     }
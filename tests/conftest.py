@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# the modules live flat in the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    """Run in a temporary directory with a fresh database.db (database.DATABASE is relative)."""
+    from database import init_db
+
+    monkeypatch.chdir(tmp_path)
+    init_db()
+    return tmp_path
@@ -0,0 +1,28 @@
+import pytest
+
+from education_matcher import find_education
+from experience_calculator import extract_highest_education
+
+
+@pytest.mark.parametrize("text, expected", [
+    # plain words and other abbreviations are not degrees
+    ("Intermediate (Pre-Engineering) ... Results to be announced", "INTERMEDIATE"),
+    ("Matric, Govt High School, Ba Town", "HIGH SCHOOL"),
+    ("Tools: MS Office, MS Excel", "Not Found"),
+    ("Ms. Ayesha Khan, Matric", "MATRIC"),
+    ("Bs as in Bachelor", "BACHELOR"),
+    # the degrees themselves still count
+    ("BS Computer Science, FAST NUCES", "BS"),
+    ("bs computer science", "BS"),
+    ("MS in Data Science; MS Office", "MS"),
+    ("BE Electrical Engineering", "BE"),
+    ("B.A (Hons) English", "B.A"),
+    ("b.e mechanical", "B.E"),
+    ("BS/MS", "MS"),
+])
+def test_highest_education(text, expected):
+    assert extract_highest_education(text) == expected
+
+
+def test_ambiguous_keywords_need_capitals():
+    assert find_education("to be or not to be, ba, bs, ms") == []
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from experience_calculator import (calculate_total_experience, experience_entry, merged_months,
+                                   total_experience_months)
+
+
+@pytest.mark.parametrize("intervals, expected", [
+    ([], 0),
+    ([(0, 12)], 12),
+    # overlapping and nested roles count once
+    ([(0, 12), (6, 18)], 18),
+    ([(0, 24), (3, 9)], 24),
+    ([(6, 18), (0, 12), (30, 36)], 24),
+    # adjacent intervals are [start, end): they touch without overlapping
+    ([(0, 12), (12, 24)], 24),
+    ([(12, 24), (0, 12)], 24),
+    # a gap between roles is not counted
+    ([(0, 12), (13, 25)], 24),
+    # an empty interval adds nothing, inside or outside the others
+    ([(5, 5)], 0),
+    ([(0, 12), (6, 6), (40, 40)], 12),
+])
+def test_merged_months(intervals, expected):
+    assert merged_months(intervals) == expected
+
+
+def test_overlapping_roles_count_once():
+    exp_dict = {
+        "0": experience_entry("Engineer", "Jan 2020", "Jan 2022"),
+        "1": experience_entry("Freelancer", "Jan 2021", "Jul 2022"),
+    }
+    assert total_experience_months(exp_dict) == 30
+    assert calculate_total_experience(json.dumps(exp_dict)) == 2.5
+
+
+def test_adjacent_roles_add_up():
+    exp_dict = {
+        "0": experience_entry("Intern", "Jan 2019", "Jul 2019"),
+        "1": experience_entry("Engineer", "Jul 2019", "Jul 2020"),
+    }
+    assert total_experience_months(exp_dict) == 18
+
+
+@pytest.mark.parametrize("start, end", [
+    ("Jan 2020", "Jan 2020"),  # zero months
+    ("Jan 2021", "Jan 2020"),  # ends before it starts
+    ("Role without dates", "Present"),  # unparsable start: months is None
+])
+def test_empty_or_negative_roles_add_nothing(start, end):
+    exp_dict = {
+        "0": experience_entry("Engineer", "Jan 2018", "Jan 2019"),
+        "1": experience_entry("Other", start, end),
+    }
+    assert total_experience_months(exp_dict) == 12
+
+
+def test_legacy_entries_are_added_to_the_merged_intervals():
+    exp_dict = {
+        "0": experience_entry("Engineer", "Jan 2020", "Jan 2021"),
+        "1": experience_entry("Contractor", "Jul 2020", "Jul 2021"),
+        # stored before entries carried "months": only the duration string is known
+        "2": {"role": "Analyst", "start_date": "2015", "end_date": "2016", "exp": "1 years 3 months"},
+        "3": {"role": "Trainee", "exp": "0 years 6 months"},
+    }
+    assert total_experience_months(exp_dict) == 18 + 15 + 6
+    assert calculate_total_experience(exp_dict) == 39 / 12
+
+
+def test_bad_data_is_zero_years():
+    assert calculate_total_experience("not json") == 0
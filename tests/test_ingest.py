@@ -0,0 +1,73 @@
+import sqlite3
+
+import fitz
+
+from App2 import parse_resume_document, parser_version
+from database import DATABASE, save_resume_to_db
+from extraction_engines import get_engine
+from ingest import backfill_resume_skills, reextract_ambiguous_education, save_parsed_resume
+from parse_guard import PARSE_MAX_PAGES
+
+
+def make_resume_pdf(education):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), f"Jane Doe\njane@example.com\n\nEducation\n{education}\n", fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def stored_education(resume_id):
+    conn = sqlite3.connect(DATABASE)
+    row = conn.execute("SELECT education, education_rank FROM resumes WHERE id=?", (resume_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def test_reextract_ambiguous_education(tmp_db):
+    data = make_resume_pdf("Intermediate (Pre-Engineering), results to be announced")
+    resume_id = save_parsed_resume("jane.pdf", data, parse_resume_document(data))
+    assert stored_education(resume_id) == ("INTERMEDIATE", 2)
+
+    # as stored by the matcher that took "be" for a Bachelor of Engineering
+    conn = sqlite3.connect(DATABASE)
+    conn.execute("UPDATE resumes SET education='BE', education_rank=4 WHERE id=?", (resume_id,))
+    conn.commit()
+    conn.close()
+
+    assert reextract_ambiguous_education() == 1
+    assert stored_education(resume_id) == ("INTERMEDIATE", 2)
+    assert reextract_ambiguous_education() == 0
+
+    # re-parsed as the upload workers parse: one cache entry, under the page cap
+    conn = sqlite3.connect(DATABASE)
+    versions = [version for version, in conn.execute("SELECT parser_version FROM parse_cache")]
+    conn.close()
+    assert versions == [parser_version(get_engine().name, PARSE_MAX_PAGES)]
+
+
+def indexed_skills(resume_id):
+    conn = sqlite3.connect(DATABASE)
+    rows = conn.execute("""
+        SELECT s.name FROM resume_skills rs JOIN skills s ON s.id = rs.skill_id
+        WHERE rs.resume_id = ? ORDER BY s.name
+    """, (resume_id,)).fetchall()
+    conn.close()
+    return [name for name, in rows]
+
+
+def test_skills_db_change_reindexes_stored_resumes(tmp_db, monkeypatch):
+    import ingest
+
+    assert backfill_resume_skills() == 0  # start-up records the digest of the current list
+    resume_id = save_resume_to_db("Jane", "", "", "BS", "jane.pdf", b"", "Python, Haskell", "{}", 0,
+                                  skill_names=["Python"])
+    assert backfill_resume_skills() == 0
+    assert indexed_skills(resume_id) == ["python"]
+
+    monkeypatch.setattr(ingest, "SKILLS_DB_DIGEST", "new skill list")
+    monkeypatch.setattr(ingest, "find_skills", lambda text: ["Python", "Haskell"])
+    assert backfill_resume_skills() == 1
+    assert indexed_skills(resume_id) == ["haskell", "python"]
+    assert backfill_resume_skills() == 0
@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.fixture
+def client(tmp_db):
+    import page
+
+    return page.app.test_client()
+
+
+@pytest.mark.parametrize("top", ["0", "-3", "ten"])
+def test_jd_batch_rejects_top_below_one(client, top):
+    response = client.post("/jd_batch", data={"top": top, "jdText": "Python developer"})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "'top' must be a positive number"}
+
+
+def test_jd_batch_ranks_each_text(client):
+    response = client.post("/jd_batch", data={"top": "1", "jdText": ["Python developer", "SQL analyst"]})
+    assert response.status_code == 200
+    assert [ranking["jd"] for ranking in response.get_json()["rankings"]] == ["text_1", "text_2"]
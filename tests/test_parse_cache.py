@@ -0,0 +1,50 @@
+import sqlite3
+
+from database import DATABASE, get_cached_parse, save_cached_parse
+from experience_calculator import experience_entry
+from parse_cache import cached_parse_resume
+
+
+def cached_versions():
+    conn = sqlite3.connect(DATABASE)
+    rows = conn.execute("SELECT parser_version FROM parse_cache ORDER BY parser_version").fetchall()
+    conn.close()
+    return [version for version, in rows]
+
+
+def test_save_keeps_other_settings_and_purges_stale_versions(tmp_db):
+    save_cached_parse("a", "2-pymupdf-p0-v4-abc", "{}", 10)
+    save_cached_parse("a", "3-pymupdf-p0-v4-old", "{}", 10)
+    save_cached_parse("a", "3-pdfplumber-p3-v4-abc", "{}", 10, "3-", "-abc")
+    save_cached_parse("a", "3-pymupdf-p3-v4-abc", "{}", 10, "3-", "-abc")
+
+    # an older code version or heading dictionary goes, other engines / page caps stay
+    assert cached_versions() == ["3-pdfplumber-p3-v4-abc", "3-pymupdf-p3-v4-abc"]
+    assert get_cached_parse("a", "3-pdfplumber-p3-v4-abc") == "{}"
+
+
+def test_save_bounds_the_cache(tmp_db):
+    for file_hash in "abc":
+        save_cached_parse(file_hash, "3-pymupdf-p0-v4-abc", "{}", 2, "3-", "-abc")
+    assert get_cached_parse("a", "3-pymupdf-p0-v4-abc") is None
+    assert get_cached_parse("c", "3-pymupdf-p0-v4-abc") == "{}"
+
+
+def test_hit_measures_open_ended_roles_until_today(tmp_db):
+    class Doc:
+        data = b"%PDF resume"
+        max_pages = None
+
+        class engine:
+            name = "pymupdf"
+
+    # as cached a while ago: the running role measured up to that day
+    frozen = dict(experience_entry("Engineer", "Jan 2020", "Present"), end_month=0, months=1, exp="0 years 1 months")
+    ended = experience_entry("Intern", "Jan 2018", "Jun 2018")
+    parsed = {"experience": {"0": frozen, "1": ended}, "stats": {"stages": {}}}
+
+    assert cached_parse_resume(Doc, parse=lambda doc: parsed)["stats"]["cache_hit"] is False
+    hit = cached_parse_resume(Doc, parse=None)
+    assert hit["stats"]["cache_hit"] is True
+    assert hit["experience"]["0"] == experience_entry("Engineer", "Jan 2020", "Present")
+    assert hit["experience"]["1"] == ended
@@ -0,0 +1,109 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz
+import pytest
+
+import parse_jobs
+from App2 import apply_heading_snapshot, heading_snapshot, register_headings
+from parse_jobs import ParseJobQueue, QueueUnavailableError
+
+
+def make_resume_pdf():
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Jane Doe\njane@example.com\n\nSkills\nPython, SQL\n\n"
+                               "Military Service\nSignals Officer, Pakistan Army 2015 - 2018\n", fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def restore_headings():
+    snapshot = heading_snapshot()
+    yield
+    apply_heading_snapshot(snapshot)
+
+
+def parse_through_queue(queue, filename, data):
+    [status] = list(queue.iter_finished(queue.submit_many([(filename, data)])))
+    assert status["state"] == "done", status
+    return status["result"]["sections"]
+
+
+def test_registered_heading_reaches_running_workers(tmp_db, restore_headings):
+    data = make_resume_pdf()
+    queue = ParseJobQueue(workers=1)
+    try:
+        # the first job starts the worker with the built-in dictionary
+        assert "military service" not in parse_through_queue(queue, "before.pdf", data)
+
+        register_headings("military service", ["Military Service"])
+        # same bytes: must not be served from the cache entry of the old dictionary either
+        sections = parse_through_queue(queue, "after.pdf", data)
+        assert sections["military service"] == "Signals Officer, Pakistan Army 2015 - 2018"
+    finally:
+        queue.shutdown()
+
+
+class FailingPool:
+    """Accepts `accept` submissions (left pending), then fails like a pool whose worker died."""
+
+    def __init__(self, accept):
+        self.accept = accept
+        self.futures = []
+
+    def submit(self, *args):
+        if len(self.futures) == self.accept:
+            raise BrokenProcessPool("a worker died")
+        self.futures.append(Future())
+        return self.futures[-1]
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def test_failed_submit_rolls_back_the_batch():
+    queue = ParseJobQueue(workers=1, max_pending=3)
+    queue._pool = FailingPool(accept=2)
+    with pytest.raises(QueueUnavailableError):
+        queue.submit_many([("a.pdf", b""), ("b.pdf", b""), ("c.pdf", b"")])
+
+    assert queue.pending() == 0
+    assert queue._jobs == {}
+    assert queue._pool is None  # the next batch gets a fresh pool
+
+
+class PendingPool(FailingPool):
+    def __init__(self):
+        super().__init__(accept=None)
+
+
+PARSED = {"contact": {}, "sections": {"skills": "Python"}, "started_at": 0.0, "elapsed": 0.0}
+
+
+def test_finished_jobs_are_kept_until_streamed(monkeypatch):
+    monkeypatch.setattr(parse_jobs, "FINISHED_JOBS_KEPT", 0)
+    monkeypatch.setattr(parse_jobs, "save_parsed_resume", lambda *args: None)
+    queue = ParseJobQueue(workers=1)
+    queue._pool = pool = PendingPool()
+    job_ids = queue.submit_many([("a.pdf", b""), ("b.pdf", b"")])
+
+    # finish both while the stream waits on them; nothing else may evict them
+    threading.Timer(0.1, lambda: [future.set_result(dict(PARSED)) for future in pool.futures]).start()
+    assert [status["state"] for status in queue.iter_finished(job_ids)] == ["done", "done"]
+
+
+def test_job_evicted_before_streaming_is_not_an_error(monkeypatch):
+    monkeypatch.setattr(parse_jobs, "FINISHED_JOBS_KEPT", 0)
+    monkeypatch.setattr(parse_jobs, "save_parsed_resume", lambda *args: None)
+    queue = ParseJobQueue(workers=1)
+    queue._pool = pool = PendingPool()
+    [job_id] = queue.submit_many([("a.pdf", b"")])
+    pool.futures[0].set_result(dict(PARSED))  # saved, then evicted at once
+
+    [status] = queue.iter_finished([job_id])
+    assert status["state"] == "unknown"
+    assert status["error"] is None
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from score import match_candidates, top_k
+from skill_matrix import SkillMatrix, pack_skills
+
+SCORES = {"ids": np.array([10, 11, 12, 13]), "total_score": np.array([50.0, 75.0, 50.0, 90.0])}
+
+
+def test_top_k_orders_by_score_then_id():
+    assert top_k(SCORES, np.arange(4), 3).tolist() == [3, 1, 0]
+    assert top_k(SCORES, np.arange(4), 2, offset=2).tolist() == [0, 2]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_top_k_without_room_is_empty(limit):
+    assert top_k(SCORES, np.arange(4), limit).tolist() == []
+
+
+def test_match_candidates_reads_the_posting_lists():
+    bits = np.array([pack_skills(names) for names in (["Python"], [], ["SQL", "Docker"], ["python", "SQL"])])
+    matrix = SkillMatrix(np.array([1, 2, 3, 4]), np.zeros(4), bits)
+    assert match_candidates(matrix, {"python", "docker"}).tolist() == [0, 2, 3]
+    assert match_candidates(matrix, {"rust"}).tolist() == []
+    assert match_candidates(matrix, set()) is None
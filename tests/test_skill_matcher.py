@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from jd_parser import SKILLS_DB
+from skill_matcher import SkillMatcher
+
+
+def regex_find(skills, text):
+    """The per-skill regex loop SkillMatcher replaces."""
+    return [skill for skill in skills if re.search(rf"\b{re.escape(skill)}\b", text, re.IGNORECASE)]
+
+
+SKILLS = ["C", "C++", "C#", ".NET", ".NET Core", "ASP.NET", "Go", "R", "SQL", "MySQL", "Kotlin", "Spark"]
+
+TEXTS = [
+    # symbol-ended skills: \b after "+" or "#" needs a word character next
+    "C++ and C# developer",
+    "C++, C#; C.",
+    "C++17, C#9",
+    "wrote C++code",
+    "c++ / c# / c",
+    "Objective-C",
+    # .NET: \b before "." needs a word character in front
+    "ASP.NET MVC",
+    "knows .NET",
+    "knows .NET Core",
+    "ASP.NET Core",
+    "VB.NET, .NETCore",
+    # the non-ASCII letters IGNORECASE folds onto ASCII ones
+    "KOTL\u0130N, \u017fpark, MY\u017fQL",
+    "\u212aotlin (Kelvin sign)",
+    "\u0131dle SQL, Kotl\u0131n",
+    "Gö and R&D",
+    # word boundaries inside and around longer words
+    "MySQL_admin, SQLite, Go-lang, R.",
+    "",
+    "___",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_the_regex_loop(text):
+    assert SkillMatcher(SKILLS).find(text) == regex_find(SKILLS, text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # \b after "+" / "#" needs a word character next: only "C" in "C++ and C#"
+    ("C++ and C# developer", ["C"]),
+    ("C++17, C#9", ["C", "C++", "C#"]),
+    ("ASP.NET MVC", [".NET", "ASP.NET"]),
+    ("knows .NET", []),
+    ("KOTL\u0130N, \u017fpark, \u212aotl\u0131n", ["Kotlin", "Spark"]),
+])
+def test_odd_regex_rules_are_kept(text, expected):
+    assert SkillMatcher(SKILLS).find(text) == expected
+
+
+def test_duplicate_entries_are_all_reported():
+    skills = ["Elasticsearch", "SQL", "ElasticSearch", "sql"]
+    text = "ELASTICSEARCH and SQL"
+    assert SkillMatcher(skills).find(text) == regex_find(skills, text) == skills
+
+
+def test_skills_db_matches_the_regex_loop():
+    text = ("Senior C++/C# engineer, ASP.NET Core and .NET on Azure; Python, PostgreSQL, "
+            "Node.js, React.js, CI/CD, R, Go. Also knows .NET Framework and Objective-C.")
+    assert SkillMatcher(SKILLS_DB).find(text) == regex_find(SKILLS_DB, text)
+
+
+@pytest.mark.parametrize("skill", ["", "Café"])
+def test_rejects_empty_or_non_ascii_skills(skill):
+    with pytest.raises(ValueError):
+        SkillMatcher([skill])
@@ -0,0 +1,64 @@
+import sqlite3
+
+import skill_matrix
+from database import (DATABASE, delete_resume, fetch_scoring_features, save_resume_skills, save_resume_to_db,
+                      update_resume_experience)
+from skill_matrix import SkillMatrix, pack_skills
+
+
+def test_from_database_skips_skills_of_missing_resumes(tmp_db):
+    first = save_resume_to_db("A", "", "", "", "a.pdf", b"", "", "{}", 2, skill_names=["Python"])
+    second = save_resume_to_db("B", "", "", "", "b.pdf", b"", "", "{}", 5, skill_names=["SQL"])
+    conn = sqlite3.connect(DATABASE)
+    # a delete without the skills leaves them behind: "python" of the first
+    # resume would land on the next row, and an id past the last one has no row at all
+    conn.execute("DELETE FROM resumes WHERE id = ?", (first,))
+    conn.execute("INSERT INTO resume_skills (resume_id, skill_id) SELECT ?, id FROM skills WHERE name = 'python'",
+                 (second + 10,))
+    conn.commit()
+    conn.close()
+
+    matrix = SkillMatrix.from_database()
+    assert matrix.ids.tolist() == [second]
+    assert matrix.total_exp.tolist() == [5]
+    assert matrix.bits.tolist() == [pack_skills(["SQL"]).tolist()]
+
+
+def same_rows(matrix, other):
+    return (matrix.ids.tolist() == other.ids.tolist() and matrix.total_exp.tolist() == other.total_exp.tolist()
+            and matrix.bits.tolist() == other.bits.tolist()
+            and matrix.posting_rows.tolist() == other.posting_rows.tolist())
+
+
+def test_load_appends_new_resumes_and_reloads_on_other_changes(tmp_db, monkeypatch):
+    monkeypatch.setattr(skill_matrix, "_cache", {"matrix": None})
+    first = save_resume_to_db("A", "", "", "", "a.pdf", b"", "", "{}", 2, skill_names=["Python"])
+    loaded = skill_matrix.load_skill_matrix()
+    assert skill_matrix.load_skill_matrix() is loaded
+
+    # new resumes only: appended to the loaded rows
+    second = save_resume_to_db("B", "", "", "", "b.pdf", b"", "", "{}", 5, skill_names=["SQL", "Python"])
+    reads = []
+    monkeypatch.setattr(skill_matrix, "fetch_scoring_features",
+                        lambda after_id=0: reads.append(after_id) or fetch_scoring_features(after_id))
+    appended = skill_matrix.load_skill_matrix()
+    assert reads == [first]
+    assert appended.ids.tolist() == [first, second]
+    assert same_rows(appended, SkillMatrix.from_database())
+
+    def reindex():  # skills indexed later for a stored resume, as backfill_resume_skills does
+        conn = sqlite3.connect(DATABASE)
+        conn.execute("UPDATE resumes SET skills_indexed = 0 WHERE id = ?", (first,))
+        conn.commit()
+        conn.close()
+        save_resume_skills([(first, ["Docker"])])
+
+    for change in (reindex, lambda: update_resume_experience([("{}", 7, first)]), lambda: delete_resume(second)):
+        change()
+        reads.clear()
+        matrix = skill_matrix.load_skill_matrix()
+        assert reads == [0]  # full reload
+        assert same_rows(matrix, SkillMatrix.from_database())
+    assert matrix.ids.tolist() == [first]
+    assert matrix.total_exp.tolist() == [7]
+    assert matrix.bits.tolist() == [pack_skills(["Python", "Docker"]).tolist()]